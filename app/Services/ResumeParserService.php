@@ -167,27 +167,32 @@ public function parseResumeWithEnhanced(string $filePath): array
                 throw new Exception("Resume file not found at: {$filePath}");
             }
             
-            // Path to the Python script
-            $pythonScript = base_path('streamlit_frontend/enhanced_parser_cli.py');
+            // Prefer the long-running parser worker (enhanced_parser_cli.py --worker) when one is listening
+            $output = $this->requestParserWorker($filePath);
+
+            if ($output === null) {
+                // Path to the Python script
+                $pythonScript = base_path('streamlit_frontend/enhanced_parser_cli.py');
             
-            // Always create/update the Python script to ensure it has the latest changes
+                // Create the Python script if it is missing (the maintained copy lives in the repository)
                 $this->createEnhancedParserCLI();
             
-            // Determine correct Python executable for OS
-            $venvPython = null;
-            if (strtoupper(substr(PHP_OS, 0, 3)) === 'WIN') {
-                $venvPython = base_path('streamlit_frontend/venv/Scripts/python.exe');
-            } else {
-            $venvPython = base_path('streamlit_frontend/venv/bin/python');
-            }
-            if (!file_exists($venvPython)) {
-                $venvPython = 'python'; // fallback to system python
-            }
-            $escapedFilePath = escapeshellarg($filePath);
-            $command = escapeshellarg($venvPython) . " " . escapeshellarg($pythonScript) . " " . $escapedFilePath;
+                // Determine correct Python executable for OS
+                $venvPython = null;
+                if (strtoupper(substr(PHP_OS, 0, 3)) === 'WIN') {
+                    $venvPython = base_path('streamlit_frontend/venv/Scripts/python.exe');
+                } else {
+                    $venvPython = base_path('streamlit_frontend/venv/bin/python');
+                }
+                if (!file_exists($venvPython)) {
+                    $venvPython = 'python'; // fallback to system python
+                }
+                $escapedFilePath = escapeshellarg($filePath);
+                $command = escapeshellarg($venvPython) . " " . escapeshellarg($pythonScript) . " " . $escapedFilePath;
             
-            // Execute the command and capture output
-            $output = shell_exec($command);
+                // Execute the command and capture output
+                $output = shell_exec($command);
+            }
             
             if (empty($output)) {
                 throw new Exception("Enhanced parser returned empty output");
@@ -305,11 +310,63 @@ private function formatEnhancedParserResults(array $parserOutput, string $filena
     }
     
     /**
-     * Create the enhanced parser CLI script
+     * Send a parse job to the persistent Python parser worker over its Unix socket.
+     *
+     * Only a worker that cannot be reached falls back to the CLI. Once the job has been
+     * sent, a missing reply is an error: the worker may still be parsing the file, and
+     * running the CLI as well would parse it a second time.
+     *
+     * @param string $filePath Physical path to the PDF file
+     * @return string|null The worker's JSON reply, or null when no worker is reachable
+     * @throws Exception When the worker accepted the job but did not reply in time
+     */
+    private function requestParserWorker(string $filePath): ?string
+    {
+        $socketPath = config('services.resume_parser.socket');
+        if (empty($socketPath) || !file_exists($socketPath)) {
+            return null;
+        }
+
+        $timeout = (int) config('services.resume_parser.timeout', 120);
+        $client = @stream_socket_client("unix://{$socketPath}", $errno, $errstr, 5);
+        if ($client === false) {
+            Log::warning("Resume parser worker unreachable at {$socketPath}: {$errstr}. Falling back to CLI.");
+            return null;
+        }
+
+        try {
+            stream_set_timeout($client, $timeout);
+            $request = json_encode(['id' => uniqid('resume_', true), 'file_path' => $filePath]) . "\n";
+            if (@fwrite($client, $request) === false) {
+                Log::warning("Could not send the job to the resume parser worker at {$socketPath}. Falling back to CLI.");
+                return null;
+            }
+            $reply = fgets($client);
+            $timedOut = stream_get_meta_data($client)['timed_out'];
+        } finally {
+            fclose($client);
+        }
+
+        if ($reply === false || trim($reply) === '') {
+            throw new Exception($timedOut
+                ? "Resume parser worker did not reply within {$timeout} seconds"
+                : "Resume parser worker closed the connection without a reply");
+        }
+
+        return $reply;
+    }
+
+    /**
+     * Create the enhanced parser CLI script if it does not exist yet.
+     * The maintained version (including --worker mode) is checked into the repository;
+     * this only restores a minimal one-shot script when the file is missing.
      */
     private function createEnhancedParserCLI()
     {
         $pythonScript = base_path('streamlit_frontend/enhanced_parser_cli.py');
+        if (file_exists($pythonScript)) {
+            return;
+        }
         
         $scriptContent = <<<'PYTHON'
 #!/usr/bin/env python
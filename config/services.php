@@ -39,6 +39,15 @@
         'api_key' => env('GEOAPIFY_API_KEY'),
     ],
 
+    /*
+     * Persistent Python resume parser worker
+     * (python streamlit_frontend/enhanced_parser_cli.py --worker --socket <path>)
+     */
+    'resume_parser' => [
+        'socket' => env('RESUME_PARSER_SOCKET'),
+        'timeout' => env('RESUME_PARSER_TIMEOUT', 120),
+    ],
+
     /*
      * Mailgun API Configuration
      */
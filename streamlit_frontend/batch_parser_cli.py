@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Bulk resume ingestion: extract and parse many PDFs, one JSON record per line.
+
+    python batch_parser_cli.py resumes/ -o results.jsonl
+    python batch_parser_cli.py "incoming/**/*.pdf" --concurrency 8
+    find resumes -name '*.pdf' | python batch_parser_cli.py -o results.jsonl
+
+Every input file produces exactly one record, written in input order:
+
+    {"file_path": "...", "status": "ok", "elapsed_seconds": 1.234, "result": {...parsed resume...}}
+    {"file_path": "...", "status": "error", "elapsed_seconds": 0.012, "error": "...", "traceback": "..."}
+
+A failing file never stops the run. With --checkpoint, the paths of finished files are
+appended to a progress file; --resume skips them and appends to the existing output.
+Files finished just before a crash may be written twice (once per run), never lost.
+A throughput summary (files/s, p50/p95 latency) is printed to stderr at the end.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+
+# Add the current directory (streamlit_frontend) to the path so we can import from lib
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from lib.parser_worker import ParserWorkerPool, DEFAULT_POOL_SIZE, DEFAULT_MAX_JOBS_PER_WORKER
+from lib.result_cache import default_cache_path
+
+PDF_EXTENSIONS = ('.pdf',)
+
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        description="Extract and parse many resume PDFs, streaming one JSON result per line."
+    )
+    arg_parser.add_argument("inputs", nargs="*",
+                            help="Directories (searched recursively for PDFs), glob patterns or files; "
+                                 "read file paths from stdin when omitted or '-'")
+    arg_parser.add_argument("-o", "--output", help="JSONL file to write (default: stdout)")
+    arg_parser.add_argument("-j", "--concurrency", type=int, default=DEFAULT_POOL_SIZE,
+                            help="Number of parsing processes (default: %(default)s)")
+    arg_parser.add_argument("--max-in-flight", type=int, default=None,
+                            help="Files queued or running at once (default: 2 per process)")
+    arg_parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS_PER_WORKER,
+                            help="Recycle a parsing process after this many files (0 = never)")
+    arg_parser.add_argument("--checkpoint", help="Progress file listing finished input paths")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help="Skip files listed in --checkpoint and append to --output")
+    arg_parser.add_argument("--cache-path", default=default_cache_path(),
+                            help="SQLite file caching extracted text and parsed results by file hash "
+                                 "(default: RESUME_PARSER_CACHE_PATH or lib/resume_result_cache.sqlite3)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Always extract and parse from scratch")
+    return arg_parser
+
+
+def iter_input_files(inputs, stdin=None):
+    """Yield each input file once: PDFs under directories, glob matches and plain paths."""
+    if not inputs or inputs == ['-']:
+        inputs = (line.strip() for line in (stdin or sys.stdin))
+    seen = set()
+    for item in inputs:
+        if not item:
+            continue
+        if os.path.isdir(item):
+            candidates = []
+            for root, dirs, files in os.walk(item):
+                dirs.sort()
+                candidates.extend(os.path.join(root, name) for name in sorted(files)
+                                  if name.lower().endswith(PDF_EXTENSIONS))
+        elif glob.has_magic(item):
+            candidates = sorted(glob.iglob(item, recursive=True))
+        else:
+            # Missing files are passed through and reported as error records
+            candidates = [item]
+        for path in candidates:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                yield path
+
+
+def load_checkpoint(checkpoint_path):
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return set()
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def make_record(file_path, result, elapsed_seconds):
+    status = "error" if "error" in result else "ok"
+    record = {"file_path": file_path, "status": status, "elapsed_seconds": round(elapsed_seconds, 3)}
+    if status == "error":
+        record["error"] = result["error"]
+        if "traceback" in result:
+            record["traceback"] = result["traceback"]
+    else:
+        record["result"] = result
+    return record
+
+
+def run_batch(file_paths, pool, output, checkpoint=None, max_in_flight=None, done=frozenset()):
+    """
+    Push file_paths through the pool with at most max_in_flight files outstanding, writing
+    one record per file to output (in input order). Returns the throughput summary.
+    """
+    max_in_flight = max_in_flight or pool.pool_size * 2
+    pending = deque()  # (file_path, async_result)
+    latencies = []
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    started = time.perf_counter()
+
+    def write_next():
+        file_path, async_result = pending.popleft()
+        try:
+            result, elapsed_seconds = async_result.get()
+        except Exception as e: # e.g. a pool process died
+            result, elapsed_seconds = {"error": f"Error processing resume: {str(e)}"}, 0.0
+        pool.record(result)
+        record = make_record(file_path, result, elapsed_seconds)
+        counts[record["status"]] += 1
+        latencies.append(elapsed_seconds)
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        if checkpoint is not None:
+            checkpoint.write(os.path.abspath(file_path) + "\n")
+            checkpoint.flush()
+
+    for file_path in file_paths:
+        if os.path.abspath(file_path) in done:
+            counts["skipped"] += 1
+            continue
+        pending.append((file_path, pool.submit_timed(file_path)))
+        while len(pending) >= max_in_flight:
+            write_next()
+    while pending:
+        write_next()
+
+    wall_seconds = time.perf_counter() - started
+    latencies.sort()
+    processed = counts["ok"] + counts["error"]
+    return {
+        "files": processed,
+        "ok": counts["ok"],
+        "errors": counts["error"],
+        "skipped": counts["skipped"],
+        "wall_seconds": round(wall_seconds, 3),
+        "files_per_second": round(processed / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        "latency_p50_seconds": round(percentile(latencies, 50), 3),
+        "latency_p95_seconds": round(percentile(latencies, 95), 3),
+        "concurrency": pool.pool_size
+    }
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    if args.resume and not args.checkpoint:
+        print(json.dumps({"error": "--resume requires --checkpoint"}), file=sys.stderr)
+        sys.exit(2)
+
+    done = load_checkpoint(args.checkpoint) if args.resume else set()
+    append = args.resume and bool(done)
+    output = open(args.output, 'a' if append else 'w', encoding='utf-8') if args.output else sys.stdout
+    checkpoint = open(args.checkpoint, 'a' if args.resume else 'w', encoding='utf-8') if args.checkpoint else None
+
+    pool = ParserWorkerPool(pool_size=args.concurrency, max_jobs_per_worker=args.max_jobs,
+                            cache_path=None if args.no_cache else args.cache_path)
+    try:
+        summary = run_batch(iter_input_files(args.inputs), pool, output, checkpoint,
+                            max_in_flight=args.max_in_flight, done=done)
+    except KeyboardInterrupt:
+        # Finished files are already written and checkpointed; rerun with --resume
+        sys.exit(130)
+    finally:
+        pool.close()
+        if checkpoint is not None:
+            checkpoint.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
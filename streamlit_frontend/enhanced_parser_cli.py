@@ -2,7 +2,7 @@
 import sys
 import json
 import os
-import traceback # For detailed error logging
+import argparse
 
 # Add the current directory (streamlit_frontend) to the path
 # so we can import from lib.enhanced_parser and lib.analyzer
@@ -10,45 +10,57 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from lib.enhanced_parser import EnhancedParser
 from lib.enhanced_extractor import EnhancedExtractor # Import EnhancedExtractor
+from lib.parser_worker import process_resume_file, run_worker, DEFAULT_POOL_SIZE, DEFAULT_MAX_JOBS_PER_WORKER
+from lib.result_cache import default_cache_path, open_result_cache
+
+def build_arg_parser():
+    arg_parser = argparse.ArgumentParser(
+        description="Extract and parse a resume PDF, or run as a long-lived parsing worker."
+    )
+    arg_parser.add_argument("file_path", nargs="?", help="PDF resume to parse (one-shot mode)")
+    arg_parser.add_argument("--worker", action="store_true",
+                            help="Run as a persistent worker reading JSON-lines jobs from stdin or --socket")
+    arg_parser.add_argument("--socket", dest="socket_path", default=os.getenv("RESUME_PARSER_SOCKET"),
+                            help="Unix socket path to listen on in worker mode (default: stdin/stdout)")
+    arg_parser.add_argument("--pool-size", type=int, default=DEFAULT_POOL_SIZE,
+                            help="Number of parsing processes in worker mode")
+    arg_parser.add_argument("--max-jobs", type=int, default=DEFAULT_MAX_JOBS_PER_WORKER,
+                            help="Recycle a worker process after this many jobs (0 = never)")
+    arg_parser.add_argument("--job-timeout", type=float, default=None,
+                            help="Seconds to wait for one job in worker mode before replying with an error "
+                                 "(default: RESUME_PARSER_JOB_TIMEOUT or 100)")
+    arg_parser.add_argument("--cache-path", default=default_cache_path(),
+                            help="SQLite file caching extracted text and parsed results by file hash "
+                                 "(default: RESUME_PARSER_CACHE_PATH or lib/resume_result_cache.sqlite3)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Always extract and parse from scratch")
+    return arg_parser
 
 def main():
-    if len(sys.argv) != 2:
+    args = build_arg_parser().parse_args()
+
+    cache_path = None if args.no_cache else args.cache_path
+
+    if args.worker:
+        run_worker(socket_path=args.socket_path, pool_size=args.pool_size, max_jobs_per_worker=args.max_jobs,
+                   cache_path=cache_path, job_timeout=args.job_timeout)
+        return
+
+    if not args.file_path:
         print(json.dumps({
             "error": "Usage: python enhanced_parser_cli.py <file_path>"
         }))
         sys.exit(1)
-    
-    file_path = sys.argv[1]
-    
-    if not os.path.exists(file_path):
-        print(json.dumps({
-            "error": f"File not found: {file_path}"
-        }))
-        sys.exit(1)
-    
-    try:
-        # Initialize EnhancedExtractor and extract text from the PDF
-        extractor = EnhancedExtractor(debug=False) # Set debug as needed
-        text = extractor.extract_from_pdf(file_path)
-        
-        if text is None or not text.strip():
-            print(json.dumps({
-                "error": f"Failed to extract text from PDF: {file_path}"
-            }))
-            sys.exit(1)
-        
-        # Initialize EnhancedParser with auto-detection for primary_field
-        parser = EnhancedParser()
-        parsed_data = parser.parse(text)
-        
-        print(json.dumps(parsed_data, indent=4))
-        
-    except Exception as e:
-        print(json.dumps({
-            "error": f"Error processing resume: {str(e)}", # Changed error message slightly for clarity
-            "traceback": traceback.format_exc() 
-        }))
+
+    # Initialize EnhancedExtractor and EnhancedParser with auto-detection for primary_field
+    extractor = EnhancedExtractor(debug=False) # Set debug as needed
+    parser = EnhancedParser()
+    cache = open_result_cache(extractor, parser, cache_path) if cache_path else None
+    parsed_data = process_resume_file(args.file_path, extractor, parser, cache)
+
+    print(json.dumps(parsed_data, indent=4))
+
+    if "error" in parsed_data:
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
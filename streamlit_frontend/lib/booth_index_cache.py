@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Shared on-disk store for job fair booth indexes (see ocr_utils.build_booth_index).
+
+A floor plan is identified by the SHA-256 of its image bytes, so the same map is
+found again whatever URL, file name or booth count it comes with, and two different
+maps never share an entry. Each entry is also tagged with the fingerprint of the
+detector/OCR settings that produced it and lookups only match the current one, so
+processes on different detector versions can share the file. The store is bounded
+and evicts the least recently used indexes, whatever their fingerprint, so entries
+from retired versions age out.
+
+The same database keeps per-strategy OCR statistics (attempts and accepted readings
+for each image variant/PSM combination, per map style) so booth numbers are read
+with the historically best strategies first.
+
+The store is a SQLite database in WAL mode: every write is a single atomic statement,
+readers never see a half-written index and any number of Streamlit sessions or worker
+processes can read while one of them writes.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'booth_index_cache.sqlite3')
+INDEX_PATH_ENV_VAR = "BOOTH_INDEX_CACHE_PATH"
+MAX_ENTRIES_ENV_VAR = "BOOTH_INDEX_CACHE_MAX_ENTRIES"
+DEFAULT_MAX_ENTRIES = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS booth_index (
+    map_hash TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    booths TEXT NOT NULL,
+    complete INTEGER NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (map_hash, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS booth_index_updated ON booth_index (updated);
+CREATE TABLE IF NOT EXISTS ocr_strategy_stats (
+    style TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    PRIMARY KEY (style, strategy)
+);
+"""
+
+
+def hash_map_bytes(data: bytes) -> str:
+    """SHA-256 hex digest of a map image's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def default_index_path() -> str:
+    return os.getenv(INDEX_PATH_ENV_VAR) or DEFAULT_INDEX_PATH
+
+
+class BoothIndexCache:
+    """
+    map hash -> booth index ({booth number: [x, y, w, h]}) for one detector fingerprint.
+
+    Store failures (locked or unwritable database, corrupt rows) never fail a page:
+    lookups return None and writes are skipped.
+    """
+
+    def __init__(self, path: Optional[str] = None, fingerprint: str = "", max_entries: Optional[int] = None):
+        self.path = path or default_index_path()
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv(MAX_ENTRIES_ENV_VAR, DEFAULT_MAX_ENTRIES))
+        self.hits = 0
+        self.misses = 0
+        # One connection per process, shared by Streamlit's script threads
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: autocommit, every statement is its own short transaction
+        self._conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, map_hash: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Return (booths, complete) for a map, or None when it has not been indexed."""
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT booths, complete FROM booth_index WHERE map_hash = ? AND fingerprint = ?",
+                    (map_hash, self.fingerprint)
+                ).fetchone()
+                if row is not None:
+                    # "updated" doubles as the last-used time for eviction
+                    self._conn.execute(
+                        "UPDATE booth_index SET updated = ? WHERE map_hash = ? AND fingerprint = ?",
+                        (time.time(), map_hash, self.fingerprint)
+                    )
+            booths = json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            booths = None
+        if not isinstance(booths, dict):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return booths, bool(row[1])
+
+    def put(self, map_hash: str, booths: Dict[str, Any], complete: bool = True):
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO booth_index (map_hash, fingerprint, booths, complete, updated) VALUES (?, ?, ?, ?, ?)",
+                    (map_hash, self.fingerprint, json.dumps(booths), int(complete), time.time())
+                )
+                if self.max_entries and self.max_entries > 0:
+                    # Evict least recently used indexes beyond the limit
+                    self._conn.execute(
+                        "DELETE FROM booth_index WHERE rowid IN ("
+                        "SELECT rowid FROM booth_index ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                        (self.max_entries,)
+                    )
+        except sqlite3.Error:
+            pass
+
+    def get_strategy_stats(self, style: str) -> Dict[str, Tuple[int, int]]:
+        """strategy -> (attempts, successes) recorded for a map style."""
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT strategy, attempts, successes FROM ocr_strategy_stats WHERE style = ?", (style,)
+                ).fetchall()
+        except sqlite3.Error:
+            return {}
+        return {strategy: (attempts, successes) for strategy, attempts, successes in rows}
+
+    def record_strategy_outcomes(self, style: str, outcomes: Dict[str, Tuple[int, int]]):
+        """Add strategy -> (attempts, successes) counts from one indexing run."""
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT INTO ocr_strategy_stats (style, strategy, attempts, successes) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (style, strategy) DO UPDATE SET "
+                    "attempts = attempts + excluded.attempts, successes = successes + excluded.successes",
+                    [(style, strategy, attempts, successes) for strategy, (attempts, successes) in outcomes.items()]
+                )
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        entries = None
+        try:
+            with self._lock:
+                entries = self._conn.execute("SELECT COUNT(*) FROM booth_index").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        return {"path": self.path, "hits": self.hits, "misses": self.misses, "max_entries": self.max_entries,
+                "entries": entries}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM booth_index")
+            self._conn.execute("DELETE FROM ocr_strategy_stats")
+
+    def close(self):
+        self._conn.close()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_booth_index_cache(fingerprint: str, path: Optional[str] = None) -> Optional[BoothIndexCache]:
+    """
+    Process-wide store for a detector fingerprint, or None if the database cannot be
+    opened (e.g. read-only location); callers then index without persisting.
+    """
+    path = path or default_index_path()
+    key = (path, fingerprint)
+    cache = _caches.get(key)
+    if cache is not None:
+        return cache
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            try:
+                cache = BoothIndexCache(path=path, fingerprint=fingerprint)
+            except (sqlite3.Error, OSError):
+                return None
+            _caches[key] = cache
+    return cache
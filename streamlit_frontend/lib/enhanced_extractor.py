@@ -5,21 +5,357 @@ import sys
 import json
 from pathlib import Path
 
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import threading
+
 # PDF Extraction
-from pdfminer.high_level import extract_text
-from pdfminer.layout import LAParams
+from pdfminer.converter import PDFPageAggregator, TextConverter
+from pdfminer.layout import LAParams, LTContainer, LTTextBox
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+import time
 import pytesseract
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 import tempfile
 import io
 import cv2
 import numpy as np
 
+try:
+    from .instrumentation import get_metrics, instrumentation_enabled, new_instrumentation
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from instrumentation import get_metrics, instrumentation_enabled, new_instrumentation
+
+try:
+    from .tracing import get_tracer
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from tracing import get_tracer
+
+# Bump when an extraction change alters output, so cached text and the results parsed from it
+# are recomputed (see result_cache.py)
+EXTRACTOR_VERSION = "2"
+
+# Optimized layout parameters for better text extraction
+PDFMINER_LAPARAMS = dict(
+    line_margin=0.25,      # Lower value to detect closely spaced lines
+    word_margin=0.1,       # Lower for better word grouping
+    char_margin=1.5,       # Character spacing
+    boxes_flow=0.5,        # Controls text flow detection (Reverted from -0.8)
+    detect_vertical=True,  # Important for modern layouts with columns
+    all_texts=True         # Capture all text blocks
+)
+
+
+def count_pdf_pages(pdf_path):
+    """Number of pages in the PDF (reads the page tree only, no layout analysis)."""
+    with open(pdf_path, 'rb') as fp:
+        return sum(1 for _ in PDFPage.get_pages(fp))
+
+
+def extract_pdfminer_page_texts(pdf_path, page_numbers=None, maxpages=0):
+    """
+    Run pdfminer layout analysis and return the text of each page, in page order.
+
+    This is what pdfminer.high_level.extract_text does, except that the output is
+    split per page: joining the returned strings gives exactly extract_text()'s
+    result (every page ends with a form feed). Module-level so process pools can
+    call it on a page range.
+    """
+    page_texts = []
+    with open(pdf_path, 'rb') as fp, io.StringIO() as output:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output, codec='utf-8', laparams=LAParams(**PDFMINER_LAPARAMS))
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, page_numbers, maxpages=maxpages, caching=True):
+            interpreter.process_page(page)
+            page_texts.append(output.getvalue())
+            output.seek(0)
+            output.truncate(0)
+    return page_texts
+
+
+def _iter_text_boxes(item):
+    """All LTTextBox objects in a layout tree (including those inside figures)."""
+    if isinstance(item, LTTextBox):
+        yield item
+    elif isinstance(item, LTContainer):
+        for child in item:
+            yield from _iter_text_boxes(child)
+
+
+def extract_pdfminer_page_geometry_texts(pdf_path, page_numbers=None, maxpages=0):
+    """
+    Geometry-based alternative to extract_pdfminer_page_texts(): walk each page's
+    LTTextBox objects once and emit them in column-major reading order (see
+    order_blocks_for_reading()) instead of pdfminer's flow order. Pages end with a
+    form feed, boxes with a blank line, like TextConverter output.
+    """
+    page_texts = []
+    with open(pdf_path, 'rb') as fp:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = PDFPageAggregator(rsrcmgr, laparams=LAParams(**PDFMINER_LAPARAMS))
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, page_numbers, maxpages=maxpages, caching=True):
+            interpreter.process_page(page)
+            layout = device.get_result()
+            # pdfminer's y axis points up; convert to top-down coordinates
+            blocks = [
+                (box.x0, layout.height - box.y1, box.x1, layout.height - box.y0, box.get_text())
+                for box in _iter_text_boxes(layout)
+            ]
+            ordered_blocks, _ = order_blocks_for_reading(blocks, layout.width)
+            page_texts.append("".join(block[4] + "\n" for block in ordered_blocks) + "\f")
+    return page_texts
+
+
+# pdfminer page functions by layout mode: "flow" keeps pdfminer's text order (and the
+# section-based two-column heuristics), "geometry" orders text boxes by coordinates
+PDFMINER_LAYOUT_MODES = {
+    "flow": extract_pdfminer_page_texts,
+    "geometry": extract_pdfminer_page_geometry_texts,
+}
+
+
+def ocr_gray_image(gray, deadline=None):
+    """
+    OCR one grayscale page image region by region (falls back to the whole page).
+
+    deadline is a time.monotonic() value; Tesseract calls are given only the time left
+    and the page stops (keeping the text found so far) once it has passed.
+    """
+    def remaining_time():
+        if deadline is None:
+            return 0 # pytesseract: no timeout
+        return deadline - time.monotonic()
+
+    extracted_text = ""
+    thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
+    
+    # Find contours and sort them from top to bottom
+    contours, hierarchy = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours = sorted(contours, key=lambda x: cv2.boundingRect(x)[1])
+    
+    try:
+        # Extract each section and perform OCR
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            # Skip very small contours that could be noise
+            if w < 50 or h < 50:  
+                continue
+            if deadline is not None and remaining_time() <= 0:
+                break
+            
+            # Extract only this contour
+            section_roi = gray[y:y+h, x:x+w]
+            section_text = pytesseract.image_to_string(section_roi, timeout=remaining_time())
+            extracted_text += section_text + "\n\n"
+        
+        # If no contours were processed, fall back to whole page OCR
+        if not extracted_text.strip() and (deadline is None or remaining_time() > 0):
+            extracted_text = pytesseract.image_to_string(gray, timeout=remaining_time())
+    except RuntimeError:
+        # pytesseract kills Tesseract and raises RuntimeError when the timeout expires
+        pass
+
+    return extracted_text
+
+
+def order_blocks_for_reading(blocks, page_width):
+    """
+    Put text blocks (x0, top, x1, bottom, text), in top-down page coordinates, into
+    column-major reading order.
+
+    Blocks wider than 60% of the page (name banners, full-width sections) split the
+    page into horizontal bands. Inside a band, blocks whose horizontal extents overlap
+    form one column; columns are read left to right and each column top to bottom.
+    Returns (ordered_blocks, max_columns_in_any_band).
+    """
+    ordered, band, max_columns = [], [], 1
+
+    def flush_band():
+        nonlocal max_columns
+        columns = []  # [x1_extent, [blocks]]
+        for block in sorted(band, key=lambda b: b[0]):
+            if columns and block[0] < columns[-1][0]:
+                columns[-1][0] = max(columns[-1][0], block[2])
+                columns[-1][1].append(block)
+            else:
+                columns.append([block[2], [block]])
+        max_columns = max(max_columns, len(columns))
+        for _, column_blocks in columns:
+            ordered.extend(sorted(column_blocks, key=lambda b: (b[1], b[0])))
+        band.clear()
+
+    for block in sorted(blocks, key=lambda b: (b[1], b[0])):
+        if page_width and (block[2] - block[0]) > 0.6 * page_width:
+            flush_band()
+            ordered.append(block)
+        else:
+            band.append(block)
+    flush_band()
+    return ordered, max_columns
+
+
+def ocr_gray_image_single_pass(gray, deadline=None):
+    """
+    OCR one grayscale page with a single Tesseract run (image_to_data) and rebuild the
+    text from the returned word boxes: words -> lines -> paragraphs -> blocks, blocks
+    in column-major reading order. Blocks smaller than 50x50 pixels are dropped like
+    the small contours of ocr_gray_image(), unless that would drop everything.
+    """
+    timeout = 0 if deadline is None else deadline - time.monotonic()
+    if deadline is not None and timeout <= 0:
+        return ""
+    try:
+        data = pytesseract.image_to_data(gray, output_type=pytesseract.Output.DICT, timeout=timeout)
+    except RuntimeError:
+        # pytesseract kills Tesseract and raises RuntimeError when the timeout expires
+        return ""
+
+    block_boxes = {}   # block_num -> [x0, top, x1, bottom]
+    block_lines = {}   # block_num -> {(par_num, line_num): [words]}, in Tesseract order
+    for i, word in enumerate(data["text"]):
+        if not word or not word.strip():
+            continue
+        block_num = data["block_num"][i]
+        x0, top = data["left"][i], data["top"][i]
+        x1, bottom = x0 + data["width"][i], top + data["height"][i]
+        box = block_boxes.setdefault(block_num, [x0, top, x1, bottom])
+        box[0], box[1] = min(box[0], x0), min(box[1], top)
+        box[2], box[3] = max(box[2], x1), max(box[3], bottom)
+        block_lines.setdefault(block_num, {}).setdefault((data["par_num"][i], data["line_num"][i]), []).append(word.strip())
+
+    blocks = []
+    for block_num, (x0, top, x1, bottom) in block_boxes.items():
+        lines, previous_par = [], None
+        for (par_num, _line_num), words in block_lines[block_num].items():
+            if previous_par is not None and par_num != previous_par:
+                lines.append("")
+            lines.append(" ".join(words))
+            previous_par = par_num
+        blocks.append((x0, top, x1, bottom, "\n".join(lines)))
+
+    # Skip very small regions that could be noise
+    large_blocks = [b for b in blocks if (b[2] - b[0]) >= 50 and (b[3] - b[1]) >= 50]
+    ordered_blocks, _ = order_blocks_for_reading(large_blocks or blocks, gray.shape[1])
+    return "".join(block[4] + "\n\n" for block in ordered_blocks)
+
+
+# OCR engines: "regions" runs Tesseract once per large contour, "page" once per page
+OCR_ENGINES = {
+    "regions": ocr_gray_image,
+    "page": ocr_gray_image_single_pass,
+}
+
+
+def ocr_pdf_page(pdf_path, page_number, dpi, timeout=None, engine="regions"):
+    """
+    Render a single (1-based) page in grayscale and OCR it. Only this page is ever in
+    memory, so callers can stream through documents of any length. Module-level so
+    process pools can run it.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                               grayscale=True, timeout=timeout)
+    ocr_image = OCR_ENGINES[engine]
+    return "".join(ocr_image(np.array(image), deadline) for image in images)
+
+
+# Process pools shared by all extractors in the process, keyed by (name, workers) and
+# created on first parallel use. Extractors with different worker counts get separate
+# pools, so a pool is never shut down while another extractor is still using it.
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_process_pool(name, workers):
+    with _process_pools_lock:
+        pool = _process_pools.get((name, workers))
+        if pool is None:
+            # Never fork: extractors run in threaded processes (Streamlit, the worker's
+            # socket threads), and forked children can inherit locks held by other threads
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            _process_pools[(name, workers)] = pool
+        return pool
+
+
+def _discard_process_pool(name, workers, pool):
+    """Forget a broken pool so the next parallel call starts a fresh one."""
+    with _process_pools_lock:
+        if _process_pools.get((name, workers)) is pool:
+            del _process_pools[(name, workers)]
+    pool.shutdown(wait=False)
+
+
+def _can_start_process_pool():
+    # Daemonic processes (e.g. parser_worker pool members) are not allowed to have children
+    return not multiprocessing.current_process().daemon
+
+
+def _split_pages(page_count, parts):
+    """Split range(page_count) into `parts` contiguous, nearly equal ranges."""
+    size, extra = divmod(page_count, parts)
+    ranges, start = [], 0
+    for i in range(parts):
+        end = start + size + (1 if i < extra else 0)
+        if end > start:
+            ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
 class EnhancedExtractor:
     """Improved PDF text extraction with better layout handling for modern resumes"""
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, pdfminer_workers=None, max_pages=None, ocr_min_page_chars=20,
+                 ocr_workers=None, ocr_dpi=200, ocr_page_timeout=60, ocr_engine=None, layout_mode=None,
+                 instrument=None):
         self.debug = debug
+        # Debug output goes through the "extractor" tracer (stderr/logging, never stdout)
+        self.trace = get_tracer("extractor", debug=debug)
+        # Per-stage timings (pdfminer, ocr, layout) in last_extraction["_timings"] and the
+        # process-wide metrics (default: RESUME_PARSER_INSTRUMENT); see instrumentation.py
+        self.instrument = instrumentation_enabled(instrument)
+        # >1 runs pdfminer layout analysis on page ranges in a process pool; the output
+        # is identical to the serial path (default: RESUME_PARSER_PDFMINER_WORKERS or 1)
+        if pdfminer_workers is None:
+            pdfminer_workers = int(os.getenv("RESUME_PARSER_PDFMINER_WORKERS", "1"))
+        self.pdfminer_workers = max(1, pdfminer_workers)
+        # Only the first max_pages pages are extracted, to bound work on huge uploads
+        # (default: RESUME_PARSER_MAX_PAGES or no limit)
+        if max_pages is None:
+            max_pages = int(os.getenv("RESUME_PARSER_MAX_PAGES", "0"))
+        self.max_pages = max_pages if max_pages > 0 else None
+        # Only pages whose text layer is essentially empty (fewer non-whitespace characters
+        # than this, e.g. a scanned page) are OCR'd; short digital pages such as a sign-off
+        # page keep their exact text layer
+        self.ocr_min_page_chars = ocr_min_page_chars
+        # OCR renders one grayscale page at a time at ocr_dpi; with ocr_workers > 1
+        # (default: RESUME_PARSER_OCR_WORKERS or 1) pages are OCR'd concurrently, so at
+        # most ocr_workers pages are in memory. A page gets ocr_page_timeout seconds.
+        if ocr_workers is None:
+            ocr_workers = int(os.getenv("RESUME_PARSER_OCR_WORKERS", "1"))
+        self.ocr_workers = max(1, ocr_workers)
+        self.ocr_dpi = ocr_dpi
+        self.ocr_page_timeout = ocr_page_timeout
+        # "regions" (Tesseract per large contour) or "page" (one image_to_data pass per
+        # page); default: RESUME_PARSER_OCR_ENGINE or "regions"
+        self.ocr_engine = ocr_engine or os.getenv("RESUME_PARSER_OCR_ENGINE", "regions")
+        if self.ocr_engine not in OCR_ENGINES:
+            raise ValueError(f"Unknown OCR engine '{self.ocr_engine}'; expected one of {sorted(OCR_ENGINES)}")
+        # "flow" (pdfminer text order + two-column heuristics) or "geometry" (columns
+        # from text box coordinates); default: RESUME_PARSER_LAYOUT_MODE or "flow"
+        self.layout_mode = layout_mode or os.getenv("RESUME_PARSER_LAYOUT_MODE", "flow")
+        if self.layout_mode not in PDFMINER_LAYOUT_MODES:
+            raise ValueError(f"Unknown layout mode '{self.layout_mode}'; expected one of {sorted(PDFMINER_LAYOUT_MODES)}")
+        # Per-page report of the last extract_from_pdf() call (which pages were OCR'd)
+        self.last_extraction = None
         # Pre-normalized section headers for efficient lookup in _process_layout
         self._normalized_section_keywords = {
             header_enum.upper().replace(" ", ""): True 
@@ -33,118 +369,173 @@ class EnhancedExtractor:
                 ['ACHIEVEMENTS', 'INTERESTS', 'CONTACT', 'REFERENCES', 'TRAINING', 'PUBLICATIONS', 'AWARDS', 'VOLUNTEER']
             ] for header_enum in header_list
         }
-        if self.debug:
-            print(f"DEBUG (__init__): Normalized section keywords for matching: {list(self._normalized_section_keywords.keys())[:10]}")
+        if self.trace.debug_enabled:
+            self.trace.debug("init", "Normalized section keywords for matching: %s", list(self._normalized_section_keywords.keys())[:10])
         
+    def cache_fingerprint(self):
+        """Identifies what the extracted text depends on (used as a cache key component)."""
+        return f"extractor-{EXTRACTOR_VERSION}-pages-{self.max_pages or 'all'}-ocr-below-{self.ocr_min_page_chars}-dpi-{self.ocr_dpi}-{self.ocr_engine}-{self.layout_mode}"
+
     def extract_from_pdf(self, pdf_path):
-        """Extract text from PDF with enhanced layout recognition"""
+        """
+        Extract text from PDF with enhanced layout recognition.
+
+        Each page is taken from the PDF text layer when it has enough text and OCR'd
+        otherwise, so a scanned page inside a digital PDF is neither lost nor forces
+        OCR of the whole document. self.last_extraction records the path each page took.
+        """
+        self.last_extraction = None
+        instrumentation = new_instrumentation(self.instrument)
         try:
-            if self.debug:
-                print(f"Extracting text from: {pdf_path}")
+            if self.trace.debug_enabled:
+                self.trace.debug("extract", "Extracting text from: %s", pdf_path)
             
             # First try with PDFMiner for better text-based extraction
-            text_from_miner = self._extract_with_pdfminer(pdf_path)
-            
-            # Check if the extraction was successful and has enough content
-            if text_from_miner and len(text_from_miner.strip()) > 200:
-                processed_text = self._process_layout(text_from_miner)
-                
-                # Save extracted text to file for debugging if needed
-                if self.debug:
-                    # Output to the current working directory of the script execution
-                    debug_output_filename = f"{Path(Path(pdf_path).name).stem}_extracted.txt"
-                    with open(debug_output_filename, "w", encoding="utf-8") as f:
-                        f.write(processed_text)
-                    if self.debug: print(f"DEBUG (EnhancedExtractor): Saved PDFMiner extracted text to: {os.path.abspath(debug_output_filename)}")
-                    
-                return processed_text
-            
-            # If PDFMiner failed or returned minimal text, try OCR as fallback
-            if self.debug:
-                print("PDFMiner extraction insufficient, trying OCR...")
+            with instrumentation.stage("pdfminer"):
+                page_texts = self._extract_pdfminer_pages(pdf_path)
+            pages_report = [
+                {"page": page_index + 1, "source": "text", "text_layer_chars": len(''.join(page_text.split()))}
+                for page_index, page_text in enumerate(page_texts)
+            ]
+            pages_needing_ocr = [
+                page_index for page_index, page_report in enumerate(pages_report)
+                if page_report["text_layer_chars"] < self.ocr_min_page_chars
+            ]
+
+            if not page_texts:
+                # No usable page tree from PDFMiner: OCR the whole document
+                if self.trace.debug_enabled:
+                    self.trace.debug("extract", "PDFMiner extraction insufficient, trying OCR...")
+                with instrumentation.stage("ocr"):
+                    merged_text = self._extract_with_ocr(pdf_path)
+                used_ocr = True
+            elif pages_needing_ocr:
+                if self.trace.debug_enabled:
+                    self.trace.debug("extract", "PDFMiner text insufficient on pages %s, trying OCR on those pages...", [i + 1 for i in pages_needing_ocr])
+                with instrumentation.stage("ocr"):
+                    ocr_texts = self._ocr_pages(pdf_path, pages_needing_ocr)
+                for page_index in pages_needing_ocr:
+                    ocr_text = ocr_texts.get(page_index, "")
+                    pages_report[page_index]["ocr_chars"] = len(''.join(ocr_text.split()))
+                    # The text layer is kept unless OCR actually read a page's worth of text;
+                    # a few stray glyphs from rules or logos never replace it
+                    if pages_report[page_index]["ocr_chars"] >= self.ocr_min_page_chars:
+                        page_texts[page_index] = ocr_text + "\f"
+                        pages_report[page_index]["source"] = "ocr"
+                merged_text = ''.join(page_texts)
+                used_ocr = any(page_report["source"] == "ocr" for page_report in pages_report)
+            else:
+                merged_text = ''.join(page_texts)
+                used_ocr = False
+
+            self.last_extraction = {
+                "layout_mode": self.layout_mode,
+                "page_count": len(page_texts),
+                "ocr_pages": [page_report["page"] for page_report in pages_report if page_report["source"] == "ocr"],
+                "pages": pages_report
+            }
+            with instrumentation.stage("layout"):
+                processed_text = self._process_layout(merged_text)
+            if instrumentation.enabled:
+                instrumentation.count("pages", len(page_texts))
+                instrumentation.count("ocr_pages", len(self.last_extraction["ocr_pages"]))
+                instrumentation.count("text_chars", len(processed_text))
+                self.last_extraction["_timings"] = instrumentation.as_dict()
+                get_metrics().record("extractor", instrumentation)
                 
-            text_from_ocr = self._extract_with_ocr(pdf_path)
-            processed_text = self._process_layout(text_from_ocr)
-            
             # Save extracted text to file for debugging if needed
             if self.debug:
                 # Output to the current working directory of the script execution
-                debug_output_filename_ocr = f"{Path(Path(pdf_path).name).stem}_ocr_extracted.txt"
-                with open(debug_output_filename_ocr, "w", encoding="utf-8") as f:
+                debug_output_filename = f"{Path(Path(pdf_path).name).stem}_{'ocr_' if used_ocr else ''}extracted.txt"
+                with open(debug_output_filename, "w", encoding="utf-8") as f:
                     f.write(processed_text)
-                if self.debug: print(f"DEBUG (EnhancedExtractor): Saved OCR extracted text to: {os.path.abspath(debug_output_filename_ocr)}")
+                self.trace.debug("extract", "Saved extracted text (%s OCR pages) to: %s", self.last_extraction['ocr_pages'] or 'no', os.path.abspath(debug_output_filename))
                     
             return processed_text
             
         except Exception as e:
-            if self.debug:
-                print(f"Error extracting PDF: {str(e)}")
-                import traceback
-                traceback.print_exc()
+            self.trace.warning("extract", "Error extracting PDF %s: %s", pdf_path, e, exc_info=self.trace.debug_enabled)
             return None
     
     def _extract_with_pdfminer(self, pdf_path):
         """Extract text using PDFMiner with optimized parameters"""
-        # Configure optimized layout parameters for better text extraction
-        laparams = LAParams(
-            line_margin=0.25,      # Lower value to detect closely spaced lines
-            word_margin=0.1,       # Lower for better word grouping
-            char_margin=1.5,       # Character spacing
-            boxes_flow=0.5,        # Controls text flow detection (Reverted from -0.8)
-            detect_vertical=True,  # Important for modern layouts with columns
-            all_texts=True         # Capture all text blocks
-        )
-        
-        # Extract raw text
-        raw_text = extract_text(pdf_path, laparams=laparams)
-        return raw_text
+        return ''.join(self._extract_pdfminer_pages(pdf_path))
+
+    def _extract_pdfminer_pages(self, pdf_path):
+        """Per-page PDFMiner text, in page order, serially or on page ranges in parallel"""
+        maxpages = self.max_pages or 0
+        extract_pages_function = PDFMINER_LAYOUT_MODES[self.layout_mode]
+        if self.pdfminer_workers > 1 and _can_start_process_pool():
+            page_count = count_pdf_pages(pdf_path)
+            if maxpages:
+                page_count = min(page_count, maxpages)
+            if page_count > 1:
+                page_ranges = _split_pages(page_count, min(self.pdfminer_workers, page_count))
+                pool = _get_process_pool("pdfminer", self.pdfminer_workers)
+                try:
+                    futures = [pool.submit(extract_pages_function, pdf_path, page_range) for page_range in page_ranges]
+                    page_texts = []
+                    for future in futures:
+                        page_texts.extend(future.result())
+                    if self.trace.debug_enabled: self.trace.debug("pdfminer", "Extracted %s pages in %s parallel ranges.", page_count, len(page_ranges))
+                    return page_texts
+                except BrokenProcessPool as e:
+                    self.trace.warning("pdfminer", "PDFMiner process pool broke (%s); restarting it on next use and extracting serially.", e)
+                    _discard_process_pool("pdfminer", self.pdfminer_workers, pool)
+                except Exception as e:
+                    if self.trace.debug_enabled: self.trace.debug("pdfminer", "Parallel PDFMiner extraction failed (%s); falling back to serial.", e)
+
+        return extract_pages_function(pdf_path, maxpages=maxpages)
     
     def _extract_with_ocr(self, pdf_path):
         """Extract text using OCR for better handling of complex layouts"""
         try:
-            # Convert PDF to images
-            images = convert_from_path(pdf_path)
-            extracted_text = ""
-            
-            for i, image in enumerate(images):
-                # Convert PIL image to OpenCV format
-                open_cv_image = np.array(image) 
-                open_cv_image = open_cv_image[:, :, ::-1].copy() 
-                
-                # Apply image preprocessing to improve OCR
-                gray = cv2.cvtColor(open_cv_image, cv2.COLOR_BGR2GRAY)
-                thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)[1]
-                
-                # Find contours and sort them from top to bottom
-                contours, hierarchy = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-                contours = sorted(contours, key=lambda x: cv2.boundingRect(x)[1])
-                
-                # Create image mask for sections
-                mask = np.ones(gray.shape, dtype=np.uint8) * 255
-                
-                # Extract each section and perform OCR
-                for contour in contours:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    # Skip very small contours that could be noise
-                    if w < 50 or h < 50:  
-                        continue
-                    
-                    # Extract only this contour
-                    section_roi = gray[y:y+h, x:x+w]
-                    section_text = pytesseract.image_to_string(section_roi)
-                    extracted_text += section_text + "\n\n"
-                
-                # If no contours were processed, fall back to whole page OCR
-                if not extracted_text.strip():
-                    extracted_text = pytesseract.image_to_string(gray)
-            
-            return extracted_text
+            page_count = pdfinfo_from_path(pdf_path)["Pages"]
+            if self.max_pages:
+                page_count = min(page_count, self.max_pages)
+            ocr_texts = self._ocr_pages(pdf_path, range(page_count))
+            return "".join(ocr_texts[page_index] for page_index in range(page_count))
             
         except Exception as e:
-            if self.debug:
-                print(f"OCR extraction error: {str(e)}")
+            self.trace.warning("ocr", "OCR extraction error: %s", e)
             # Return an empty string on error
             return ""
+
+    def _ocr_pages(self, pdf_path, page_indices):
+        """OCR only the given (0-based) pages, one rendered page per worker at a time; returns {page_index: text}"""
+        page_indices = list(page_indices)
+        ocr_texts = {}
+        timeout = self.ocr_page_timeout
+
+        if self.ocr_workers > 1 and len(page_indices) > 1 and _can_start_process_pool():
+            pool = _get_process_pool("ocr", self.ocr_workers)
+            try:
+                futures = {
+                    page_index: pool.submit(ocr_pdf_page, pdf_path, page_index + 1, self.ocr_dpi, timeout, self.ocr_engine)
+                    for page_index in page_indices
+                }
+                for page_index, future in futures.items():
+                    try:
+                        ocr_texts[page_index] = future.result()
+                    except BrokenProcessPool:
+                        raise
+                    except Exception as e:
+                        self.trace.warning("ocr", "OCR extraction error on page %s: %s", page_index + 1, e)
+                        ocr_texts[page_index] = ""
+                return ocr_texts
+            except BrokenProcessPool as e:
+                # A dead worker fails every pending page; OCR whatever is left serially
+                self.trace.warning("ocr", "OCR process pool broke (%s); restarting it on next use and OCRing the remaining pages serially.", e)
+                _discard_process_pool("ocr", self.ocr_workers, pool)
+                page_indices = [page_index for page_index in page_indices if page_index not in ocr_texts]
+
+        for page_index in page_indices:
+            try:
+                ocr_texts[page_index] = ocr_pdf_page(pdf_path, page_index + 1, self.ocr_dpi, timeout, self.ocr_engine)
+            except Exception as e:
+                self.trace.warning("ocr", "OCR extraction error on page %s: %s", page_index + 1, e)
+                ocr_texts[page_index] = ""
+        return ocr_texts
     
     def _process_layout(self, text):
         """Process extracted text to handle modern resume layouts"""
@@ -205,15 +596,15 @@ class EnhancedExtractor:
             else:
                 structured_text.append(line)
         
-        if self.debug:
-            print("DEBUG (_process_layout): Structured text WITH SECTION_MARKERS before _process_two_column call:")
+        if self.trace.debug_enabled:
+            self.trace.debug("layout", "Structured text WITH SECTION_MARKERS before _process_two_column call:")
             for i, line_debug in enumerate(structured_text[:50]): # Print first 50 lines
-                print(f"  Line {i}: {line_debug}")
-            if len(structured_text) > 50: print("  ...")
+                self.trace.debug("layout", "  Line %s: %s", i, line_debug)
+            if len(structured_text) > 50: self.trace.debug("layout", "  ...")
 
-        # Handle potential two-column layouts
-        if self._is_likely_two_column(structured_text):
-            if self.debug: print("DEBUG (_process_layout): _is_likely_two_column is TRUE. Calling _process_two_column.")
+        # Handle potential two-column layouts (geometry mode already emits columns in reading order)
+        if self.layout_mode != "geometry" and self._is_likely_two_column(structured_text):
+            if self.trace.debug_enabled: self.trace.debug("layout", "_is_likely_two_column is TRUE. Calling _process_two_column.")
             structured_text = self._process_two_column(structured_text)
             
         # Join processed text and clean up section markers
@@ -254,8 +645,8 @@ class EnhancedExtractor:
                 section_content = lines[start_idx:end_idx]
                 section_title = section_markers[i][1].replace("SECTION_MARKER: ", "")
                 
-                if self.debug:
-                    print(f"DEBUG (_process_two_column): Identified raw section - Title: '{section_title}', StartIdx: {start_idx}, EndIdx: {end_idx}")
+                if self.trace.debug_enabled:
+                    self.trace.debug("layout", "Identified raw section - Title: '%s', StartIdx: %s, EndIdx: %s", section_title, start_idx, end_idx)
                     # print(f"  Content lines for '{section_title}': {section_content[:3]}") # Might be too verbose
 
                 # Add to sections with its title for better sorting
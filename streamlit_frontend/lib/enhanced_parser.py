@@ -1,132 +1,188 @@
 #!/usr/bin/env python
+import hashlib
+import json
+import multiprocessing
+import os
 import re
-import spacy
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
 import sys
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 
-# Download necessary NLTK resources if not available
 try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
+    from .text_matching import KeywordAutomaton, PrefixIndex, fold_case, is_word_char
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from text_matching import KeywordAutomaton, PrefixIndex, fold_case, is_word_char
 
 try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
+    from .entity_table import DocumentEntityTable, LineEntities, get_entity_cache
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from entity_table import DocumentEntityTable, LineEntities, get_entity_cache
 
-# Load spaCy model for entity recognition
 try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Downloading spaCy en_core_web_sm model...")
-    spacy.cli.download("en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
+    from .nlp_model import get_nlp, resolve_model_name
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from nlp_model import get_nlp, resolve_model_name
 
+try:
+    from .instrumentation import get_metrics, instrumentation_enabled, new_instrumentation
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from instrumentation import get_metrics, instrumentation_enabled, new_instrumentation
 
-class EnhancedParser:
+try:
+    from .tracing import get_tracer
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from tracing import get_tracer
+
+# Bump when a parsing change alters output, so cached results are recomputed (see result_cache.py)
+PARSER_VERSION = "1"
+
+# Result fields parse() can compute, and those that need spaCy (NER)
+PARSE_FIELDS = ("education", "experience", "skills", "summary", "primary_field")
+NER_FIELDS = frozenset(["education", "experience"])
+
+# Worker processes used by EnhancedParser.parse_many() (default: serial)
+PARSE_WORKERS_ENV_VAR = "RESUME_PARSER_PARSE_WORKERS"
+
+# Lines starting with these are responsibilities, never company/location lines
+RESPONSIBILITY_VERB_PREFIXES = ("assisted", "developed", "managed", "led", "responsible", "created", "implemented", "designed", "collaborated", "participated", "gained", "coordinated")
+
+
+# --- Default taxonomy -------------------------------------------------------
+# Parsers never modify these; ParserTaxonomy turns them into frozen, precompiled
+# structures once per process (see get_default_taxonomy()).
+
+SKILL_CATEGORIES = {
+    'programming_languages': ['Python', 'Java', 'JavaScript', 'C++', 'C#', 'PHP', 'TypeScript', 'Ruby', 'Swift', 'Kotlin', 'Go', 'Rust', 'R', 'MATLAB'],
+    'web_development': ['HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'Laravel', 'Express.js', 'Spring Boot', 'ASP.NET', 'Bootstrap', 'Tailwind CSS', 'jQuery', 'Redux', 'REST API'],
+    'database': ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'SQLite', 'Oracle', 'Firebase', 'DynamoDB', 'Redis', 'Cassandra', 'NoSQL'],
+    'devops': ['Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Git', 'CI/CD', 'Jenkins', 'Terraform', 'Ansible', 'Linux', 'Bash', 'Shell Scripting'],
+    'mobile': ['Android', 'iOS', 'Flutter', 'React Native', 'Swift UI', 'Jetpack Compose', 'Kotlin Multiplatform', 'Xamarin', 'App Development'],
+    'data_science': ['Machine Learning', 'Data Analysis', 'NumPy', 'Pandas', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'NLP', 'Computer Vision', 'Big Data', 'Statistics', 'Data Visualization', 'Tableau', 'Power B', 'Jupyter'],
+    'design_tools': ['Figma', 'Adobe XD', 'Sketch', 'InVision', 'Photoshop', 'Illustrator', 'UI/UX Design', 'Prototyping', 'Wireframing', 'Canva', 'Responsive Design'],
+    'financial_analysis': ['Financial Modeling', 'Financial Analysis', 'Valuation', 'DCF', 'Financial Statements', 'Equity Research', 'Investment Analysis', 'Portfolio Management', 'Risk Assessment', 'Forecasting', 'Analysis'],
+    'financial_software': ['Excel', 'Bloomberg Terminal', 'FactSet', 'Capital IQ', 'QuickBooks', 'SAP', 'Oracle Financials', 'Microsoft Dynamics', 'Tableau', 'Power BI', 'PowerPoint'],
+    'accounting': ['Accounting', 'Auditing', 'Financial Reporting', 'Bookkeeping', 'GAAP', 'IFRS', 'Tax Preparation', 'Budgeting', 'Cost Accounting', 'Reconciliation'],
+    'finance_certifications': ['CFA', 'CPA', 'FRM', 'Series 7', 'Series 63', 'ChFC', 'CFP', 'EA', 'CAIA', 'PMP', 'Six Sigma'],
+    'banking': ['Investment Banking', 'Commercial Banking', 'Corporate Finance', 'M&A', 'Capital Markets', 'Wealth Management', 'Credit Analysis', 'Underwriting', 'Private Equity', 'Venture Capital'],
+    'clinical_skills': ['Patient Care', 'Venepuncture', 'Vital Signs', 'CPR', 'Suturing', 'Injections', 'Wound Care', 'Physical Examination', 'Diagnosis', 'Treatment Planning', 'Medical Documentation', 'Triage', 'EMR'],
+    'medical_specialties': ['Pediatrics', 'Surgery', 'Internal Medicine', 'Psychiatry', 'Radiology', 'Obstetrics', 'Gynecology', 'O&G', 'Obstetrics & Gynecology', 'Cardiology', 'Neurology', 'Oncology', 'Emergency Medicine', 'Family Medicine', 'Anesthesiology'], # Added O&G, Obstetrics & Gynecology
+    'medical_knowledge': ['Anatomy', 'Physiology', 'Pharmacology', 'Pathology', 'Microbiology', 'Immunology', 'Biochemistry', 'Genetics', 'Medical Terminology', 'Disease Management', 'Clinical Research', 'Monitoring'],
+    'healthcare_systems': ['Electronic Medical Records', 'EMR', 'EHR', 'Health Informatics', 'HIPAA', 'Healthcare Compliance', 'Medical Billing', 'Coding', 'Hospital Management', 'Public Health', 'Telemedicine'],
+    'medical_technologies': ['Medical Imaging', 'Ultrasound', 'X-ray', 'CT Scan', 'MRI', 'Medical Devices', 'Surgical Equipment', 'Lab Equipment', 'Health Monitoring Systems', 'Remote Patient Monitoring']
+}
+
+SOFT_SKILLS_KEYWORDS = [
+    'Communication', 'Leadership', 'Teamwork', 'Problem Solving', 'Assertive', 'Resilience',
+    'Critical Thinking', 'Time Management', 'Adaptability', 'Organization', 'Empathy',
+    'Creativity', 'Analytical Skills', 'Attention to Detail', 'Collaboration', 'Counseling',
+    'Project Management', 'Presentation Skills', 'Research', 'Writing', 'Documentation',
+    'Negotiation', 'Interpersonal Skills', 'Decision Making', 'Emotional Intelligence',
+    'Debugging', 'Problem-solving',
+    'Time-management'
+]
+
+SECTION_HEADERS = {
+    'contact': ['contact'],
+    'summary': ['profile', 'summary', 'objective', 'about me', 'professional summary'],
+    'education': ['education', 'academic background', 'academic qualifications', 'qualifications'],
+    'experience': ['experience', 'employment history', 'work history', 'professional experience', 'work experience'],
+    'skills': ['skills', 'expertise', 'competencies', 'technical skills', 'technologies'],
+    'projects': ['projects', 'portfolio', 'personal projects'],
+    'languages': ['languages', 'language proficiency'],
+    'references': ['references', 'reference']
+}
+
+INDUSTRY_KEYWORDS = {
+    'computer_science': ['software', 'web', 'development', 'programming', 'engineering', 'data science', 'IT', 'information technology', 'tech', 'cyber', 'frontend', 'backend', 'full stack', 'devops', 'cloud', 'artificial intelligence', 'AI', 'ML', 'machine learning', 'UX', 'UI', 'database', 'algorithm', 'coding', 'computer science', 'developer'],
+    'finance': ['finance', 'financial', 'banking', 'investment', 'finacial services', 'accounting', 'auditing', 'wealth management', 'trading', 'asset management', 'risk', 'tax', 'economic', 'insurance', 'fintech', 'financial technology', 'budget', 'treasury', 'regulatory', 'compliance', 'portfolio', 'equity', 'capital', 'cfa', 'cpa', 'frm', 'analyst', 'graduate', 'reports', 'variance', 'forecasting', 'ledger', 'commerce'],
+    'medical': ['medical', 'healthcare', 'clinical', 'hospital', 'patient care', 'pharmacy', 'doctor', 'physician', 'nursing', 'dental', 'health', 'biomedical', 'pharmaceutical', 'life sciences', 'biotech', 'telemedicine', 'wellness', 'surgery', 'pediatrics', 'anatomy', 'diagnosis', 'suturing', 'mbbs', 'md', 'rn', 'pharmacology', 'physiology', 'pathology']
+}
+
+DEGREES_LIST = [
+    'Bachelor of Computer Science', 'BSc Computer Science', 'B.Sc. Computer Science', 'Bachelor of Science in Computer Science',
+    'Master of Computer Science', 'MSc Computer Science', 'M.Sc. Computer Science', 'PhD Computer Science', 'Doctor of Philosophy in Computer Science',
+    'Bachelor of Information Technology', 'BSc IT', 'Master of Information Technology', 'MSc IT', 'PhD Information Technology',
+    'Bachelor of Software Engineering', 'BSc Software Engineering', 'Master of Software Engineering',
+    'Bachelor of Data Science', 'Master of Data Science', 'PhD Data Science',
+    'Bachelor of Artificial Intelligence', 'Master of Artificial Intelligence', 'PhD Artificial Intelligence',
+    'Bachelor of Finance', 'BSc Finance', 'BBA Finance', 'Bachelor of Business Administration in Finance',
+    'Master of Finance', 'MSc Finance', 'MBA Finance', 'PhD Finance', 'Doctor of Philosophy in Finance',
+    'Bachelor of Accounting', 'BAcc', 'Bachelor of Commerce', 'BCom', 'Master of Accounting', 'MAcc', 'Master of Commerce', 'MCom',
+    'Chartered Accountant', 'Certified Public Accountant', 'CPA', 'Chartered Financial Analyst', 'CFA',
+    'Bachelor of Finance (Hons)',
+    'Bachelor of Medicine and Bachelor of Surgery', 'Bachelor of Medicine', 'Bachelor of Surgery', 'MBBS', 'MD', 'Doctor of Medicine', 'Doctor of Dental Surgery', 'DDS',
+    'Bachelor of Pharmacy', 'BPharm', 'Master of Pharmacy', 'MPharm', 'Doctor of Pharmacy', 'PharmD',
+    'Bachelor of Nursing', 'BNurs', 'Master of Nursing', 'MNurs', 'Doctor of Nursing Practice', 'DNP',
+    'Bachelor of Biomedical Science', 'Master of Biomedical Science', 'PhD Biomedical Science',
+    'Diploma', 'Certificate', 'Associate Degree', 'Foundation', 'Matriculation', 'Honours', 'Hons.'
+]
+
+JOB_TITLES_LIST = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Web Developer', 'Mobile Developer', 'DevOps Engineer',
+    'Data Scientist', 'Data Analyst', 'Machine Learning Engineer', 'AI Engineer', 'Cloud Engineer', 'System Administrator', 'Network Engineer',
+    'Security Engineer', 'QA Engineer', 'Test Engineer', 'UI/UX Designer', 'Product Manager', 'Technical Lead', 'CTO', 'IT Support', 'Junior Developer Intern',
+    'Accountant', 'Auditor', 'Financial Analyst', 'Investment Analyst', 'Risk Analyst', 'Portfolio Manager', 'Asset Manager', 'Finance Manager', 'Finance Intern',
+    'Chief Financial Officer', 'CFO', 'Tax Consultant', 'Treasury Analyst', 'Compliance Officer', 'Credit Analyst', 'Loan Officer',
+    'Bank Manager', 'Branch Manager', 'Wealth Manager', 'Actuary', 'Underwriter', 'Insurance Agent', 'Financial Planner', 'Forensic Accountant',
+    'Medical Doctor', 'Physician', 'Surgeon', 'Dentist', 'Pharmacist', 'Nurse', 'Clinical Researcher', 'Medical Laboratory Scientist', 'Clinical Posting Student', 'Medical Intern',
+    'Radiologist', 'Anesthesiologist', 'Pediatrician', 'Psychiatrist', 'General Practitioner', 'Specialist', 'Therapist', 'Occupational Therapist',
+    'Physical Therapist', 'Speech Therapist', 'Medical Officer', 'House Officer', 'Resident', 'Consultant', 'Medical Assistant', 'Paramedic',
+    'Healthcare Administrator', 'Medical Coder', 'Medical Biller', 'Medical Transcriptionist'
+]
+
+INSTITUTION_MARKERS = ['university', 'college', 'institute', 'school', 'academy', 'polytechnic', 'kebangsaan', 'teknologi', 'universiti']
+
+# Keywords that might indicate a company name if NER fails
+COMPANY_NAME_KEYWORDS = [
+    'Sdn Bhd', 'Ltd', 'Inc', 'LLC', 'Corp', 'Berhad', 'Group', 'Solutions', 'Technologies', 'Services',
+    'Consulting', 'Bank', 'Hospital', 'Clinic', 'University', 'Institute', 'School', 'Foundation', 'Center', 'Centre'
+]
+
+
+class _FrozenDict(dict):
+    """Read-only dict used for the shared taxonomy mappings (pickles as a plain copy)."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("ParserTaxonomy mappings are read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+
+class ParserTaxonomy:
     """
-    Enhanced resume parser with improved accuracy for modern resume formats.
-    Handles various layouts and provides better structured extraction.
-    Focuses on Skills (General/Soft), Work Experience, and Education.
+    Immutable, precompiled vocabulary used by EnhancedParser.
+
+    Building the lookup structures (skill automaton, sorted references, compiled
+    patterns) is the expensive part of creating a parser, so it is done once and the
+    same object is shared by every parser instance. Use get_default_taxonomy() for the
+    built-in vocabulary; pass custom lists to build a different one. Instances are
+    picklable, and forked pool workers simply inherit the parent's copy.
     """
-        
-    def __init__(self, debug=False, primary_field=None):
-        self.debug = debug
-        self.primary_field = primary_field
-        
-        self.skill_categories = {
-            'programming_languages': ['Python', 'Java', 'JavaScript', 'C++', 'C#', 'PHP', 'TypeScript', 'Ruby', 'Swift', 'Kotlin', 'Go', 'Rust', 'R', 'MATLAB'],
-            'web_development': ['HTML', 'CSS', 'React', 'Angular', 'Vue.js', 'Node.js', 'Django', 'Flask', 'Laravel', 'Express.js', 'Spring Boot', 'ASP.NET', 'Bootstrap', 'Tailwind CSS', 'jQuery', 'Redux', 'REST API'],
-            'database': ['SQL', 'MySQL', 'PostgreSQL', 'MongoDB', 'SQLite', 'Oracle', 'Firebase', 'DynamoDB', 'Redis', 'Cassandra', 'NoSQL'],
-            'devops': ['Docker', 'Kubernetes', 'AWS', 'Azure', 'GCP', 'Git', 'CI/CD', 'Jenkins', 'Terraform', 'Ansible', 'Linux', 'Bash', 'Shell Scripting'],
-            'mobile': ['Android', 'iOS', 'Flutter', 'React Native', 'Swift UI', 'Jetpack Compose', 'Kotlin Multiplatform', 'Xamarin', 'App Development'],
-            'data_science': ['Machine Learning', 'Data Analysis', 'NumPy', 'Pandas', 'TensorFlow', 'PyTorch', 'Scikit-learn', 'NLP', 'Computer Vision', 'Big Data', 'Statistics', 'Data Visualization', 'Tableau', 'Power B', 'Jupyter'],
-            'design_tools': ['Figma', 'Adobe XD', 'Sketch', 'InVision', 'Photoshop', 'Illustrator', 'UI/UX Design', 'Prototyping', 'Wireframing', 'Canva', 'Responsive Design'],
-            'financial_analysis': ['Financial Modeling', 'Financial Analysis', 'Valuation', 'DCF', 'Financial Statements', 'Equity Research', 'Investment Analysis', 'Portfolio Management', 'Risk Assessment', 'Forecasting', 'Analysis'],
-            'financial_software': ['Excel', 'Bloomberg Terminal', 'FactSet', 'Capital IQ', 'QuickBooks', 'SAP', 'Oracle Financials', 'Microsoft Dynamics', 'Tableau', 'Power BI', 'PowerPoint'],
-            'accounting': ['Accounting', 'Auditing', 'Financial Reporting', 'Bookkeeping', 'GAAP', 'IFRS', 'Tax Preparation', 'Budgeting', 'Cost Accounting', 'Reconciliation'],
-            'finance_certifications': ['CFA', 'CPA', 'FRM', 'Series 7', 'Series 63', 'ChFC', 'CFP', 'EA', 'CAIA', 'PMP', 'Six Sigma'],
-            'banking': ['Investment Banking', 'Commercial Banking', 'Corporate Finance', 'M&A', 'Capital Markets', 'Wealth Management', 'Credit Analysis', 'Underwriting', 'Private Equity', 'Venture Capital'],
-            'clinical_skills': ['Patient Care', 'Venepuncture', 'Vital Signs', 'CPR', 'Suturing', 'Injections', 'Wound Care', 'Physical Examination', 'Diagnosis', 'Treatment Planning', 'Medical Documentation', 'Triage', 'EMR'],
-            'medical_specialties': ['Pediatrics', 'Surgery', 'Internal Medicine', 'Psychiatry', 'Radiology', 'Obstetrics', 'Gynecology', 'O&G', 'Obstetrics & Gynecology', 'Cardiology', 'Neurology', 'Oncology', 'Emergency Medicine', 'Family Medicine', 'Anesthesiology'], # Added O&G, Obstetrics & Gynecology
-            'medical_knowledge': ['Anatomy', 'Physiology', 'Pharmacology', 'Pathology', 'Microbiology', 'Immunology', 'Biochemistry', 'Genetics', 'Medical Terminology', 'Disease Management', 'Clinical Research', 'Monitoring'],
-            'healthcare_systems': ['Electronic Medical Records', 'EMR', 'EHR', 'Health Informatics', 'HIPAA', 'Healthcare Compliance', 'Medical Billing', 'Coding', 'Hospital Management', 'Public Health', 'Telemedicine'],
-            'medical_technologies': ['Medical Imaging', 'Ultrasound', 'X-ray', 'CT Scan', 'MRI', 'Medical Devices', 'Surgical Equipment', 'Lab Equipment', 'Health Monitoring Systems', 'Remote Patient Monitoring']
-        }
-        
-        self.soft_skills_keywords = [
-            'Communication', 'Leadership', 'Teamwork', 'Problem Solving', 'Assertive', 'Resilience',
-            'Critical Thinking', 'Time Management', 'Adaptability', 'Organization', 'Empathy',
-            'Creativity', 'Analytical Skills', 'Attention to Detail', 'Collaboration', 'Counseling',
-            'Project Management', 'Presentation Skills', 'Research', 'Writing', 'Documentation',
-            'Negotiation', 'Interpersonal Skills', 'Decision Making', 'Emotional Intelligence',
-            'Debugging', 'Problem-solving',
-            'Time-management'
-        ]
-        
-        self.section_headers = {
-            'contact': ['contact'],
-            'summary': ['profile', 'summary', 'objective', 'about me', 'professional summary'],
-            'education': ['education', 'academic background', 'academic qualifications', 'qualifications'],
-            'experience': ['experience', 'employment history', 'work history', 'professional experience', 'work experience'],
-            'skills': ['skills', 'expertise', 'competencies', 'technical skills', 'technologies'],
-            'projects': ['projects', 'portfolio', 'personal projects'],
-            'languages': ['languages', 'language proficiency'],
-            'references': ['references', 'reference']
-        }
 
-        self.industry_keywords = {
-            'computer_science': ['software', 'web', 'development', 'programming', 'engineering', 'data science', 'IT', 'information technology', 'tech', 'cyber', 'frontend', 'backend', 'full stack', 'devops', 'cloud', 'artificial intelligence', 'AI', 'ML', 'machine learning', 'UX', 'UI', 'database', 'algorithm', 'coding', 'computer science', 'developer'],
-            'finance': ['finance', 'financial', 'banking', 'investment', 'finacial services', 'accounting', 'auditing', 'wealth management', 'trading', 'asset management', 'risk', 'tax', 'economic', 'insurance', 'fintech', 'financial technology', 'budget', 'treasury', 'regulatory', 'compliance', 'portfolio', 'equity', 'capital', 'cfa', 'cpa', 'frm', 'analyst', 'graduate', 'reports', 'variance', 'forecasting', 'ledger', 'commerce'],
-            'medical': ['medical', 'healthcare', 'clinical', 'hospital', 'patient care', 'pharmacy', 'doctor', 'physician', 'nursing', 'dental', 'health', 'biomedical', 'pharmaceutical', 'life sciences', 'biotech', 'telemedicine', 'wellness', 'surgery', 'pediatrics', 'anatomy', 'diagnosis', 'suturing', 'mbbs', 'md', 'rn', 'pharmacology', 'physiology', 'pathology']
-        }
-        
-        self.degrees_list = [
-        'Bachelor of Computer Science', 'BSc Computer Science', 'B.Sc. Computer Science', 'Bachelor of Science in Computer Science',
-        'Master of Computer Science', 'MSc Computer Science', 'M.Sc. Computer Science', 'PhD Computer Science', 'Doctor of Philosophy in Computer Science',
-        'Bachelor of Information Technology', 'BSc IT', 'Master of Information Technology', 'MSc IT', 'PhD Information Technology',
-        'Bachelor of Software Engineering', 'BSc Software Engineering', 'Master of Software Engineering',
-        'Bachelor of Data Science', 'Master of Data Science', 'PhD Data Science',
-        'Bachelor of Artificial Intelligence', 'Master of Artificial Intelligence', 'PhD Artificial Intelligence',
-        'Bachelor of Finance', 'BSc Finance', 'BBA Finance', 'Bachelor of Business Administration in Finance',
-        'Master of Finance', 'MSc Finance', 'MBA Finance', 'PhD Finance', 'Doctor of Philosophy in Finance',
-        'Bachelor of Accounting', 'BAcc', 'Bachelor of Commerce', 'BCom', 'Master of Accounting', 'MAcc', 'Master of Commerce', 'MCom',
-        'Chartered Accountant', 'Certified Public Accountant', 'CPA', 'Chartered Financial Analyst', 'CFA',
-        'Bachelor of Finance (Hons)',
-            'Bachelor of Medicine and Bachelor of Surgery', 'Bachelor of Medicine', 'Bachelor of Surgery', 'MBBS', 'MD', 'Doctor of Medicine', 'Doctor of Dental Surgery', 'DDS',
-        'Bachelor of Pharmacy', 'BPharm', 'Master of Pharmacy', 'MPharm', 'Doctor of Pharmacy', 'PharmD',
-        'Bachelor of Nursing', 'BNurs', 'Master of Nursing', 'MNurs', 'Doctor of Nursing Practice', 'DNP',
-        'Bachelor of Biomedical Science', 'Master of Biomedical Science', 'PhD Biomedical Science',
-            'Diploma', 'Certificate', 'Associate Degree', 'Foundation', 'Matriculation', 'Honours', 'Hons.'
-    ]
-
-        # Sort degrees_list by length (descending) to match longer, more specific degrees first
-        self.degrees_list.sort(key=len, reverse=True)
-
-        self.job_titles_list = [
-        'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Web Developer', 'Mobile Developer', 'DevOps Engineer',
-        'Data Scientist', 'Data Analyst', 'Machine Learning Engineer', 'AI Engineer', 'Cloud Engineer', 'System Administrator', 'Network Engineer',
-            'Security Engineer', 'QA Engineer', 'Test Engineer', 'UI/UX Designer', 'Product Manager', 'Technical Lead', 'CTO', 'IT Support', 'Junior Developer Intern',
-            'Accountant', 'Auditor', 'Financial Analyst', 'Investment Analyst', 'Risk Analyst', 'Portfolio Manager', 'Asset Manager', 'Finance Manager', 'Finance Intern',
-        'Chief Financial Officer', 'CFO', 'Tax Consultant', 'Treasury Analyst', 'Compliance Officer', 'Credit Analyst', 'Loan Officer',
-        'Bank Manager', 'Branch Manager', 'Wealth Manager', 'Actuary', 'Underwriter', 'Insurance Agent', 'Financial Planner', 'Forensic Accountant',
-            'Medical Doctor', 'Physician', 'Surgeon', 'Dentist', 'Pharmacist', 'Nurse', 'Clinical Researcher', 'Medical Laboratory Scientist', 'Clinical Posting Student', 'Medical Intern',
-        'Radiologist', 'Anesthesiologist', 'Pediatrician', 'Psychiatrist', 'General Practitioner', 'Specialist', 'Therapist', 'Occupational Therapist',
-        'Physical Therapist', 'Speech Therapist', 'Medical Officer', 'House Officer', 'Resident', 'Consultant', 'Medical Assistant', 'Paramedic',
-        'Healthcare Administrator', 'Medical Coder', 'Medical Biller', 'Medical Transcriptionist'
-    ]
-
-        self.institution_markers = ['university', 'college', 'institute', 'school', 'academy', 'polytechnic', 'kebangsaan', 'teknologi', 'universiti']
-
-        self.company_name_keywords = [ # Keywords that might indicate a company name if NER fails
-            'Sdn Bhd', 'Ltd', 'Inc', 'LLC', 'Corp', 'Berhad', 'Group', 'Solutions', 'Technologies', 'Services',
-            'Consulting', 'Bank', 'Hospital', 'Clinic', 'University', 'Institute', 'School', 'Foundation', 'Center', 'Centre'
-        ]
+    def __init__(self, skill_categories=None, soft_skills_keywords=None, section_headers=None,
+                 industry_keywords=None, degrees_list=None, job_titles_list=None,
+                 institution_markers=None, company_name_keywords=None):
+        skill_categories = SKILL_CATEGORIES if skill_categories is None else skill_categories
+        section_headers = SECTION_HEADERS if section_headers is None else section_headers
+        industry_keywords = INDUSTRY_KEYWORDS if industry_keywords is None else industry_keywords
+
+        self.skill_categories = _FrozenDict((key, tuple(skills)) for key, skills in skill_categories.items())
+        self.soft_skills_keywords = tuple(SOFT_SKILLS_KEYWORDS if soft_skills_keywords is None else soft_skills_keywords)
+        self.section_headers = _FrozenDict((key, tuple(phrases)) for key, phrases in section_headers.items())
+        self.industry_keywords = _FrozenDict((key, tuple(keywords)) for key, keywords in industry_keywords.items())
+        # Sorted by length (descending) to match longer, more specific degrees first
+        self.degrees_list = tuple(sorted(DEGREES_LIST if degrees_list is None else degrees_list, key=len, reverse=True))
+        self.job_titles_list = tuple(JOB_TITLES_LIST if job_titles_list is None else job_titles_list)
+        self.institution_markers = tuple(INSTITUTION_MARKERS if institution_markers is None else institution_markers)
+        self.institution_markers_lower = tuple(marker.lower() for marker in self.institution_markers)
+        self.company_name_keywords = tuple(COMPANY_NAME_KEYWORDS if company_name_keywords is None else company_name_keywords)
 
         # Define education-specific patterns
         self.date_pattern_education = re.compile(
@@ -134,11 +190,19 @@ class EnhancedParser:
             re.IGNORECASE
         )
         self.cgpa_pattern_education = re.compile(r'(?:CGPA|GPA)[:\s]*([0-4]\.\d{1,2}|[1-3])(?:\s*/\s*[45]\.0?)?', re.IGNORECASE)
-        self.institution_markers_lower = [marker.lower() for marker in self.institution_markers]
         self.acronym_pattern = re.compile(r'\(([A-Z]{2,6})\)')
 
-        # --- START: New __init__ logic for sorted_skill_references ---
-        self.sorted_skill_references = []
+        # Experience date patterns
+        self.date_pattern_experience = re.compile(
+            r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?)\s*(19|20\d{2})\s*(?:-|–|to|until)\s*(?:((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?)\s*(19|20\d{2})|Present|Current|Now)',
+            re.IGNORECASE
+        )
+        self.year_date_pattern_experience = re.compile(r'\b(19|20)\d{2}\s*(?:(?:-|–|to|until)\s*(19|20)\d{2})?|\b(Present|Current|Now)\b', re.IGNORECASE)
+
+        # Sub-headers inside the skills section
+        self.general_skills_header_pattern = re.compile(r'^ \s*(General|Technical|Hard|Core)\s+Skills?\s*[: \n]', re.IGNORECASE | re.MULTILINE)
+        self.soft_skills_header_pattern = re.compile(r'^ \s*Soft\s+Skills?\s*[: \n]', re.IGNORECASE | re.MULTILINE)
+
         _skill_map = {} # temp map to handle precedence and store canonical names
 
         # Populate with general skills first
@@ -151,94 +215,376 @@ class EnhancedParser:
         for soft_skill_name in self.soft_skills_keywords:
             if soft_skill_name: # Ensure skill_name is not empty
                 _skill_map[soft_skill_name.lower()] = {'canonical': soft_skill_name, 'type': 'soft'}
-        
+
         # Convert to list of (canonical_name, type) and sort by length of canonical name descending
         # This ensures longer skills (e.g., "UI/UX Design") are matched before shorter ones (e.g., "UI")
-        self.sorted_skill_references = sorted(
+        self.sorted_skill_references = tuple(sorted(
             [(data['canonical'], data['type']) for data in _skill_map.values() if data['canonical']], # Ensure canonical is not empty
             key=lambda x: len(x[0]),
             reverse=True
+        ))
+
+        # Single automaton over all skill names. Hits are resolved in the order of
+        # sorted_skill_references (the automaton value is the index into it).
+        self.skill_automaton = KeywordAutomaton(
+            (canonical_name, rank) for rank, (canonical_name, _skill_type) in enumerate(self.sorted_skill_references)
+        )
+
+        # All industry keywords in one automaton; the value is the field they count towards
+        self.industry_keyword_automaton = KeywordAutomaton(
+            (keyword, field) for field, keywords in self.industry_keywords.items() for keyword in keywords
         )
-        if self.debug:
-            # print(f"DEBUG (__init__): Sorted skill references (first 10): {self.sorted_skill_references[:10]}")
-            # print(f"DEBUG (__init__): Sorted skill references (last 10): {self.sorted_skill_references[-10:]}")
-            pass # Keep debug prints minimal for now
-        # --- END: New __init__ logic for sorted_skill_references ---
+
+        # Degrees: prefix trie answering "longest degree this line starts with"
+        self.degree_index = PrefixIndex((degree, degree) for degree in self.degrees_list)
+
+        # Job titles: a prefix trie for "does this line start with a title" (longest first)
+        # and an exact lookup for "is this line a title". First spelling listed wins.
+        known_job_titles = [title for title in self.job_titles_list if isinstance(title, str) and title]
+        self.job_title_index = PrefixIndex((title, title) for title in known_job_titles)
+        _job_titles_by_lower = {}
+        for title in known_job_titles:
+            _job_titles_by_lower.setdefault(title.lower(), title)
+        self.job_titles_by_lower = _FrozenDict(_job_titles_by_lower)
+
+        # Section header phrases with case and all whitespace removed -> section keys, in order
+        _header_sections = {}
+        for section_key, header_phrases in self.section_headers.items():
+            for phrase in header_phrases:
+                normalized_phrase = ''.join(phrase.lower().split())
+                if section_key not in _header_sections.setdefault(normalized_phrase, []):
+                    _header_sections[normalized_phrase].append(section_key)
+        self.header_sections_by_normalized_phrase = _FrozenDict(
+            (phrase, tuple(section_keys)) for phrase, section_keys in _header_sections.items()
+        )
+
+        # Content hash of the vocabulary; changes whenever any list/mapping above changes
+        self.fingerprint = hashlib.sha256(json.dumps({
+            "skill_categories": self.skill_categories,
+            "soft_skills_keywords": self.soft_skills_keywords,
+            "section_headers": self.section_headers,
+            "industry_keywords": self.industry_keywords,
+            "degrees_list": self.degrees_list,
+            "job_titles_list": self.job_titles_list,
+            "institution_markers": self.institution_markers,
+            "company_name_keywords": self.company_name_keywords
+        }, sort_keys=True).encode('utf-8')).hexdigest()
+
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("ParserTaxonomy is immutable; build a new one instead")
+        super().__setattr__(name, value)
+
+
+_default_taxonomy = None
 
 
-    def parse(self, text: str) -> Dict[str, Any]:
-        if self.debug:
-            print("\n--- Starting Resume Parsing ---")
-            print(f"Input text (first 300 chars): {text[:300].replace(chr(10), ' ')}")
+def get_default_taxonomy() -> ParserTaxonomy:
+    """Return the process-wide taxonomy built from the module-level defaults."""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = ParserTaxonomy()
+    return _default_taxonomy
+
+
+class EnhancedParser:
+    """
+    Enhanced resume parser with improved accuracy for modern resume formats.
+    Handles various layouts and provides better structured extraction.
+    Focuses on Skills (General/Soft), Work Experience, and Education.
+
+    The vocabulary comes from a shared ParserTaxonomy, so creating a parser is cheap;
+    only per-instance options (debug, primary_field) live on the instance. parse()
+    never changes them, so one instance can parse any number of documents.
+    """
+
+    def __init__(self, debug=False, primary_field=None, taxonomy: Optional[ParserTaxonomy] = None,
+                 spacy_model: Optional[str] = None, instrument: Optional[bool] = None):
+        self.debug = debug
+        # Debug output goes through the "parser" tracer (stderr/logging, never stdout);
+        # debug=True or RESUME_PARSER_TRACE_LEVEL=debug turns it on, see tracing.py
+        self.trace = get_tracer("parser", debug=debug)
+        self.primary_field = primary_field
+        # Per-stage timings and counters as a "_timings" result block plus the process-wide
+        # metrics (default: RESUME_PARSER_INSTRUMENT); see instrumentation.py
+        self.instrument = instrumentation_enabled(instrument)
+        # spaCy model name or path; None means RESUME_PARSER_SPACY_MODEL or en_core_web_sm.
+        # The model itself is loaded lazily (and shared) on the first parse.
+        self.spacy_model = spacy_model
+        self.taxonomy = taxonomy if taxonomy is not None else get_default_taxonomy()
+
+        # Shortcuts to the shared (read-only) taxonomy; nothing is copied per instance
+        self.skill_categories = self.taxonomy.skill_categories
+        self.soft_skills_keywords = self.taxonomy.soft_skills_keywords
+        self.section_headers = self.taxonomy.section_headers
+        self.industry_keywords = self.taxonomy.industry_keywords
+        self.degrees_list = self.taxonomy.degrees_list
+        self.job_titles_list = self.taxonomy.job_titles_list
+        self.institution_markers = self.taxonomy.institution_markers
+        self.institution_markers_lower = self.taxonomy.institution_markers_lower
+        self.company_name_keywords = self.taxonomy.company_name_keywords
+        self.date_pattern_education = self.taxonomy.date_pattern_education
+        self.cgpa_pattern_education = self.taxonomy.cgpa_pattern_education
+        self.acronym_pattern = self.taxonomy.acronym_pattern
+        self.sorted_skill_references = self.taxonomy.sorted_skill_references
+        self.skill_automaton = self.taxonomy.skill_automaton
+        self.job_title_index = self.taxonomy.job_title_index
+        # Set by parse() for the duration of one document (see _prefetch_entities)
+        self._entity_table = None
+
+    def parse(self, text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Parse one resume. fields limits the work to some of PARSE_FIELDS (default: all);
+        only those keys are returned, and stages no requested field depends on are
+        skipped, so e.g. fields=("skills", "primary_field") never loads spaCy.
+        """
+        fields = self._resolve_fields(fields)
+        if self.trace.debug_enabled:
+            self.trace.debug("parse", "\n--- Starting Resume Parsing ---")
+            self.trace.debug("parse", "Input text (first 300 chars): %s", text[:300].replace(chr(10), ' '))
 
         # Normalize newlines
         text = text.replace('\r\n', '\n').replace('\r', '\n')
+        instrumentation = new_instrumentation(self.instrument)
+
+        # An auto-detected field belongs to this document only
+        primary_field = self.primary_field
+        field_classification = None
+        if not primary_field and "primary_field" in fields:
+            with instrumentation.stage("field_detection"):
+                field_classification = self.classify_field(text)
+            primary_field = field_classification["primary_field"]
+
+        # Experience reads the full text; the other fields read their own section
+        sections = {}
+        if fields - {"experience", "primary_field"}:
+            with instrumentation.stage("sections"):
+                sections = self._extract_sections(text)
+
+        if fields & NER_FIELDS:
+            self._entity_table = self._new_entity_table()
+            try:
+                with instrumentation.stage("ner_prefetch"):
+                    self._prefetch_entities(text, sections.get('education', text) if "education" in fields else "",
+                                            include_company_lines="experience" in fields)
+                extracted_data = self._extract_all(text, sections, primary_field, fields, instrumentation)
+            finally:
+                instrumentation.count("ner_lines_batched", self._entity_table.batched)
+                instrumentation.count("ner_single_calls", self._entity_table.single_calls)
+                self._entity_table = None
+        else:
+            extracted_data = self._extract_all(text, sections, primary_field, fields, instrumentation)
 
-        if not self.primary_field:
-            self.primary_field = self._identify_primary_field(text)
-
-        sections = self._extract_sections(text)
-        
-        # ALWAYS pass the full text to _extract_experience.
-        # Its internal logic, with _is_line_a_potential_header_or_new_title,
-        # should handle segmentation of experience entries and prevent over-collection.
-        if self.debug:
-            print(f"DEBUG (parse): Passing full text (len: {len(text)}) to _extract_experience.")
-        experience_entries = self._extract_experience(text, self.primary_field)
+        if field_classification:
+            extracted_data["primary_field_scores"] = field_classification["scores"]
+            extracted_data["primary_field_confidence"] = field_classification["confidence"]
         
-        extracted_data = {
-            "education": self._extract_education(sections.get('education', text)),
-            "experience": experience_entries, 
-            "skills": self._extract_skills(sections.get('skills', text), self.primary_field),
-            "summary": sections.get('summary', sections.get('profile', "Summary not found")), 
-            "primary_field": self.primary_field
+        if self.trace.debug_enabled:
+            self.trace.debug("parse", "--- Extracted Data ---")
+            for field in PARSE_FIELDS:
+                if field in extracted_data and field != "summary":
+                    self.trace.debug("parse", "%s: %s", field.replace('_', ' ').title(), extracted_data[field])
+            self.trace.debug("parse", "--- Resume Parsing Complete ---\n")
+
+        if instrumentation.enabled:
+            instrumentation.count("lines", text.count('\n') + 1)
+            instrumentation.count("sections_found", len(sections))
+            if "skills" in extracted_data:
+                instrumentation.count("skills_matched", sum(len(skills) for skills in extracted_data["skills"].values()))
+            for field in ("education", "experience"):
+                if field in extracted_data:
+                    instrumentation.count(f"{field}_entries", len(extracted_data[field]))
+            extracted_data["_timings"] = instrumentation.as_dict()
+            get_metrics().record("parser", instrumentation)
+            
+        return extracted_data
+
+    def parse_many(self, texts: Iterable[str], workers: Optional[int] = None, ordered: bool = True,
+                   max_in_flight: Optional[int] = None, fields: Optional[Iterable[str]] = None) -> Iterator:
+        """
+        Parse a stream of documents (see parse() for fields), each classified on its own.
+        A document that fails yields an {"error": ..., "traceback": ...} result instead
+        of stopping the batch.
+
+        With more than one worker (default: RESUME_PARSER_PARSE_WORKERS or 1) documents
+        are parsed in a process pool whose processes build their parser and load the
+        spaCy model once. At most max_in_flight documents (default: two per worker) are
+        queued at a time, so texts may be a lazy iterable of any length.
+
+        ordered=True yields results in input order; ordered=False yields
+        (index, result) pairs as documents complete.
+        """
+        fields = self._resolve_fields(fields)
+        if workers is None:
+            workers = int(os.getenv(PARSE_WORKERS_ENV_VAR, "1"))
+        workers = max(1, workers)
+
+        # Daemonic processes (e.g. parser_worker pool members) are not allowed to have children
+        if workers == 1 or multiprocessing.current_process().daemon:
+            for index, text in enumerate(texts):
+                result = self._parse_or_error(text, fields)
+                yield result if ordered else (index, result)
+            return
+
+        max_in_flight = max(workers, max_in_flight or workers * 2)
+        options = {
+            "debug": self.debug,
+            "primary_field": self.primary_field,
+            "spacy_model": self.spacy_model,
+            "instrument": self.instrument,
+            # Workers rebuild the default taxonomy themselves; only a custom one is sent
+            "taxonomy": None if self.taxonomy is get_default_taxonomy() else self.taxonomy
         }
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker, initargs=(options,))
+        try:
+            numbered_texts = enumerate(texts)
+            in_flight = {}  # future -> input index
+            submission_order = deque()
+            exhausted = False
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        index, text = next(numbered_texts)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(_parse_in_worker, text, fields)
+                    in_flight[future] = index
+                    submission_order.append(future)
+                if not in_flight:
+                    break
+                if ordered:
+                    future = submission_order.popleft()
+                    del in_flight[future]
+                    yield _future_result(future)
+                else:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in sorted(done, key=in_flight.get):
+                        submission_order.remove(future)
+                        yield in_flight.pop(future), _future_result(future)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _parse_or_error(self, text: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        try:
+            return self.parse(text, fields)
+        except Exception as e:
+            return {
+                "error": f"Error parsing resume: {str(e)}",
+                "traceback": traceback.format_exc()
+            }
+
+    @staticmethod
+    def _resolve_fields(fields: Optional[Iterable[str]]) -> frozenset:
+        if fields is None:
+            return frozenset(PARSE_FIELDS)
+        if isinstance(fields, str):
+            fields = [fields]
+        fields = frozenset(fields)
+        unknown = fields.difference(PARSE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown parse fields: {', '.join(sorted(unknown))} (expected some of {', '.join(PARSE_FIELDS)})")
+        return fields
+
+    def _extract_all(self, text: str, sections: Dict[str, str], primary_field: str, fields: frozenset,
+                     instrumentation) -> Dict[str, Any]:
+        experience_entries = None
+        if "experience" in fields:
+            # ALWAYS pass the full text to _extract_experience.
+            # Its internal logic, with _is_line_a_potential_header_or_new_title,
+            # should handle segmentation of experience entries and prevent over-collection.
+            if self.trace.debug_enabled:
+                self.trace.debug("parse", "Passing full text (len: %s) to _extract_experience.", len(text))
+            with instrumentation.stage("experience"):
+                experience_entries = self._extract_experience(text, primary_field)
         
-        if self.debug:
-            print("--- Extracted Data ---")
-            print(f"Education: {extracted_data['education']}")
-            print(f"Experience: {extracted_data['experience']}")
-            print(f"Skills: {extracted_data['skills']}")
-            print(f"Primary Field: {extracted_data['primary_field']}")
-            print("--- Resume Parsing Complete ---\n")
-            
+        extracted_data = {}
+        if "education" in fields:
+            with instrumentation.stage("education"):
+                extracted_data["education"] = self._extract_education(sections.get('education', text))
+        if "experience" in fields:
+            extracted_data["experience"] = experience_entries
+        if "skills" in fields:
+            with instrumentation.stage("skills"):
+                extracted_data["skills"] = self._extract_skills(sections.get('skills', text), primary_field)
+        if "summary" in fields:
+            extracted_data["summary"] = sections.get('summary', sections.get('profile', "Summary not found"))
+        if "primary_field" in fields:
+            extracted_data["primary_field"] = primary_field
         return extracted_data
 
-    def _identify_primary_field(self, text_to_analyze):
+    def _prefetch_entities(self, text: str, education_text: str, include_company_lines: bool = True):
+        """
+        Run every line that a later stage may ask spaCy about through one nlp.pipe() batch:
+        all education lines (institution candidates) and, for experience extraction, the
+        short lines of the whole document that could be company/location lines, plus the
+        halves of "A, B" lines. Anything not collected here is still resolved on demand
+        by the entity table.
+        """
+        candidates = [line.strip() for line in education_text.split('\n')]
+        for raw_line in text.split('\n') if include_company_lines else []:
+            line = raw_line.strip()
+            if not line or len(line.split()) > 7 or not self._could_be_company_location_line(line):
+                continue
+            candidates.append(line)
+            if ',' in line:
+                candidates.extend(part.strip() for part in line.split(',', 1))
+        self._entity_table.prefetch(candidates)
+        if self.trace.debug_enabled: self.trace.debug("ner_prefetch", "Batched NER for %s unique lines.", self._entity_table.batched)
+
+    def _new_entity_table(self) -> DocumentEntityTable:
+        return DocumentEntityTable(get_nlp(self.spacy_model), cache=get_entity_cache(resolve_model_name(self.spacy_model)))
+
+    def cache_fingerprint(self) -> str:
+        """Identifies what this parser's output depends on: code version, taxonomy, spaCy model and field."""
+        return hashlib.sha256("|".join([
+            PARSER_VERSION,
+            self.taxonomy.fingerprint,
+            resolve_model_name(self.spacy_model),
+            self.primary_field or "auto"
+        ]).encode('utf-8')).hexdigest()
+
+    def entity_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and size of the process-wide entity cache used by this parser."""
+        return get_entity_cache(resolve_model_name(self.spacy_model)).stats()
+
+    def _entities(self, text: str) -> LineEntities:
+        """Entities for a line, served from the per-document table while parse() runs."""
+        if self._entity_table is not None:
+            return self._entity_table.get(text)
+        return self._new_entity_table().get(text)
+
+    def score_fields(self, text_to_analyze: str) -> Dict[str, int]:
+        """
+        Count industry keyword hits per field in a single pass over the text.
+        A keyword only counts when it is not preceded or followed by a word character.
+        """
         category_scores = {field: 0 for field in self.industry_keywords.keys()}
-        
+
         # Normalize whitespace: replace multiple spaces/newlines with a single space
         normalized_text = re.sub(r'\s+', ' ', text_to_analyze).strip()
+        text_length = len(normalized_text)
 
-        if self.debug: 
-            print(f"DEBUG (_identify_primary_field): Analyzing full text for primary field (length: {len(text_to_analyze)} chars).")
-            print(f"DEBUG (_identify_primary_field): Normalized text for analysis (first 300): '{normalized_text[:300]}'")
-            manual_check_keyword = 'software' 
-            # Test with new regex pattern directly
-            pattern_manual_check = r'(?<!\w)' + re.escape(manual_check_keyword) + r'(?!\w)'
-            manual_occurrences_new_regex = len(re.findall(pattern_manual_check, normalized_text, re.IGNORECASE))
-            print(f"DEBUG (_identify_primary_field): MANUAL CHECK with new regex '{pattern_manual_check}' - Keyword '{manual_check_keyword}' found {manual_occurrences_new_regex} times in NORMALIZED text.")
-            if manual_check_keyword.lower() in normalized_text.lower():
-                 print(f"DEBUG (_identify_primary_field): MANUAL CHECK - Substring '{manual_check_keyword}' IS present in lowercased normalized_text.")
-            else:
-                 print(f"DEBUG (_identify_primary_field): MANUAL CHECK - Substring '{manual_check_keyword}' IS NOT present in lowercased normalized_text.")
-        
-        for field, keywords in self.industry_keywords.items():
-            for keyword in keywords:
-                try:
-                    # Use more robust regex: (?<!\w)keyword(?!\w)
-                    # This means "not preceded by a word character" and "not followed by a word character"
-                    pattern = r'(?<!\w)' + re.escape(keyword) + r'(?!\\w)'
-                    occurrences = len(re.findall(pattern, normalized_text, re.IGNORECASE))
-                    if occurrences > 0:
-                        category_scores[field] += occurrences
-                        if self.debug:
-                           print(f"DEBUG (_identify_primary_field): Keyword '{keyword}' (pattern: '{pattern}') found {occurrences} times, adding to {field}. Current score for {field}: {category_scores[field]}")
-                except re.error as e:
-                    if self.debug: print(f"DEBUG (_identify_primary_field): Regex error for keyword '{keyword}', pattern '{pattern}': {e}")
-                    continue
-        
-        if self.debug: print(f"DEBUG (_identify_primary_field): Final category scores: {category_scores}")
+        for start, end, field in self.taxonomy.industry_keyword_automaton.iter_matches(fold_case(normalized_text)):
+            if start > 0 and is_word_char(normalized_text[start - 1]):
+                continue
+            if end < text_length and is_word_char(normalized_text[end]):
+                continue
+            category_scores[field] += 1
+
+        if self.trace.debug_enabled: self.trace.debug("field_detection", "Final category scores: %s", category_scores)
+        return category_scores
+
+    def classify_field(self, text_to_analyze: str) -> Dict[str, Any]:
+        """
+        Identify the primary field of a resume.
+
+        Returns a dict with the winning "primary_field", the per-field keyword "scores"
+        and a "confidence" (winner's share of all keyword hits, 0.0 when nothing matched).
+        """
+        category_scores = self.score_fields(text_to_analyze)
 
         # Determine the primary field based on the highest score
         
@@ -248,12 +594,7 @@ class EnhancedParser:
         if total_matches == 0: # No keywords matched across all categories
             primary_field_identified = "auto" # Changed from "general" to "auto" when no keywords match
         else:
-            max_score = 0
-            # First pass to find the max_score (must be > 0 if total_matches > 0)
-            for score in category_scores.values():
-                if score > max_score:
-                    max_score = score
-            
+            max_score = max(category_scores.values())
             top_fields = [field for field, score in category_scores.items() if score == max_score]
 
             if len(top_fields) == 1 : 
@@ -269,14 +610,23 @@ class EnhancedParser:
                 else: 
                     primary_field_identified = top_fields[0] # Fallback to the first in list if no priority match (e.g. custom categories later)
         
-        if self.debug: print(f"DEBUG (_identify_primary_field): Determined primary field: {primary_field_identified}")
-        return primary_field_identified
+        confidence = round(category_scores.get(primary_field_identified, 0) / total_matches, 3) if total_matches else 0.0
+
+        if self.trace.debug_enabled: self.trace.debug("field_detection", "Determined primary field: %s (confidence %s)", primary_field_identified, confidence)
+        return {
+            "primary_field": primary_field_identified,
+            "scores": category_scores,
+            "confidence": confidence
+        }
+
+    def _identify_primary_field(self, text_to_analyze):
+        return self.classify_field(text_to_analyze)["primary_field"]
 
     def _extract_sections(self, text: str) -> Dict[str, str]:
         extracted_sections = {}
 
-        if self.debug: 
-            print(f"DEBUG (_extract_sections): Processing text for section extraction (len: {len(text)} chars).")
+        if self.trace.debug_enabled: 
+            self.trace.debug("sections", "Processing text for section extraction (len: %s chars).", len(text))
 
         normalized_to_section_key_map = {}
         temp_normalized_list = []
@@ -316,8 +666,8 @@ class EnhancedParser:
                     actual_match_start = line_start_pos + line_content.find(stripped_line_text)
                     actual_match_end = actual_match_start + len(stripped_line_text)
                     
-                    if self.debug:
-                        print(f"DEBUG (_extract_sections):   CONFIRMED match for normalized header '{norm_header_to_find}' (key: {target_section_key}) on line: '{stripped_line_text}'")
+                    if self.trace.debug_enabled:
+                        self.trace.debug("sections", "CONFIRMED match for normalized header '%s' (key: %s) on line: '%s'", norm_header_to_find, target_section_key, stripped_line_text)
                     
                     found_headers_raw.append({
                         'start': actual_match_start,
@@ -336,9 +686,9 @@ class EnhancedParser:
                 unique_final_headers.append(header_info)
                 last_header_end = header_info['end']
 
-        if self.debug:
-            print(f"DEBUG (_extract_sections): Number of unique headers found: {len(unique_final_headers)}")
-            for h in unique_final_headers: print(f"  Found Header: {h['key']} - '{h['header_line']}' @ {h['start']}")
+        if self.trace.debug_enabled:
+            self.trace.debug("sections", "Number of unique headers found: %s", len(unique_final_headers))
+            for h in unique_final_headers: self.trace.debug("sections", "  Found Header: %s - '%s' @ %s", h['key'], h['header_line'], h['start'])
 
         for i, header_data in enumerate(unique_final_headers):
             section_key = header_data['key']
@@ -352,24 +702,24 @@ class EnhancedParser:
             if section_text_content:
                 if section_key not in extracted_sections: 
                      extracted_sections[section_key] = section_text_content
-                elif self.debug:
-                     print(f"DEBUG (_extract_sections): Section key '{section_key}' already exists. Current content (1st 50): '{extracted_sections[section_key][:50]}'. New content (1st 50): '{section_text_content[:50]}'. NOT appending/overwriting for now.")
+                elif self.trace.debug_enabled:
+                     self.trace.debug("sections", "Section key '%s' already exists. Current content (1st 50): '%s'. New content (1st 50): '%s'. NOT appending/overwriting for now.", section_key, extracted_sections[section_key][:50], section_text_content[:50])
 
 
-        if self.debug:
-            print(f"DEBUG (_extract_sections): Final section keys populated in extracted_sections: {list(extracted_sections.keys())}")
+        if self.trace.debug_enabled:
+            self.trace.debug("sections", "Final section keys populated in extracted_sections: %s", list(extracted_sections.keys()))
             for k, v_text in extracted_sections.items():
-                print(f"DEBUG (_extract_sections): Section '{k}' content (first 100 chars): {v_text[:100].replace(chr(10), ' ')}")
+                self.trace.debug("sections", "Section '%s' content (first 100 chars): %s", k, v_text[:100].replace(chr(10), ' '))
         
         return extracted_sections
 
     def _extract_education(self, education_text: str) -> List[Dict[str, Any]]:
-        if self.debug:
-            print(f"DEBUG (_extract_education): Received education_text (len: {len(education_text)} chars)")
+        if self.trace.debug_enabled:
+            self.trace.debug("education", "Received education_text (len: %s chars)", len(education_text))
             # print(f"Raw education_text:\n'''{education_text[:500]}...'''") # Print initial part
         
         if not education_text or not education_text.strip():
-            if self.debug: print("DEBUG (_extract_education): Education text is empty or not provided.")
+            if self.trace.debug_enabled: self.trace.debug("education", "Education text is empty or not provided.")
             return []
 
         education_entries = []
@@ -378,8 +728,7 @@ class EnhancedParser:
         # Initialize patterns here if they are complex and used repeatedly
         # Example: date_pattern = re.compile(r'\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{4}\s*-\s*(?:(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{4}|Present|Current)|\b\d{4}\s*-\s*\d{4}\b|\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\s+\d{4}\b|\b\d{4}\b')
         # Moved to __init__ as self.date_pattern_education
-        cgpa_pattern = re.compile(r'(?:CGPA|GPA)[:\s]*([0-4]\.\d{1,2}|[1-3])(?:\s*/\s*[45]\.0?)?', re.IGNORECASE)
-        # Moved to __init__ as self.cgpa_pattern
+        # CGPA pattern lives on the taxonomy as self.cgpa_pattern_education
 
         # Helper function to finalize and store an education entry
         def finalize_current_education_entry():
@@ -404,59 +753,56 @@ class EnhancedParser:
                 ]
                 if len(meaningful_fields) > 1: # Requires at least two meaningful fields beyond just a year
                     education_entries.append(current_entry_data)
-                if self.debug: print(f"DEBUG (_extract_education): Finalized and added entry: {current_entry_data}")
-                elif self.debug:
-                    print(f"DEBUG (_extract_education): Skipped adding entry due to insufficient meaningful data: {current_entry_data}")
+                if self.trace.debug_enabled: self.trace.debug("education", "Finalized and added entry: %s", current_entry_data)
+                elif self.trace.debug_enabled:
+                    self.trace.debug("education", "Skipped adding entry due to insufficient meaningful data: %s", current_entry_data)
 
             current_entry_data = {} # Reset for the next entry
 
         # Pre-splitting lines and iterating
-        if self.debug: print(f"DEBUG (_extract_education): About to split education_text. Type: {type(education_text)}")
+        if self.trace.debug_enabled: self.trace.debug("education", "About to split education_text. Type: %s", type(education_text))
         # print(repr(education_text)) # <<< THE DEBUG LINE TO ADD
         lines = education_text.strip().split('\n')
-        if self.debug: print(f"DEBUG (_extract_education): Split into {len(lines)} lines. First few: {lines[:5]}")
+        if self.trace.debug_enabled: self.trace.debug("education", "Split into %s lines. First few: %s", len(lines), lines[:5])
+
+        # Classify every line once; the institution look-ahead and the finalize check
+        # below revisit the same lines and reuse these results.
+        stripped_lines = [raw_line.strip() for raw_line in lines]
+        line_degrees = [self._match_degree_at_start(stripped) for stripped in stripped_lines]
+        line_standalone_dates = [self.date_pattern_education.fullmatch(stripped) for stripped in stripped_lines]
+        line_standalone_cgpas = []
+        for stripped in stripped_lines:
+            # Check if the line *starts with* CGPA: xxx, not necessarily fullmatch
+            cgpa_prefix_match = self.cgpa_pattern_education.match(stripped)
+            line_standalone_cgpas.append(cgpa_prefix_match and len(cgpa_prefix_match.group(0)) > 5) # Ensure it's a substantial CGPA string
 
         line_idx = 0
         while line_idx < len(lines):
             line = lines[line_idx]
-            if self.debug: print(f"DEBUG (_extract_education): Processing line {line_idx + 1}/{len(lines)}: '{line}'")
+            if self.trace.debug_enabled: self.trace.debug("education", "Processing line %s/%s: '%s'", line_idx + 1, len(lines), line)
 
             original_line_for_institution_fallback = line 
             # Make a copy for modification within the loop for this line's processing
             current_line_text_for_processing = line 
 
-            matched_degree_in_line = None
-            # Sort degrees_list by length (descending) ensures longest match first
-            # This is already done in __init__
-            for known_degree in self.degrees_list: 
-                # Stricter Regex: Ensure the known_degree is a more standalone match.
-                # It should be at the start of the line, or be the whole line,
-                # or be clearly demarcated.
-                # Option 1: Starts with degree (case insensitive)
-                if current_line_text_for_processing.lower().startswith(known_degree.lower()):
-                    # Ensure it's not just a partial match of a longer word, unless it's the whole line
-                    if len(current_line_text_for_processing) == len(known_degree) or \
-                       (len(current_line_text_for_processing) > len(known_degree) and \
-                        not current_line_text_for_processing[len(known_degree)].isalnum()): # Next char is not alphanumeric
-                        matched_degree_in_line = known_degree 
-                        # Remove the matched degree from the line text we are processing for other info
-                        current_line_text_for_processing = current_line_text_for_processing[len(known_degree):].strip(" ,-:;()")
-                        if self.debug: print(f"DEBUG (_extract_education): Matched degree (startswith): '{matched_degree_in_line}'. Remaining line: '{current_line_text_for_processing}'")
-                        break 
-                # Option 2: Whole line is the degree (case insensitive)
-                elif current_line_text_for_processing.lower() == known_degree.lower():
-                    matched_degree_in_line = known_degree
-                    current_line_text_for_processing = "" # Whole line consumed
-                    if self.debug: print(f"DEBUG (_extract_education): Matched degree (whole line): '{matched_degree_in_line}'.")
-                    break
+            # Longest degree at the start of the line (the raw line only differs from the
+            # classified one when it has surrounding whitespace)
+            if line == stripped_lines[line_idx]:
+                matched_degree_in_line = line_degrees[line_idx]
+            else:
+                matched_degree_in_line = self._match_degree_at_start(line)
+            if matched_degree_in_line:
+                # Remove the matched degree from the line text we are processing for other info
+                current_line_text_for_processing = current_line_text_for_processing[len(matched_degree_in_line):].strip(" ,-:;()")
+                if self.trace.debug_enabled: self.trace.debug("education", "Matched degree (startswith): '%s'. Remaining line: '%s'", matched_degree_in_line, current_line_text_for_processing)
             
             if matched_degree_in_line:
-                if self.debug: print(f"DEBUG (_extract_education): FINAL Matched Degree for this line: '{matched_degree_in_line}'")
+                if self.trace.debug_enabled: self.trace.debug("education", "FINAL Matched Degree for this line: '%s'", matched_degree_in_line)
                 
                 # If a degree is already in current_entry_data, and this new one is different,
                 # it signifies a new education entry.
                 if current_entry_data.get("degree") and current_entry_data.get("degree") != matched_degree_in_line:
-                    if self.debug: print(f"DEBUG (_extract_education): New distinct degree '{matched_degree_in_line}' found. Current entry has '{current_entry_data.get('degree')}'. Finalizing previous entry: {current_entry_data}")
+                    if self.trace.debug_enabled: self.trace.debug("education", "New distinct degree '%s' found. Current entry has '%s'. Finalizing previous entry: %s", matched_degree_in_line, current_entry_data.get('degree'), current_entry_data)
                     finalize_current_education_entry()
                 
                 # Set or update the degree in the current entry
@@ -469,7 +815,7 @@ class EnhancedParser:
                 cgpa_match = self.cgpa_pattern_education.search(current_line_text_for_processing)
                 if cgpa_match:
                     current_entry_data["cgpa"] = cgpa_match.group(1).strip()
-                    if self.debug: print(f"DEBUG (_extract_education): Found CGPA: '{current_entry_data['cgpa']}' in line fragment: '{current_line_text_for_processing}'")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Found CGPA: '%s' in line fragment: '%s'", current_entry_data['cgpa'], current_line_text_for_processing)
                     # Remove CGPA from the line text
                     current_line_text_for_processing = self.cgpa_pattern_education.sub('', current_line_text_for_processing, 1).strip(" ,-:;()")
 
@@ -477,7 +823,7 @@ class EnhancedParser:
                 date_match_obj = self.date_pattern_education.search(current_line_text_for_processing)
                 if date_match_obj:
                     current_entry_data["date"] = date_match_obj.group(0).strip()
-                    if self.debug: print(f"DEBUG (_extract_education): Found Date: '{current_entry_data['date']}' in line fragment: '{current_line_text_for_processing}'")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Found Date: '%s' in line fragment: '%s'", current_entry_data['date'], current_line_text_for_processing)
                     # Remove Date from the line text
                     current_line_text_for_processing = self.date_pattern_education.sub('', current_line_text_for_processing, 1).strip(" ,-:;()")
             
@@ -490,8 +836,7 @@ class EnhancedParser:
             potential_next_lines_for_institution = []
             processed_lines_in_accumulation = 0 # Keep track of how many lines we consume here
             while temp_line_idx < len(lines):
-                next_line_raw = lines[temp_line_idx]
-                next_line_stripped = next_line_raw.strip()
+                next_line_stripped = stripped_lines[temp_line_idx]
 
                 if not next_line_stripped: # Skip empty lines
                     temp_line_idx +=1
@@ -499,40 +844,27 @@ class EnhancedParser:
                     continue
 
                 # Check if next_line starts a new degree, or is a date/cgpa line itself
-                is_next_line_a_new_degree_item = False
-                for kd in self.degrees_list:
-                    if next_line_stripped.lower().startswith(kd.lower()):
-                        if len(next_line_stripped) == len(kd) or \
-                           (len(next_line_stripped) > len(kd) and not next_line_stripped[len(kd)].isalnum()):
-                            is_next_line_a_new_degree_item = True
-                            break
-                    elif next_line_stripped.lower() == kd.lower():
-                        is_next_line_a_new_degree_item = True
-                        break
-                
-                is_next_line_standalone_date = self.date_pattern_education.fullmatch(next_line_stripped)
-                # Check if the line *starts with* CGPA: xxx, not necessarily fullmatch
-                cgpa_prefix_match = self.cgpa_pattern_education.match(next_line_stripped)
-                is_next_line_standalone_cgpa = cgpa_prefix_match and len(cgpa_prefix_match.group(0)) > 5 # Ensure it's a substantial CGPA string
+                is_next_line_a_new_degree_item = line_degrees[temp_line_idx] is not None
+                is_next_line_standalone_date = line_standalone_dates[temp_line_idx]
+                is_next_line_standalone_cgpa = line_standalone_cgpas[temp_line_idx]
 
                 if is_next_line_a_new_degree_item or is_next_line_standalone_date or is_next_line_standalone_cgpa:
-                    if self.debug: print(f"DEBUG (_extract_education): Next line '{next_line_stripped}' looks like a new entry start (Degree:{is_next_line_a_new_degree_item}, Date:{is_next_line_standalone_date}, CGPA:{is_next_line_standalone_cgpa}). Stopping institution accumulation.")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Next line '%s' looks like a new entry start (Degree:%s, Date:%s, CGPA:%s). Stopping institution accumulation.", next_line_stripped, is_next_line_a_new_degree_item, is_next_line_standalone_date, is_next_line_standalone_cgpa)
                     break
                 
-                doc_next_line = nlp(next_line_stripped)
                 contains_marker = any(marker.lower() in next_line_stripped.lower() for marker in self.institution_markers_lower)
-                is_org_entity = any(ent.label_ == "ORG" for ent in doc_next_line.ents)
+                is_org_entity = self._entities(next_line_stripped).has_label("ORG")
                 is_potential_continuation = (next_line_stripped and next_line_stripped[0].isupper()) or \
                                             self.acronym_pattern.search(next_line_stripped) or \
                                             (len(next_line_stripped.split()) <= 4 and not next_line_stripped.lower().startswith(("managed", "developed", "assisted", "responsible")))
 
                 if contains_marker or is_org_entity or is_potential_continuation:
-                    if self.debug: print(f"DEBUG (_extract_education): Adding next line '{next_line_stripped}' to potential institution text. (Marker:{contains_marker}, ORG:{is_org_entity}, PotentialCont:{is_potential_continuation})")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Adding next line '%s' to potential institution text. (Marker:%s, ORG:%s, PotentialCont:%s)", next_line_stripped, contains_marker, is_org_entity, is_potential_continuation)
                     potential_next_lines_for_institution.append(next_line_stripped)
                     temp_line_idx += 1
                     processed_lines_in_accumulation += 1
                 else: 
-                    if self.debug: print(f"DEBUG (_extract_education): Next line '{next_line_stripped}' does not seem like institution continuation. Stopping. (Marker:{contains_marker}, ORG:{is_org_entity}, PotentialCont:{is_potential_continuation})")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Next line '%s' does not seem like institution continuation. Stopping. (Marker:%s, ORG:%s, PotentialCont:%s)", next_line_stripped, contains_marker, is_org_entity, is_potential_continuation)
                     break 
                 
             # Now, assemble the full institution candidate from the current line's remainder and accumulated lines
@@ -542,8 +874,8 @@ class EnhancedParser:
             full_institution_candidate_parts.extend(potential_next_lines_for_institution)
             
             current_institution_candidate = " ".join(full_institution_candidate_parts).strip()
-            if self.debug and current_institution_candidate:
-                print(f"DEBUG (_extract_education): Assembled current_institution_candidate: '{current_institution_candidate}'")
+            if self.trace.debug_enabled and current_institution_candidate:
+                self.trace.debug("education", "Assembled current_institution_candidate: '%s'", current_institution_candidate)
 
             # --- This is the NER and refinement block for institution ---
             if current_institution_candidate: # Only proceed if we have a candidate
@@ -557,18 +889,17 @@ class EnhancedParser:
                     final_acronym_part = acronym_overall_match.group(0) # e.g. "(UiTM)"
                     # Remove the acronym part from the candidate before sending to NER
                     candidate_for_ner = candidate_for_ner.replace(final_acronym_part, "").strip()
-                    if self.debug: print(f"DEBUG (_extract_education): Acronym '{final_acronym_part}' found. Candidate for NER after strip: '{candidate_for_ner}'")
-                elif self.debug:
-                    print(f"DEBUG (_extract_education): No acronym part found by pattern '{self.acronym_pattern.pattern}' in current_institution_candidate: '{current_institution_candidate}'")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Acronym '%s' found. Candidate for NER after strip: '%s'", final_acronym_part, candidate_for_ner)
+                elif self.trace.debug_enabled:
+                    self.trace.debug("education", "No acronym part found by pattern '%s' in current_institution_candidate: '%s'", self.acronym_pattern.pattern, current_institution_candidate)
 
                 # Initialize final_institution_name for this pass
                 final_institution_name = ""
 
                 if candidate_for_ner: 
-                    doc_institution = nlp(candidate_for_ner) 
-                    found_org_entities = [ent.text.strip() for ent in doc_institution.ents if ent.label_ == "ORG"]
-                    if self.debug and ("teknologi mara" in candidate_for_ner.lower() or "kebangsaan malaysia" in candidate_for_ner.lower() or "malaya" in candidate_for_ner.lower()): 
-                        print(f"DEBUG_INST_NER: Candidate for NER: '{candidate_for_ner}', Found ORG by spaCy: {found_org_entities}, Acronym part: {final_acronym_part}")
+                    found_org_entities = self._entities(candidate_for_ner).texts("ORG")
+                    if self.trace.debug_enabled and ("teknologi mara" in candidate_for_ner.lower() or "kebangsaan malaysia" in candidate_for_ner.lower() or "malaya" in candidate_for_ner.lower()): 
+                        self.trace.debug("education", "INST_NER: Candidate for NER: '%s', Found ORG by spaCy: %s, Acronym part: %s", candidate_for_ner, found_org_entities, final_acronym_part)
 
                     ner_extracted_institution_parts = []
                     if found_org_entities:
@@ -592,7 +923,7 @@ class EnhancedParser:
                             base_ner_name.lower() in ["universiti", "university", "college", "institute", "school"] and
                             len(candidate_for_ner.split()) > 1
                         ):
-                            if self.debug: print(f"DEBUG_INST_NER: UiTM/UKM-like or generic case. NER='{base_ner_name}', Candidate='{candidate_for_ner}'. Preferring candidate.")
+                            if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: UiTM/UKM-like or generic case. NER='%s', Candidate='%s'. Preferring candidate.", base_ner_name, candidate_for_ner)
                             ner_extracted_institution_parts.append(candidate_for_ner)
                         
                         # Scenario 2: NER is good, and the original candidate_for_ner is not significantly richer
@@ -600,17 +931,17 @@ class EnhancedParser:
                         # spaCy on "Universiti Malaya" gives ['Universiti Malaya']
                         # This is a good NER result.
                         elif base_ner_name and not (base_ner_name.lower() in ["university", "college", "institute", "school"] and len(candidate_for_ner.split()) > len(base_ner_name.split())):
-                             if self.debug: print(f"DEBUG_INST_NER: Good NER or candidate not much richer. NER='{base_ner_name}', Candidate='{candidate_for_ner}'. Preferring NER.")
+                             if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: Good NER or candidate not much richer. NER='%s', Candidate='%s'. Preferring NER.", base_ner_name, candidate_for_ner)
                              ner_extracted_institution_parts.append(base_ner_name)
                         
                         # Scenario 3: NER is bad/generic, but candidate_for_ner is richer and has markers
                         elif any(marker.lower() in candidate_for_ner.lower() for marker in self.institution_markers_lower) and len(candidate_for_ner.split()) > len(base_ner_name.split()):
-                            if self.debug: print(f"DEBUG_INST_NER: NER bad/generic, candidate richer with markers. NER='{base_ner_name}', Candidate='{candidate_for_ner}'. Preferring candidate.")
+                            if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: NER bad/generic, candidate richer with markers. NER='%s', Candidate='%s'. Preferring candidate.", base_ner_name, candidate_for_ner)
                             ner_extracted_institution_parts.append(candidate_for_ner)
                         
                         # Scenario 4: Fallback to NER if it exists, even if not ideal
                         elif base_ner_name:
-                            if self.debug: print(f"DEBUG_INST_NER: Fallback to NER. NER='{base_ner_name}', Candidate='{candidate_for_ner}'.")
+                            if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: Fallback to NER. NER='%s', Candidate='%s'.", base_ner_name, candidate_for_ner)
                             ner_extracted_institution_parts.append(base_ner_name)
                         
                         # Scenario 5: If NER found nothing useful, but candidate_for_ner exists and seems plausible (already handled below)
@@ -629,10 +960,10 @@ class EnhancedParser:
                                                     (len(word_list) <= 2 and word_list[0][0].isupper()) 
 
                         if (has_marker or is_capitalized_enough) and not_same_as_degree:
-                            if self.debug: print(f"DEBUG (_extract_education): No ORG from NER on '{candidate_for_ner}'. Using this as institution (marker: {has_marker}, capitalized: {is_capitalized_enough})")
+                            if self.trace.debug_enabled: self.trace.debug("education", "No ORG from NER on '%s'. Using this as institution (marker: %s, capitalized: %s)", candidate_for_ner, has_marker, is_capitalized_enough)
                             ner_extracted_institution_parts.append(candidate_for_ner) 
-                        elif self.debug:
-                            print(f"DEBUG (_extract_education): No ORG from NER. Non-NER '{candidate_for_ner}' not used (marker:{has_marker}, cap:{is_capitalized_enough}, sameAsDegree:{not not_same_as_degree}).")
+                        elif self.trace.debug_enabled:
+                            self.trace.debug("education", "No ORG from NER. Non-NER '%s' not used (marker:%s, cap:%s, sameAsDegree:%s).", candidate_for_ner, has_marker, is_capitalized_enough, not not_same_as_degree)
                     
                     if ner_extracted_institution_parts: 
                          final_institution_name = " ".join(ner_extracted_institution_parts).strip()
@@ -643,15 +974,15 @@ class EnhancedParser:
                     # Check if acronym core or full acronym (like "(UiTM)") is already in the built name
                     if not (re.search(r'\b' + re.escape(acronym_core) + r'\b', final_institution_name, re.IGNORECASE) or \
                             final_acronym_part.lower() in final_institution_name.lower()):
-                        if self.debug: print(f"DEBUG_INST_NER: Appending acronym '{final_acronym_part}' to '{final_institution_name}'")
+                        if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: Appending acronym '%s' to '%s'", final_acronym_part, final_institution_name)
                         final_institution_name += " " + final_acronym_part
-                    elif self.debug:
-                        print(f"DEBUG_INST_NER: Acronym part '{final_acronym_part}' or core '{acronym_core}' already present/implied in '{final_institution_name}'. Not re-adding.")
+                    elif self.trace.debug_enabled:
+                        self.trace.debug("education", "INST_NER: Acronym part '%s' or core '%s' already present/implied in '%s'. Not re-adding.", final_acronym_part, acronym_core, final_institution_name)
                 elif not final_institution_name and final_acronym_part: # Only acronym was found in original full candidate
                      final_institution_name = final_acronym_part
                 elif not final_institution_name and candidate_for_ner : # No NER, no acronym, but had a candidate_for_ner
                      #This case should be rare if previous fallbacks worked
-                    if self.debug: print(f"DEBUG_INST_NER: No NER, no acronym, using raw candidate_for_ner '{candidate_for_ner}' as last resort for final_institution_name.")
+                    if self.trace.debug_enabled: self.trace.debug("education", "INST_NER: No NER, no acronym, using raw candidate_for_ner '%s' as last resort for final_institution_name.", candidate_for_ner)
                     final_institution_name = candidate_for_ner
 
 
@@ -668,9 +999,9 @@ class EnhancedParser:
                     
                     if final_institution_name and (not current_entry_data.get("degree") or final_institution_name.lower() != current_entry_data.get("degree", "").lower()):
                         current_entry_data["institution"] = final_institution_name
-                        if self.debug: print(f"DEBUG (_extract_education): Set institution to: '{final_institution_name}'")
-                    elif self.debug:
-                        print(f"DEBUG (_extract_education): Final institution candidate '{final_institution_name}' was same as degree or empty, not setting.")
+                        if self.trace.debug_enabled: self.trace.debug("education", "Set institution to: '%s'", final_institution_name)
+                    elif self.trace.debug_enabled:
+                        self.trace.debug("education", "Final institution candidate '%s' was same as degree or empty, not setting.", final_institution_name)
                 
                 # If NER block didn't yield an institution, but the original_line_for_institution_fallback
                 # (the very first line of this education item) has content and isn't the degree/cgpa/date, consider it.
@@ -683,7 +1014,7 @@ class EnhancedParser:
                     fallback_text_candidate = original_line_for_institution_fallback.strip(" ,-:;()")
                     if fallback_text_candidate and len(fallback_text_candidate.split()) < 7 and len(fallback_text_candidate) > 3 : # Avoid very short/long fallbacks
                         current_entry_data["institution"] = fallback_text_candidate
-                        if self.debug: print(f"DEBUG (_extract_education): Fallback: used original line part as institution: '{fallback_text_candidate}'")
+                        if self.trace.debug_enabled: self.trace.debug("education", "Fallback: used original line part as institution: '%s'", fallback_text_candidate)
 
 
             # Advance main line_idx by 1 (for the current line) + lines consumed by institution accumulation
@@ -694,25 +1025,15 @@ class EnhancedParser:
             if current_entry_data.get("degree") or current_entry_data.get("institution"):
                 if line_idx >= len(lines): # Reached end of all lines
                     should_finalize_now = True
-                    if self.debug: print(f"DEBUG (_extract_education): Reached end of all lines. Triggering finalize.")
+                    if self.trace.debug_enabled: self.trace.debug("education", "Reached end of all lines. Triggering finalize.")
                 else: # Check if the *new* current line_idx signals a new entry
-                    next_line_check_raw = lines[line_idx]
-                    next_line_check_stripped = next_line_check_raw.strip()
+                    next_line_check_stripped = stripped_lines[line_idx]
                     if next_line_check_stripped : # Only check if not empty
-                        is_next_line_a_new_degree_item_for_finalize_check = False
-                        for kd_finalize in self.degrees_list:
-                            if next_line_check_stripped.lower().startswith(kd_finalize.lower()):
-                                if len(next_line_check_stripped) == len(kd_finalize) or \
-                                   (len(next_line_check_stripped) > len(kd_finalize) and not next_line_check_stripped[len(kd_finalize)].isalnum()):
-                                    is_next_line_a_new_degree_item_for_finalize_check = True
-                                    break
-                            elif next_line_check_stripped.lower() == kd_finalize.lower():
-                                is_next_line_a_new_degree_item_for_finalize_check = True
-                                break
+                        is_next_line_a_new_degree_item_for_finalize_check = line_degrees[line_idx] is not None
                         if is_next_line_a_new_degree_item_for_finalize_check and \
                            (not current_entry_data.get("degree") or next_line_check_stripped.lower() != current_entry_data.get("degree").lower()):
                             should_finalize_now = True
-                            if self.debug: print(f"DEBUG (_extract_education): Next line '{next_line_check_stripped}' is a new degree. Triggering finalize.")
+                            if self.trace.debug_enabled: self.trace.debug("education", "Next line '%s' is a new degree. Triggering finalize.", next_line_check_stripped)
             
             if should_finalize_now:
                 finalize_current_education_entry()
@@ -720,10 +1041,10 @@ class EnhancedParser:
 
         # Finalize any last pending entry after loop (if not already caught by above)
         if current_entry_data.get("degree") or current_entry_data.get("institution"):
-            if self.debug: print(f"DEBUG (_extract_education): Finalizing any last pending entry after loop: {current_entry_data}")
+            if self.trace.debug_enabled: self.trace.debug("education", "Finalizing any last pending entry after loop: %s", current_entry_data)
             finalize_current_education_entry()
 
-        if self.debug: print(f"DEBUG (_extract_education): Final education entries list: {education_entries}")
+        if self.trace.debug_enabled: self.trace.debug("education", "Final education entries list: %s", education_entries)
         return education_entries
 
     def _is_line_a_potential_header_or_new_title(self, line_text: str, current_title: str = None) -> bool:
@@ -733,24 +1054,54 @@ class EnhancedParser:
 
         # Check against general section headers (excluding experience itself)
         normalized_line = ''.join(stripped_line.lower().split())
-        for section_key, header_phrases in self.section_headers.items():
+        for section_key in self.taxonomy.header_sections_by_normalized_phrase.get(normalized_line, ()):
             if section_key == 'experience': continue # Don't stop for sub-headers within experience if any
-            for phrase in header_phrases:
-                if normalized_line == ''.join(phrase.lower().split()):
-                    if self.debug: print(f"DEBUG (_is_line_a_potential_header_or_new_title): Line '{stripped_line}' matches a general section header for '{section_key}'")
-                    return True
+            if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' matches a general section header for '%s'", stripped_line, section_key)
+            return True
         
         # Check against job titles (if it's different from the current one being processed)
         # This is a simplified check; relies on job_titles_list being comprehensive.
         # More robust would be to use the same title matching logic as in the main loop of _extract_experience.
-        for known_title in self.job_titles_list:
-            if isinstance(known_title, str) and stripped_line.lower() == known_title.lower():
-                if current_title and current_title.lower() == stripped_line.lower():
-                    continue # It's the same title, not a *new* one signaling end of previous entry
-                if self.debug: print(f"DEBUG (_is_line_a_potential_header_or_new_title): Line '{stripped_line}' matches a known job title '{known_title}' (and is different from current)." )
-                return True
+        known_title = self.taxonomy.job_titles_by_lower.get(stripped_line.lower())
+        if known_title:
+            if current_title and current_title.lower() == stripped_line.lower():
+                return False # It's the same title, not a *new* one signaling end of previous entry
+            if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' matches a known job title '%s' (and is different from current).", stripped_line, known_title)
+            return True
         return False
 
+    def _match_degree_at_start(self, line: str) -> Optional[str]:
+        """
+        Longest known degree the line starts with (case-insensitive), as long as it is
+        the whole line or the next character is not alphanumeric; else None.
+        """
+        for length, known_degree in self.taxonomy.degree_index.prefixes(fold_case(line)):
+            if length == len(line) or not line[length].isalnum():
+                return known_degree
+        return None
+
+    def _match_job_title_at_start(self, line: str) -> Optional[str]:
+        """
+        Longest known job title that starts the line as a whole word and is followed by
+        'at', ',', '(', a dash or the end of the line (case-insensitive), else None.
+        """
+        if not line or not is_word_char(line[0]):
+            return None
+        for length, known_title in self.job_title_index.prefixes(fold_case(line)):
+            # Word boundary right after the title
+            if length < len(line) and is_word_char(line[length]) == is_word_char(line[length - 1]):
+                continue
+            if length == len(line) and not is_word_char(line[length - 1]):
+                continue
+            remainder = line[length:].lstrip()
+            if not remainder or remainder[:2].lower() == 'at' or remainder[0] in ',(–-':
+                return known_title
+        return None
+
+    def _could_be_company_location_line(self, line_text: str) -> bool:
+        # Simple check for bullet points or action verbs - common in responsibilities
+        return not (re.match(r'^\s*[-*•➢❖]', line_text) or line_text.lower().startswith(RESPONSIBILITY_VERB_PREFIXES))
+
     def _is_likely_standalone_company_location_line(self, line_text: str) -> bool:
         """
         Checks if a line is likely a company/location line rather than a responsibility.
@@ -759,18 +1110,17 @@ class EnhancedParser:
         if not line_text or len(line_text.split()) > 7: # Too long for typical Co/Loc line
             return False
 
-        # Simple check for bullet points or action verbs - common in responsibilities
-        if re.match(r'^\s*[-*•➢❖]', line_text) or any(line_text.lower().startswith(verb) for verb in ["assisted", "developed", "managed", "led", "responsible", "created", "implemented", "designed", "collaborated", "participated", "gained", "coordinated"]):
+        if not self._could_be_company_location_line(line_text):
             return False
 
-        doc = nlp(line_text)
-        has_org = any(ent.label_ == "ORG" for ent in doc.ents)
-        has_gpe = any(ent.label_ == "GPE" for ent in doc.ents)
-        has_loc = any(ent.label_ == "LOC" for ent in doc.ents) # More general location
+        line_entities = self._entities(line_text)
+        has_org = line_entities.has_label("ORG")
+        has_gpe = line_entities.has_label("GPE")
+        has_loc = line_entities.has_label("LOC") # More general location
 
         if has_org or has_gpe or has_loc:
             # If it has ORG/GPE/LOC, and not too many verbs, it's likely Co/Loc
-            num_verbs = sum(1 for token in doc if token.pos_ == "VERB")
+            num_verbs = line_entities.num_verbs
             if num_verbs <= 1: # Allow one verb (e.g. "based in X") but not more
                 return True
         
@@ -787,11 +1137,11 @@ class EnhancedParser:
         return False
 
     def _extract_experience(self, experience_text: str, primary_field: str) -> List[Dict[str, Any]]:
-        if self.debug:
-            print(f"DEBUG (_extract_experience): Received experience_text (len: {len(experience_text)} chars)")
+        if self.trace.debug_enabled:
+            self.trace.debug("experience", "Received experience_text (len: %s chars)", len(experience_text))
                 
         if not experience_text or not experience_text.strip():
-            if self.debug: print("DEBUG (_extract_experience): Experience text is empty or not provided.")
+            if self.trace.debug_enabled: self.trace.debug("experience", "Experience text is empty or not provided.")
             return []
         
         # Ensure self.job_titles_list does not contain None
@@ -808,16 +1158,13 @@ class EnhancedParser:
             "date": None, "responsibilities": []
         }
 
-        date_pattern_full = re.compile(
-            r'((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?)\s*(19|20\d{2})\s*(?:-|–|to|until)\s*(?:((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?)\s*(19|20\d{2})|Present|Current|Now)',
-            re.IGNORECASE
-        )
-        year_date_pattern = re.compile(r'\b(19|20)\d{2}\s*(?:(?:-|–|to|until)\s*(19|20)\d{2})?|\b(Present|Current|Now)\b', re.IGNORECASE)
+        date_pattern_full = self.taxonomy.date_pattern_experience
+        year_date_pattern = self.taxonomy.year_date_pattern_experience
 
         def finalize_current_entry():
             # === DEBUG PRINT ===
-            if self.debug and current_entry_data.get("title") == "Medical Intern":
-                print(f"DEBUG_MEDICAL_INTERN (finalize_current_entry called): current_entry_data = {current_entry_data}")
+            if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                self.trace.debug("experience", "MEDICAL_INTERN (finalize_current_entry called): current_entry_data = %s", current_entry_data)
             # === END DEBUG PRINT ===
 
             title_present = current_entry_data.get("title") and current_entry_data["title"] != "N/A"
@@ -842,16 +1189,16 @@ class EnhancedParser:
                         current_entry_data[key_to_check] = "N/A"
                 
                 experience_entries.append(current_entry_data.copy())
-                if self.debug: print(f"DEBUG (_extract_experience): Finalized and added entry: {current_entry_data}")
+                if self.trace.debug_enabled: self.trace.debug("experience", "Finalized and added entry: %s", current_entry_data)
                 # === DEBUG PRINT ===
-                if self.debug and current_entry_data.get("title") == "Medical Intern":
-                    print(f"DEBUG_MEDICAL_INTERN (finalize_current_entry success): Entry ADDED to experience_entries.")
+                if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                    self.trace.debug("experience", "MEDICAL_INTERN (finalize_current_entry success): Entry ADDED to experience_entries.")
                 # === END DEBUG PRINT ===
-            elif self.debug and any(val for val in current_entry_data.values() if (isinstance(val, list) and val) or (not isinstance(val, list) and val is not None and val != "N/A")):
-                 print(f"DEBUG (_extract_experience): Discarding incomplete entry parts: {current_entry_data}")
+            elif self.trace.debug_enabled and any(val for val in current_entry_data.values() if (isinstance(val, list) and val) or (not isinstance(val, list) and val is not None and val != "N/A")):
+                 self.trace.debug("experience", "Discarding incomplete entry parts: %s", current_entry_data)
                  # === DEBUG PRINT ===
-                 if self.debug and current_entry_data.get("title") == "Medical Intern":
-                    print(f"DEBUG_MEDICAL_INTERN (finalize_current_entry): Entry DISCARDED.")
+                 if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                    self.trace.debug("experience", "MEDICAL_INTERN (finalize_current_entry): Entry DISCARDED.")
                  # === END DEBUG PRINT ===
             
             current_entry_data.clear()
@@ -861,9 +1208,9 @@ class EnhancedParser:
             })
 
         all_lines_from_experience_section = experience_text.strip().split('\n')
-        if self.debug and not all_lines_from_experience_section:
-            print("DEBUG (_extract_experience): all_lines_from_experience_section is EMPTY!")
-        elif self.debug:
+        if self.trace.debug_enabled and not all_lines_from_experience_section:
+            self.trace.debug("experience", "all_lines_from_experience_section is EMPTY!")
+        elif self.trace.debug_enabled:
             # print(f"DEBUG (_extract_experience): all_lines_from_experience_section has {len(all_lines_from_experience_section)} lines.")
             pass # Keep debug minimal
 
@@ -876,7 +1223,7 @@ class EnhancedParser:
             line = all_lines_from_experience_section[line_cursor].strip()
             line_cursor += 1
 
-            if self.debug: 
+            if self.trace.debug_enabled: 
                 # print(f"DEBUG (_extract_experience): Processing line (type: {type(line)}): '{line}'")
                 pass # Keep debug minimal
 
@@ -887,7 +1234,7 @@ class EnhancedParser:
             should_finalize_due_to_header = False
             if current_entry_data.get("title"): # Only finalize if we have a current title we are working on
                 if self._is_line_a_potential_header_or_new_title(line, current_entry_data.get("title")):
-                    if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' (idx {current_line_index}) signals end of current entry (due to new header/title). Finalizing.")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' (idx %s) signals end of current entry (due to new header/title). Finalizing.", line, current_line_index)
                     finalize_current_entry()
                     processed_lines_for_current_title_company_date.clear()
                     should_finalize_due_to_header = True # Mark that finalization happened
@@ -897,26 +1244,19 @@ class EnhancedParser:
             original_line_for_responsibility_check = line 
 
             # 1. Attempt to find a new Job Title
-            potential_new_title_on_this_line = None
-            sorted_job_titles = sorted([jt for jt in self.job_titles_list if jt], key=len, reverse=True)
-            for known_title in sorted_job_titles: 
-                if isinstance(known_title, str) and isinstance(line, str):
-                    title_pattern = r'(?i)\b' + re.escape(known_title) + r'\b\s*(?:at|,|\(|–|-|$)'
-                    match = re.match(title_pattern, line)
-                    if match:
-                        potential_new_title_on_this_line = known_title 
-                        # === DEBUG PRINT ===
-                        if self.debug and potential_new_title_on_this_line == "Medical Intern":
-                            print(f"DEBUG_MEDICAL_INTERN (Title Identified): Matched '{potential_new_title_on_this_line}' on line '{line}'")
-                        # === END DEBUG PRINT ===
-                        break # Found the longest matching title
+            # Longest known title at the start of the line (single trie walk)
+            potential_new_title_on_this_line = self._match_job_title_at_start(line)
+            # === DEBUG PRINT ===
+            if self.trace.debug_enabled and potential_new_title_on_this_line == "Medical Intern":
+                self.trace.debug("experience", "MEDICAL_INTERN (Title Identified): Matched '%s' on line '%s'", potential_new_title_on_this_line, line)
+            # === END DEBUG PRINT ===
             if potential_new_title_on_this_line:
-                if self.debug:
-                    print(f"DEBUG (_extract_experience): Potential new title found: '{potential_new_title_on_this_line}' on line '{line}'")
+                if self.trace.debug_enabled:
+                    self.trace.debug("experience", "Potential new title found: '%s' on line '%s'", potential_new_title_on_this_line, line)
                 if current_entry_data.get("title") and \
                    isinstance(current_entry_data.get("title"), str) and \
                    current_entry_data.get("title").lower() != potential_new_title_on_this_line.lower():
-                    if self.debug: print(f"DEBUG (_extract_experience): Different title found. Finalizing previous entry for '{current_entry_data.get('title')}'")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Different title found. Finalizing previous entry for '%s'", current_entry_data.get('title'))
                     finalize_current_entry()
                     processed_lines_for_current_title_company_date.clear()
                 if not current_entry_data.get("title") or \
@@ -924,10 +1264,10 @@ class EnhancedParser:
                     current_entry_data["title"] = potential_new_title_on_this_line
                     processed_lines_for_current_title_company_date.add(current_line_index)
                     # === DEBUG PRINT ===
-                    if self.debug and current_entry_data.get("title") == "Medical Intern":
-                        print(f"DEBUG_MEDICAL_INTERN (Title Set): Title set to '{current_entry_data['title']}' from line (idx {current_line_index}): '{line}'")
+                    if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                        self.trace.debug("experience", "MEDICAL_INTERN (Title Set): Title set to '%s' from line (idx %s): '%s'", current_entry_data['title'], current_line_index, line)
                     # === END DEBUG PRINT ===
-                    if self.debug: print(f"DEBUG (_extract_experience): Set New Title: '{potential_new_title_on_this_line}' from line (idx {current_line_index}): '{line}'")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Set New Title: '%s' from line (idx %s): '%s'", potential_new_title_on_this_line, current_line_index, line)
                     remaining_line_after_title = line[len(potential_new_title_on_this_line):].strip()
                     if remaining_line_after_title.startswith(('at ', ', ')):
                         company_part = remaining_line_after_title.split(',')[0].replace('at ', '', 1).strip()
@@ -935,10 +1275,10 @@ class EnhancedParser:
                         if company_part_no_date and not current_entry_data.get("company"):
                             current_entry_data["company"] = company_part_no_date
                             # === DEBUG PRINT ===
-                            if self.debug and current_entry_data.get("title") == "Medical Intern":
-                                print(f"DEBUG_MEDICAL_INTERN (Company from title line): Company set to '{current_entry_data['company']}'")
+                            if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                                self.trace.debug("experience", "MEDICAL_INTERN (Company from title line): Company set to '%s'", current_entry_data['company'])
                             # === END DEBUG PRINT ===
-                            if self.debug: print(f"DEBUG (_extract_experience): Company from title line ('at' or ','): '{company_part_no_date}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "Company from title line ('at' or ','): '%s'", company_part_no_date)
                             original_line_for_responsibility_check = remaining_line_after_title.replace(company_part, "", 1).strip()
                     line_consumed_this_iteration = True # Title and possibly company consumed this line.
 
@@ -953,17 +1293,17 @@ class EnhancedParser:
                     current_entry_data["date"] = date_str
                     processed_lines_for_current_title_company_date.add(current_line_index) 
                     # === DEBUG PRINT ===
-                    if self.debug and current_entry_data.get("title") == "Medical Intern":
-                        print(f"DEBUG_MEDICAL_INTERN (Date from title line remnant): Date set to '{date_str}' from remnant '{date_search_text_for_title_line}'")
+                    if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                        self.trace.debug("experience", "MEDICAL_INTERN (Date from title line remnant): Date set to '%s' from remnant '%s'", date_str, date_search_text_for_title_line)
                     # === END DEBUG PRINT ===
-                    if self.debug: print(f"DEBUG (_extract_experience): Found Date: '{date_str}' in title line remnant (idx {current_line_index}): '{date_search_text_for_title_line}'")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Found Date: '%s' in title line remnant (idx %s): '%s'", date_str, current_line_index, date_search_text_for_title_line)
                     original_line_for_responsibility_check = date_search_text_for_title_line.replace(date_str, "").strip()
             
             # Only apply this short-remnant filter if the line was initially consumed by title/date logic on the title line itself
             if line_consumed_this_iteration and \
                (not original_line_for_responsibility_check.strip() or \
                 len(original_line_for_responsibility_check.strip().split()) < 3):
-                if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' (which was a title line) remnant '{original_line_for_responsibility_check}' is too short after title/date. Continuing.")
+                if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' (which was a title line) remnant '%s' is too short after title/date. Continuing.", line, original_line_for_responsibility_check)
                 continue 
 
             # 2. Attempt to find Date (if not already found and line not consumed by title)
@@ -976,10 +1316,10 @@ class EnhancedParser:
                         current_entry_data["date"] = date_str
                         processed_lines_for_current_title_company_date.add(current_line_index)
                         # === DEBUG PRINT ===
-                        if self.debug and current_entry_data.get("title") == "Medical Intern":
-                            print(f"DEBUG_MEDICAL_INTERN (Date from separate line): Date set to '{date_str}' from line '{line}'")
+                        if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+                            self.trace.debug("experience", "MEDICAL_INTERN (Date from separate line): Date set to '%s' from line '%s'", date_str, line)
                         # === END DEBUG PRINT ===
-                        if self.debug: print(f"DEBUG (_extract_experience): Found Date: '{date_str}' consuming line (idx {current_line_index}): '{line}'")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "Found Date: '%s' consuming line (idx %s): '%s'", date_str, current_line_index, line)
                         original_line_for_responsibility_check = line.replace(date_str, "").strip() # Update for responsibility
                         line_consumed_this_iteration = True # Date consumed this line.
             if line_consumed_this_iteration and (not original_line_for_responsibility_check or len(original_line_for_responsibility_check.split()) < 3) :
@@ -993,16 +1333,15 @@ class EnhancedParser:
                 line_for_co_loc_parse = line # Use a copy for this block's parsing attempts
                 
                 if self._is_likely_standalone_company_location_line(line_for_co_loc_parse):
-                    doc = nlp(line_for_co_loc_parse)
                     # Extract all entities first to make them available
-                    all_entities = [(ent.text.strip(), ent.label_) for ent in doc.ents]
+                    all_entities = [(ent.text.strip(), ent.label) for ent in self._entities(line_for_co_loc_parse).ents]
                     org_entities_text = [e[0] for e in all_entities if e[1] == "ORG"]
                     gpe_loc_entities_text = [e[0] for e in all_entities if e[1] in ["GPE", "LOC"]]
                     fac_entities_text = [e[0] for e in all_entities if e[1] == "FAC"]
 
                     # ---- START DEBUG ----
                     if "hospital jasin" in line_for_co_loc_parse.lower() and "melaka" in line_for_co_loc_parse.lower():
-                        if self.debug: print(f"DEBUG_HJ_MELAKA: Line: '{line_for_co_loc_parse}', All doc.ents: {all_entities}")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "HJ_MELAKA: Line: '%s', All doc.ents: %s", line_for_co_loc_parse, all_entities)
                     # ---- END DEBUG ----
 
                     identified_company_ner = None
@@ -1018,7 +1357,7 @@ class EnhancedParser:
                            (org_name.lower() in known_malaysian_locations_lower or len(org_name.split()) <= 2):
                             identified_company_ner = fac_name
                             identified_location_ner = org_name
-                            if self.debug: print(f"DEBUG_HJ_MELAKA: Special FAC+ORG override: Co='{identified_company_ner}', Loc='{identified_location_ner}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "HJ_MELAKA: Special FAC+ORG override: Co='%s', Loc='%s'", identified_company_ner, identified_location_ner)
                     # --- END Special Handling ---
                     
                     # If not handled by special case, then proceed with existing logic structure
@@ -1040,14 +1379,14 @@ class EnhancedParser:
                     if identified_company_ner and identified_location_ner and identified_company_ner.lower() != identified_location_ner.lower():
                         if not current_entry_data.get("company"):
                             current_entry_data["company"] = identified_company_ner
-                            if self.debug: print(f"DEBUG (_extract_experience): NER Company (ORG): '{identified_company_ner}' from line '{line_for_co_loc_parse}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "NER Company (ORG): '%s' from line '%s'", identified_company_ner, line_for_co_loc_parse)
                         if not current_entry_data.get("location"):
                             current_entry_data["location"] = identified_location_ner
-                            if self.debug: print(f"DEBUG (_extract_experience): NER Location (GPE/LOC): '{identified_location_ner}' from line '{line_for_co_loc_parse}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "NER Location (GPE/LOC): '%s' from line '%s'", identified_location_ner, line_for_co_loc_parse)
                         line_consumed_this_iteration = True
                     elif identified_company_ner and not current_entry_data.get("company"): # Only company by NER
                         current_entry_data["company"] = identified_company_ner
-                        if self.debug: print(f"DEBUG (_extract_experience): NER Company (ORG only): '{identified_company_ner}' from line '{line_for_co_loc_parse}'")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "NER Company (ORG only): '%s' from line '%s'", identified_company_ner, line_for_co_loc_parse)
                         # Try to infer location if company line has a comma and a plausible location part
                         if ',' in line_for_co_loc_parse and identified_company_ner in line_for_co_loc_parse.split(',')[0]:
                             potential_loc_part = line_for_co_loc_parse.split(',', 1)[1].strip()
@@ -1055,51 +1394,52 @@ class EnhancedParser:
                                 # Basic check: is it short and looks like a place?
                                 if len(potential_loc_part.split()) <= 3 and not any(kw.lower() in potential_loc_part.lower() for kw in self.company_name_keywords):
                                     current_entry_data["location"] = potential_loc_part
-                                    if self.debug: print(f"DEBUG (_extract_experience): Inferred Location (post-ORG): '{potential_loc_part}' from '{line_for_co_loc_parse}'")
+                                    if self.trace.debug_enabled: self.trace.debug("experience", "Inferred Location (post-ORG): '%s' from '%s'", potential_loc_part, line_for_co_loc_parse)
                         line_consumed_this_iteration = True
                     elif identified_location_ner and not current_entry_data.get("location"): # Only location by NER
                         current_entry_data["location"] = identified_location_ner
-                        if self.debug: print(f"DEBUG (_extract_experience): NER Location (GPE/LOC only): '{identified_location_ner}' from line '{line_for_co_loc_parse}'")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "NER Location (GPE/LOC only): '%s' from line '%s'", identified_location_ner, line_for_co_loc_parse)
                         # Try to infer company if location line has a comma and a plausible company part
                         if ',' in line_for_co_loc_parse and identified_location_ner in line_for_co_loc_parse.split(',')[1]:
                              potential_co_part = line_for_co_loc_parse.split(',',1)[0].strip()
                              if potential_co_part and not org_entities_text: # No ORG identified by NER
                                 if len(potential_co_part.split()) <= 4 : # Allow slightly longer for company names
                                     current_entry_data["company"] = potential_co_part
-                                    if self.debug: print(f"DEBUG (_extract_experience): Inferred Company (post-GPE/LOC): '{potential_co_part}' from '{line_for_co_loc_parse}'")
+                                    if self.trace.debug_enabled: self.trace.debug("experience", "Inferred Company (post-GPE/LOC): '%s' from '%s'", potential_co_part, line_for_co_loc_parse)
                         line_consumed_this_iteration = True
 
                     # Fallback/Refinement: if NER didn't populate both and line has "A, B" structure
                     if not line_consumed_this_iteration or (not current_entry_data.get("company") or not current_entry_data.get("location")):
-                        if ',' in line_for_co_loc_parse:
-                            parts = [p.strip() for p in line_for_co_loc_parse.split(',', 1)] # Split only on first comma
+                        parts = [p.strip() for p in line_for_co_loc_parse.split(',', 1)] if ',' in line_for_co_loc_parse else [] # Split only on first comma
                         if len(parts) == 2:
                                 part1_is_likely_co = any(ck.lower() in parts[0].lower() for ck in self.company_name_keywords) or len(parts[0].split()) <=3
-                                part1_is_likely_loc = nlp(parts[0]).ents and nlp(parts[0]).ents[0].label_ in ["GPE", "LOC"]
+                                part1_ents = self._entities(parts[0]).ents
+                                part1_is_likely_loc = part1_ents and part1_ents[0].label in ["GPE", "LOC"]
                                 
                                 part2_is_likely_co = any(ck.lower() in parts[1].lower() for ck in self.company_name_keywords) or len(parts[1].split()) <=3
-                                part2_is_likely_loc = nlp(parts[1]).ents and nlp(parts[1]).ents[0].label_ in ["GPE", "LOC"]
+                                part2_ents = self._entities(parts[1]).ents
+                                part2_is_likely_loc = part2_ents and part2_ents[0].label in ["GPE", "LOC"]
 
                                 if not current_entry_data.get("company") and not current_entry_data.get("location"):
                                     # Case 1: Part1 is Co, Part2 is Loc (e.g. "Hospital Jasin, Melaka")
                                     if (identified_company_ner == parts[0] or part1_is_likely_co) and (identified_location_ner == parts[1] or part2_is_likely_loc) and not part1_is_likely_loc and not part2_is_likely_co :
                                         current_entry_data["company"] = parts[0]
                                         current_entry_data["location"] = parts[1]
-                                        if self.debug: print(f"DEBUG (_extract_experience): Heuristic Co/Loc from '{line_for_co_loc_parse}': Co='{parts[0]}', Loc='{parts[1]}'")
+                                        if self.trace.debug_enabled: self.trace.debug("experience", "Heuristic Co/Loc from '%s': Co='%s', Loc='%s'", line_for_co_loc_parse, parts[0], parts[1])
                                         line_consumed_this_iteration = True
                                     # Case 2: Part1 is Loc, Part2 is Co (e.g. "Melaka, Hospital Jasin")
                                     elif (identified_location_ner == parts[0] or part1_is_likely_loc) and (identified_company_ner == parts[1] or part2_is_likely_co) and not part1_is_likely_co and not part2_is_likely_loc:
                                         current_entry_data["location"] = parts[0]
                                         current_entry_data["company"] = parts[1]
-                                        if self.debug: print(f"DEBUG (_extract_experience): Heuristic Co/Loc (reversed) from '{line_for_co_loc_parse}': Co='{parts[1]}', Loc='{parts[0]}'")
+                                        if self.trace.debug_enabled: self.trace.debug("experience", "Heuristic Co/Loc (reversed) from '%s': Co='%s', Loc='%s'", line_for_co_loc_parse, parts[1], parts[0])
                                         line_consumed_this_iteration = True
                                 elif not current_entry_data.get("company") and identified_location_ner == parts[1]: # We have location as part2, part1 must be company
                                     current_entry_data["company"] = parts[0]
-                                    if self.debug: print(f"DEBUG (_extract_experience): Heuristic Co (part1) based on Loc (part2='{parts[1]}'): Co='{parts[0]}'")
+                                    if self.trace.debug_enabled: self.trace.debug("experience", "Heuristic Co (part1) based on Loc (part2='%s'): Co='%s'", parts[1], parts[0])
                                     line_consumed_this_iteration = True
                                 elif not current_entry_data.get("location") and identified_company_ner == parts[0]: # We have company as part1, part2 must be location
                                      current_entry_data["location"] = parts[1]
-                                     if self.debug: print(f"DEBUG (_extract_experience): Heuristic Loc (part2) based on Co (part1='{parts[0]}'): Loc='{parts[1]}'")
+                                     if self.trace.debug_enabled: self.trace.debug("experience", "Heuristic Loc (part2) based on Co (part1='%s'): Loc='%s'", parts[0], parts[1])
                                      line_consumed_this_iteration = True
                     
                     if line_consumed_this_iteration: # If company or location was set by any of the above
@@ -1126,17 +1466,17 @@ class EnhancedParser:
                         original_line_for_responsibility_check = temp_line_check_for_resp.strip(" ,")
 
                         if not original_line_for_responsibility_check or len(original_line_for_responsibility_check.split()) < 2:
-                            if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' (idx {current_line_index}) identified as Co/Loc and remnant ('{original_line_for_responsibility_check}') is insignificant. Clearing for responsibility.")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' (idx %s) identified as Co/Loc and remnant ('%s') is insignificant. Clearing for responsibility.", line, current_line_index, original_line_for_responsibility_check)
                             original_line_for_responsibility_check = "" 
                         else: 
-                            if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' (idx {current_line_index}) had Co/Loc. Remnant for resp: '{original_line_for_responsibility_check}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' (idx %s) had Co/Loc. Remnant for resp: '%s'", line, current_line_index, original_line_for_responsibility_check)
                     
                     if line_consumed_this_iteration and (not original_line_for_responsibility_check or len(original_line_for_responsibility_check.split()) < 3) : 
-                        if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' consumed by Co/Loc or remnant '{original_line_for_responsibility_check}' too short. Continuing.")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' consumed by Co/Loc or remnant '%s' too short. Continuing.", line, original_line_for_responsibility_check)
                         continue 
 
             if should_finalize_due_to_header: # This check should be AFTER all attempts to extract Title/Date/Co/Loc from current line
-                if self.debug: print(f"DEBUG (_extract_experience): Line '{line}' was a header that finalized an entry. Skipping for resp.")
+                if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' was a header that finalized an entry. Skipping for resp.", line)
                 continue
             
             # If line_consumed_this_iteration became true due to Title/Date/Co/Loc,
@@ -1144,7 +1484,7 @@ class EnhancedParser:
             # If it's empty or too short, no point in responsibility parsing for this line.
             if not original_line_for_responsibility_check.strip() or \
                (line_consumed_this_iteration and len(original_line_for_responsibility_check.strip().split()) < 3 and not original_line_for_responsibility_check.strip().lower() == "clear communication") : # Allow "clear communication" even if short
-                if self.debug and line.strip() and original_line_for_responsibility_check.strip() : print(f"DEBUG (_extract_experience): Line remnant '({original_line_for_responsibility_check})' after T/D/C/L processing is too short or line was consumed. Skipping resp for this line: '{line}'")
+                if self.trace.debug_enabled and line.strip() and original_line_for_responsibility_check.strip() : self.trace.debug("experience", "Line remnant '(%s)' after T/D/C/L processing is too short or line was consumed. Skipping resp for this line: '%s'", original_line_for_responsibility_check, line)
                 continue
 
             # 4. Add to responsibilities if line not consumed and is part of a valid entry
@@ -1168,19 +1508,19 @@ class EnhancedParser:
                     temp_is_co_loc_remnant_for_resp_block = True
                 
                 if temp_is_co_loc_remnant_for_resp_block: # Use the locally recalculated flag
-                    if self.debug: print(f"DEBUG (_extract_experience): Skipping responsibility add for likely Co/Loc remnant (re-checked): '{original_line_for_responsibility_check}' from line index {current_line_index}")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Skipping responsibility add for likely Co/Loc remnant (re-checked): '%s' from line index %s", original_line_for_responsibility_check, current_line_index)
                     continue 
                 # --- END: Add check to prevent Co/Loc remnants ---
 
                 # If line was already processed for title and is identical to title, skip.
                 if current_line_index in processed_lines_for_current_title_company_date and \
                    original_line_for_responsibility_check.strip().lower() == str(current_entry_data.get("title", "")).lower():
-                    if self.debug: print(f"DEBUG (_extract_experience): Skipping responsibility add for line (idx {current_line_index}) as it's identical to the title and was processed for metadata.")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Skipping responsibility add for line (idx %s) as it's identical to the title and was processed for metadata.", current_line_index)
                     continue
 
                 # If the line looks like a new section header or a different job title, skip adding as responsibility for current entry.
                 if self._is_line_a_potential_header_or_new_title(original_line_for_responsibility_check, current_entry_data.get("title")):
-                    if self.debug: print(f"DEBUG (_extract_experience): Line '{original_line_for_responsibility_check}' looks like a new header/title. Skipping for current responsibilities.")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' looks like a new header/title. Skipping for current responsibilities.", original_line_for_responsibility_check)
                     continue
 
                 line_to_add_as_responsibility = original_line_for_responsibility_check.strip()
@@ -1205,13 +1545,13 @@ class EnhancedParser:
                         if line_to_add_as_responsibility.lower() == "plans under supervision" and \
                            last_responsibility.endswith("preliminary care"):
                             current_entry_data["responsibilities"][-1] += " " + line_to_add_as_responsibility
-                            if self.debug: print(f"DEBUG (_extract_experience): Appended specific 'plans under supervision'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "Appended specific 'plans under supervision'")
                         elif not starts_like_new_bullet and \
                              not last_responsibility.strip().endswith(('.', '!', '?')) and \
                              (line_to_add_as_responsibility[0].islower() or \
                               len(line_to_add_as_responsibility.split()) <= 3):
                             current_entry_data["responsibilities"][-1] += " " + line_to_add_as_responsibility
-                            if self.debug: print(f"DEBUG (_extract_experience): Appended general continuation: '{line_to_add_as_responsibility}'")
+                            if self.trace.debug_enabled: self.trace.debug("experience", "Appended general continuation: '%s'", line_to_add_as_responsibility)
                         else: 
                             prev_resp_was_dangling_fragment = False
                             if current_entry_data["responsibilities"]:
@@ -1236,122 +1576,106 @@ class EnhancedParser:
                                 # If the previous item was a dangling fragment,
                                 # merge the current new bullet point line with it.
                                 current_entry_data["responsibilities"][-1] = current_line_cleaned_for_dangle_logic + " " + last_resp_cleaned_for_dangle_check
-                                if self.debug: print(f"DEBUG (_extract_experience): Merged new bullet '{current_line_cleaned_for_dangle_logic}' with dangling fragment '{last_resp_cleaned_for_dangle_check}'")
+                                if self.trace.debug_enabled: self.trace.debug("experience", "Merged new bullet '%s' with dangling fragment '%s'", current_line_cleaned_for_dangle_logic, last_resp_cleaned_for_dangle_check)
                             else:
                                 # Otherwise, add the current line as a new responsibility item (original behavior)
                                 current_entry_data["responsibilities"].append(line_to_add_as_responsibility) # Add raw line; bullets are stripped during finalize_current_entry
-                                if self.debug: print(f"DEBUG (_extract_experience): Added new distinct resp: '{line_to_add_as_responsibility}'")
+                                if self.trace.debug_enabled: self.trace.debug("experience", "Added new distinct resp: '%s'", line_to_add_as_responsibility)
                     else: # No existing responsibilities, add as first
                         current_entry_data["responsibilities"].append(line_to_add_as_responsibility)
-                        if self.debug: print(f"DEBUG (_extract_experience): Added first resp: '{line_to_add_as_responsibility}'")
+                        if self.trace.debug_enabled: self.trace.debug("experience", "Added first resp: '%s'", line_to_add_as_responsibility)
                 else:
-                    if self.debug: print(f"DEBUG (_extract_experience): Line '{line_to_add_as_responsibility}' was FILTERED OUT from being a responsibility due to filter conditions (contact/header/date-like).")
+                    if self.trace.debug_enabled: self.trace.debug("experience", "Line '%s' was FILTERED OUT from being a responsibility due to filter conditions (contact/header/date-like).", line_to_add_as_responsibility)
 
         # Finalize any remaining entry after loop
         # === DEBUG PRINT ===
-        if self.debug and current_entry_data.get("title") == "Medical Intern":
-            print(f"DEBUG_MEDICAL_INTERN (End of Loop): Calling finalize_current_entry for potentially last entry.")
+        if self.trace.debug_enabled and current_entry_data.get("title") == "Medical Intern":
+            self.trace.debug("experience", "MEDICAL_INTERN (End of Loop): Calling finalize_current_entry for potentially last entry.")
         # === END DEBUG PRINT ===
         finalize_current_entry()
         processed_lines_for_current_title_company_date.clear() # Clear one last time
         
-        if self.debug: print(f"DEBUG (_extract_experience): Total experience entries found: {len(experience_entries)}")
+        if self.trace.debug_enabled: self.trace.debug("experience", "Total experience entries found: %s", len(experience_entries))
         return experience_entries
 
     # --- START: Refactored _extract_skills and its helper ---
     def _parse_block_for_skills(self, text_block: str, general_set: set, soft_set: set):
         """
         Helper function to parse a block of text and extract skills.
-        It uses self.sorted_skill_references to find known skills.
+        Each line is scanned once with self.skill_automaton; the hits are then
+        accepted in self.sorted_skill_references order (longest skill first, soft
+        skills over general ones), masking consumed spans so a shorter skill never
+        matches inside a longer one.
         """
         lines = [line.strip() for line in text_block.split('\n') if line.strip()]
         for line_content in lines:
-            temp_line_for_matching = line_content 
-            
-            # Enhanced debug for specific skills - checks if any part of the skill name is in the line
-            if self.debug:
+            folded_line = fold_case(line_content)
+
+            if self.trace.debug_enabled:
                 debug_skills_to_trace = ["o&g", "c++", "ui/ux design", "react native", "asp.net", "series 7"]
                 for ds_trace in debug_skills_to_trace:
-                    if ds_trace in temp_line_for_matching.lower():
-                        print(f"DEBUG (_parse_block_for_skills): Processing line for potential special skill ('{ds_trace}'): '{temp_line_for_matching}'")
+                    if ds_trace in folded_line:
+                        self.trace.debug("skills", "Processing line for potential special skill ('%s'): '%s'", ds_trace, line_content)
                         break # Print once per line if any debug skill is found
 
-            for canonical_skill_name, skill_type in self.sorted_skill_references:
-                if not canonical_skill_name: continue 
-
-                # Add word boundaries to the pattern string
-                if canonical_skill_name == "C++":
-                    pattern_str = r'\bC\+\+\b' # Hardcoded pattern for C++
-                elif canonical_skill_name == "C#":
-                    pattern_str = r'\bC#\b'     # Hardcoded pattern for C#
-                else:
-                    pattern_str = r'\b' + re.escape(canonical_skill_name) + r'\b' # Corrected: single backslash for \b
-                
-                original_temp_line_for_current_skill_search = temp_line_for_matching # For debug
-                
-                if self.debug and canonical_skill_name.lower() == "c++": 
-                    print(f"DEBUG_CPP_SKILL: Attempting to match repr(canonical_skill_name): {repr(canonical_skill_name)} with pattern repr: {repr(pattern_str)} in line repr: {repr(temp_line_for_matching)}")
-
-                try:
-                    pattern = re.compile(pattern_str, re.IGNORECASE)
-                except re.error as e:
-                    if self.debug: print(f"DEBUG (_parse_block_for_skills): Regex error for skill '{canonical_skill_name}', pattern '{pattern_str}': {e}")
-                    continue 
-
-                match_found_for_current_skill_in_line_iteration = False
-                
-                # --- START: Direct match for C++ and C# as a fallback/primary check if line is exact ---
-                if canonical_skill_name in ["C++", "C#"] and temp_line_for_matching.lower() == canonical_skill_name.lower():
-                    if self.debug: print(f"DEBUG_DIRECT_MATCH: Direct exact match for '{canonical_skill_name}' in line '{temp_line_for_matching}'")
-                    match_found_for_current_skill_in_line_iteration = True
-                    if skill_type == 'soft':
-                        soft_set.add(canonical_skill_name)
-                    else: 
-                        general_set.add(canonical_skill_name)
-                    if self.debug and canonical_skill_name.lower() == "c++":
-                         print(f"DEBUG_CPP_SKILL: MATCHED (direct exact) '{canonical_skill_name}' (type: {skill_type}). Adding to set.")
-                    temp_line_for_matching = "$" * len(temp_line_for_matching) # Mark as consumed
-                # --- END: Direct Match ---
-                
-                # Proceed with regex search if not directly matched and consumed, or for other skills
-                if not match_found_for_current_skill_in_line_iteration:
-                    while True:
-                        match = pattern.search(temp_line_for_matching)
-                        if match:
-                            match_found_for_current_skill_in_line_iteration = True
-                            start, end = match.span()
-                            
-                            if skill_type == 'soft':
-                                soft_set.add(canonical_skill_name)
-                            else: 
-                                general_set.add(canonical_skill_name)
-                            
-                            if self.debug and canonical_skill_name.lower() == "c++":
-                               print(f"DEBUG_CPP_SKILL: MATCHED (regex) '{canonical_skill_name}' (type: {skill_type}). Adding to set.")
-                            
-                            if self.debug and (canonical_skill_name.lower() in ["o&g", "c++", "ui/ux design", "series 7"]):
-                               print(f"DEBUG (_parse_block_for_skills): Matched skill '{canonical_skill_name}' (type: {skill_type}) in: '...{temp_line_for_matching[max(0,start-10):end+10]}...'")
+            # A line that is exactly "C++" or "C#" is taken as that skill (the word
+            # boundary rule below would otherwise reject the trailing symbol).
+            if folded_line in ("c++", "c#"):
+                for canonical_skill_name, skill_type in self.sorted_skill_references:
+                    if canonical_skill_name.lower() == folded_line:
+                        if self.trace.debug_enabled: self.trace.debug("skills", "DIRECT_MATCH: Direct exact match for '%s' in line '%s'", canonical_skill_name, line_content)
+                        (soft_set if skill_type == 'soft' else general_set).add(canonical_skill_name)
+                        break
+                continue
 
-                            temp_line_for_matching = temp_line_for_matching[:start] + ("$" * (end - start)) + temp_line_for_matching[end:]
-                        else:
-                            break # Exit while loop for current skill if no more matches in line
+            # Group every hit by skill rank; ranks follow sorted_skill_references order
+            hits_by_rank = {}
+            for start, _end, rank in self.skill_automaton.iter_matches(folded_line):
+                hits_by_rank.setdefault(rank, []).append(start)
+            if not hits_by_rank:
+                continue
 
-                if self.debug and match_found_for_current_skill_in_line_iteration:
-                    if any(ds_trace in original_temp_line_for_current_skill_search.lower() for ds_trace in ["o&g", "c++", "ui/ux design", "series 7"]):
-                        print(f"DEBUG (_parse_block_for_skills): Line after processing skill '{canonical_skill_name}': '{temp_line_for_matching}' (was: '{original_temp_line_for_current_skill_search}')")
+            line_length = len(line_content)
+            consumed = bytearray(line_length) # 1 = span already taken by a longer/earlier skill
+
+            def is_boundary(pos):
+                # Equivalent of regex \b on the line with consumed spans masked out
+                before = pos > 0 and not consumed[pos - 1] and is_word_char(line_content[pos - 1])
+                after = pos < line_length and not consumed[pos] and is_word_char(line_content[pos])
+                return before != after
+
+            for rank in sorted(hits_by_rank):
+                canonical_skill_name, skill_type = self.sorted_skill_references[rank]
+                skill_length = len(canonical_skill_name)
+                starts = sorted(hits_by_rank[rank])
+                # Take the leftmost acceptable occurrence, mask it and look again,
+                # the same way repeated regex searches over the masked line would.
+                match_found = True
+                while match_found:
+                    match_found = False
+                    for start in starts:
+                        end = start + skill_length
+                        if any(consumed[start:end]) or not is_boundary(start) or not is_boundary(end):
+                            continue
+                        (soft_set if skill_type == 'soft' else general_set).add(canonical_skill_name)
+                        consumed[start:end] = b'\x01' * skill_length
+                        match_found = True
+                        if self.trace.debug_enabled and (canonical_skill_name.lower() in ["o&g", "c++", "ui/ux design", "series 7"]):
+                            self.trace.debug("skills", "Matched skill '%s' (type: %s) in: '...%s...'", canonical_skill_name, skill_type, line_content[max(0,start-10):end+10])
+                        break
 
 
     def _extract_skills(self, skills_text: str, primary_field: str) -> Dict[str, List[str]]:
         if not skills_text or not skills_text.strip():
-            if self.debug: print("DEBUG (_extract_skills): Skills text is empty or not provided.")
+            if self.trace.debug_enabled: self.trace.debug("skills", "Skills text is empty or not provided.")
             return {"general_skills": [], "soft_skills": []}
-        if self.debug: print(f"DEBUG (_extract_skills): Received skills text (first 100): '{skills_text[:100].replace(chr(10), ' ')}'")
+        if self.trace.debug_enabled: self.trace.debug("skills", "Received skills text (first 100): '%s'", skills_text[:100].replace(chr(10), ' '))
 
         final_general_skills = set()
         final_soft_skills = set()
         
-        general_header_pattern = re.compile(r'^ \s*(General|Technical|Hard|Core)\s+Skills?\s*[: \n]', re.IGNORECASE | re.MULTILINE)
-        soft_header_pattern = re.compile(r'^ \s*Soft\s+Skills?\s*[: \n]', re.IGNORECASE | re.MULTILINE)
+        general_header_pattern = self.taxonomy.general_skills_header_pattern
+        soft_header_pattern = self.taxonomy.soft_skills_header_pattern
 
         general_match = general_header_pattern.search(skills_text)
         soft_match = soft_header_pattern.search(skills_text)
@@ -1422,10 +1746,32 @@ class EnhancedParser:
             "general_skills": sorted(list(final_general_skills - final_soft_skills)), 
             "soft_skills": sorted(list(final_soft_skills))
         }
-        if self.debug: print(f"DEBUG (_extract_skills): Final skills: {result}")
+        if self.trace.debug_enabled: self.trace.debug("skills", "Final skills: %s", result)
         return result
     # --- END: Refactored _extract_skills and its helper ---
 
+# Parser of a parse_many() worker process, built once by _init_parse_worker
+_worker_parser = None
+
+
+def _init_parse_worker(options: Dict[str, Any]):
+    global _worker_parser
+    _worker_parser = EnhancedParser(**options)
+    # The model is normally loaded on first parse; load it now, once per process
+    get_nlp(_worker_parser.spacy_model)
+
+
+def _parse_in_worker(text: str, fields: frozenset) -> Dict[str, Any]:
+    return _worker_parser._parse_or_error(text, fields)
+
+
+def _future_result(future) -> Dict[str, Any]:
+    try:
+        return future.result()
+    except Exception as e: # e.g. a worker process died
+        return {"error": f"Error parsing resume: {str(e)}", "traceback": traceback.format_exc()}
+
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python enhanced_parser.py <resume_text_file_path>")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+"""
+Named-entity lookups for the resume parser.
+
+The parser asks spaCy about many short lines (institution candidates, company/location
+lines, the two halves of "Company, City" lines). Calling nlp() once per line pays the
+pipeline overhead every time, so DocumentEntityTable runs the candidate lines of a
+document through nlp.pipe() in one batch and answers later lookups from a dict.
+
+Across documents the same lines come back again and again (university, company and
+city names), so results are also kept in a bounded, process-wide EntityCache that can
+optionally be saved to disk and reloaded when a worker restarts.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+# Lines per nlp.pipe() batch
+DEFAULT_BATCH_SIZE = 256
+
+# Process-wide cache settings (see get_entity_cache())
+DEFAULT_CACHE_SIZE = 20000
+CACHE_SIZE_ENV_VAR = "RESUME_PARSER_ENTITY_CACHE_SIZE"
+CACHE_PATH_ENV_VAR = "RESUME_PARSER_ENTITY_CACHE_PATH"
+# A persistent cache is written after this many new entries (and at interpreter exit)
+SAVE_EVERY_NEW_ENTRIES = 500
+
+
+class Entity(NamedTuple):
+    text: str
+    label: str
+    start: int  # character offsets in the (stripped) line
+    end: int
+
+
+class LineEntities(NamedTuple):
+    """What the parser needs from a spaCy Doc: its entities and how many verbs it has."""
+    ents: Tuple[Entity, ...]  # in document order
+    num_verbs: int
+
+    def has_label(self, *labels: str) -> bool:
+        return any(ent.label in labels for ent in self.ents)
+
+    def texts(self, *labels: str) -> list:
+        return [ent.text.strip() for ent in self.ents if ent.label in labels]
+
+
+def summarize_doc(doc) -> LineEntities:
+    return LineEntities(
+        ents=tuple(Entity(ent.text, ent.label_, ent.start_char, ent.end_char) for ent in doc.ents),
+        num_verbs=sum(1 for token in doc if token.pos_ == "VERB")
+    )
+
+
+def normalize_line(text: str) -> str:
+    """Cache key for a line. Only surrounding whitespace is removed: NER is case-sensitive."""
+    return text.strip()
+
+
+class EntityCache:
+    """
+    Thread-safe LRU mapping of normalized line text to LineEntities.
+
+    Entries belong to one spaCy model; a persisted file written for another model is
+    ignored on load. hits/misses count get() calls.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, persist_path: Optional[str] = None,
+                 model_name: Optional[str] = None):
+        self.max_size = max(0, int(max_size))
+        self.persist_path = persist_path
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        if persist_path:
+            self.load()
+
+    def get(self, text: str) -> Optional[LineEntities]:
+        key = normalize_line(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, text: str, entry: LineEntities):
+        if not self.max_size:
+            return
+        key = normalize_line(text)
+        save_now = False
+        with self._lock:
+            if key not in self._entries:
+                self._unsaved += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            if self.persist_path and self._unsaved >= SAVE_EVERY_NEW_ENTRIES:
+                save_now = True
+        if save_now:
+            self.save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self._unsaved = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self):
+        """Load persisted entries (most recently used last). Unreadable files are ignored."""
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("model") != self.model_name:
+                return
+            entries = [
+                (key, LineEntities(tuple(Entity(*ent) for ent in ents), num_verbs))
+                for key, ents, num_verbs in data.get("entries", [])
+            ]
+        except (OSError, ValueError, TypeError):
+            return
+        with self._lock:
+            for key, entry in entries[-self.max_size:] if self.max_size else []:
+                self._entries[key] = entry
+
+    def save(self):
+        """Write the cache atomically to persist_path (no-op without one)."""
+        if not self.persist_path:
+            return
+        with self._lock:
+            data = {
+                "model": self.model_name,
+                "entries": [[key, [list(ent) for ent in entry.ents], entry.num_verbs] for key, entry in self._entries.items()]
+            }
+            self._unsaved = 0
+        directory = os.path.dirname(os.path.abspath(self.persist_path))
+        temp_path = f"{self.persist_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.persist_path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+
+
+_entity_caches = {}
+_entity_caches_lock = threading.Lock()
+
+
+def get_entity_cache(model_name: str) -> EntityCache:
+    """
+    Process-wide cache for model_name. Size comes from RESUME_PARSER_ENTITY_CACHE_SIZE
+    (0 disables caching); RESUME_PARSER_ENTITY_CACHE_PATH enables persistence (one file
+    per model, the model name is appended to the path).
+    """
+    cache = _entity_caches.get(model_name)
+    if cache is not None:
+        return cache
+    with _entity_caches_lock:
+        cache = _entity_caches.get(model_name)
+        if cache is None:
+            max_size = int(os.getenv(CACHE_SIZE_ENV_VAR, DEFAULT_CACHE_SIZE))
+            base_path = os.getenv(CACHE_PATH_ENV_VAR)
+            persist_path = None
+            if base_path:
+                safe_model_name = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in model_name)
+                persist_path = f"{base_path}.{safe_model_name}.json"
+            cache = EntityCache(max_size=max_size, persist_path=persist_path, model_name=model_name)
+            if persist_path:
+                atexit.register(cache.save)
+            _entity_caches[model_name] = cache
+    return cache
+
+
+class DocumentEntityTable:
+    """
+    Entity results for the lines of one document.
+
+    prefetch() runs a batch of texts through nlp.pipe(); get() returns the stored
+    result, falling back to a single nlp() call for texts that were not prefetched.
+    Both consult the shared EntityCache first when one is given.
+    """
+
+    def __init__(self, nlp_model, batch_size: int = DEFAULT_BATCH_SIZE, cache: Optional[EntityCache] = None):
+        self._nlp = nlp_model
+        self._batch_size = batch_size
+        self._cache = cache
+        self._entries = {}
+        self.batched = 0
+        self.single_calls = 0
+
+    def _from_cache(self, text: str) -> Optional[LineEntities]:
+        if self._cache is None:
+            return None
+        entry = self._cache.get(text)
+        if entry is not None:
+            self._entries[text] = entry
+        return entry
+
+    def prefetch(self, texts: Iterable[str]):
+        pending = [
+            text for text in dict.fromkeys(texts)
+            if text and text not in self._entries and self._from_cache(text) is None
+        ]
+        if not pending:
+            return
+        for text, doc in zip(pending, self._nlp.pipe(pending, batch_size=self._batch_size)):
+            entry = summarize_doc(doc)
+            self._entries[text] = entry
+            if self._cache is not None:
+                self._cache.put(text, entry)
+        self.batched += len(pending)
+
+    def get(self, text: str) -> LineEntities:
+        entry = self._entries.get(text)
+        if entry is None:
+            entry = self._from_cache(text)
+        if entry is None:
+            entry = summarize_doc(self._nlp(text))
+            self._entries[text] = entry
+            if self._cache is not None:
+                self._cache.put(text, entry)
+            self.single_calls += 1
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Per-stage timings and counters for the extract -> parse pipeline.
+
+An Instrumentation object collects, for one document, the wall-clock and CPU time
+of each named stage (pdfminer, ocr, layout, field_detection, sections, education,
+experience, skills, ...) and a few counters (lines, NER calls, skills matched, ...):
+
+    instrumentation = Instrumentation()
+    with instrumentation.stage("sections"):
+        ...
+    instrumentation.count("lines", 42)
+    result["_timings"] = instrumentation.as_dict()
+
+Finished documents are added to a process-wide MetricsAggregator (get_metrics()),
+which renders Prometheus text exposition format.
+
+When instrumentation is off, components use NULL_INSTRUMENTATION: stage() hands back
+one shared do-nothing context manager and count() returns immediately, so the cost
+is a method call per stage, not per line.
+
+CPU time is the calling thread's (time.thread_time()); work done in helper
+processes (parallel pdfminer/OCR) shows up as wall time only.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict
+
+INSTRUMENT_ENV_VAR = "RESUME_PARSER_INSTRUMENT"
+METRIC_PREFIX = "resume_parser"
+
+
+def instrumentation_enabled(instrument=None) -> bool:
+    """Resolve an `instrument` option: None means the RESUME_PARSER_INSTRUMENT env var."""
+    if instrument is None:
+        return os.getenv(INSTRUMENT_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+    return bool(instrument)
+
+
+class _Stage:
+    __slots__ = ("_instrumentation", "_name", "_wall", "_cpu")
+
+    def __init__(self, instrumentation, name):
+        self._instrumentation = instrumentation
+        self._name = name
+
+    def __enter__(self):
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._instrumentation.add_stage(self._name, time.perf_counter() - self._wall, time.thread_time() - self._cpu)
+        return False
+
+
+class Instrumentation:
+    """Stage timings and counters for one document (not thread-safe; one per parse)."""
+
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}    # name -> [wall seconds, cpu seconds, calls]
+        self.counters = {}  # name -> int
+
+    def stage(self, name: str) -> _Stage:
+        return _Stage(self, name)
+
+    def add_stage(self, name: str, wall_seconds: float, cpu_seconds: float):
+        totals = self.stages.get(name)
+        if totals is None:
+            self.stages[name] = [wall_seconds, cpu_seconds, 1]
+        else:
+            totals[0] += wall_seconds
+            totals[1] += cpu_seconds
+            totals[2] += 1
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "Instrumentation"):
+        for name, (wall_seconds, cpu_seconds, calls) in other.stages.items():
+            totals = self.stages.setdefault(name, [0.0, 0.0, 0])
+            totals[0] += wall_seconds
+            totals[1] += cpu_seconds
+            totals[2] += calls
+        for name, value in other.counters.items():
+            self.count(name, value)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """The `_timings` block: per-stage wall/CPU milliseconds and the counters."""
+        return {
+            "stages": {
+                name: {"wall_ms": round(wall_seconds * 1000, 3), "cpu_ms": round(cpu_seconds * 1000, 3)}
+                for name, (wall_seconds, cpu_seconds, _calls) in self.stages.items()
+            },
+            "counts": dict(self.counters)
+        }
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class _NullInstrumentation:
+    """Stand-in used when instrumentation is off; every call is a no-op."""
+
+    enabled = False
+    _stage = _NullStage()
+
+    def stage(self, name: str) -> _NullStage:
+        return self._stage
+
+    def add_stage(self, name: str, wall_seconds: float, cpu_seconds: float):
+        pass
+
+    def count(self, name: str, value: int = 1):
+        pass
+
+    def merge(self, other):
+        pass
+
+
+NULL_INSTRUMENTATION = _NullInstrumentation()
+
+
+def new_instrumentation(enabled: bool):
+    return Instrumentation() if enabled else NULL_INSTRUMENTATION
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsAggregator:
+    """Thread-safe running totals of finished documents' instrumentation, per component."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._documents = {}  # component -> documents recorded
+            self._stages = {}     # (component, stage) -> [wall seconds, cpu seconds, calls]
+            self._counters = {}   # (component, counter) -> total
+
+    def record(self, component: str, instrumentation):
+        """Add one document's stages and counters (no-op for NULL_INSTRUMENTATION)."""
+        if not instrumentation.enabled:
+            return
+        with self._lock:
+            self._documents[component] = self._documents.get(component, 0) + 1
+            for name, (wall_seconds, cpu_seconds, calls) in instrumentation.stages.items():
+                totals = self._stages.setdefault((component, name), [0.0, 0.0, 0])
+                totals[0] += wall_seconds
+                totals[1] += cpu_seconds
+                totals[2] += calls
+            for name, value in instrumentation.counters.items():
+                key = (component, name)
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": dict(self._documents),
+                "stages": {
+                    f"{component}.{name}": {"wall_seconds": wall, "cpu_seconds": cpu, "calls": calls}
+                    for (component, name), (wall, cpu, calls) in self._stages.items()
+                },
+                "counts": {f"{component}.{name}": value for (component, name), value in self._counters.items()}
+            }
+
+    def prometheus_text(self) -> str:
+        """All totals in Prometheus text exposition format (version 0.0.4)."""
+        with self._lock:
+            documents = sorted(self._documents.items())
+            stages = sorted(self._stages.items())
+            counters = sorted(self._counters.items())
+
+        lines = []
+
+        def family(name, help_text, samples):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} counter")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(str(label))}"' for key, label in labels)
+                lines.append(f"{METRIC_PREFIX}_{name}{{{label_text}}} {value}")
+
+        family("documents_total", "Documents processed with instrumentation on.",
+               [((("component", component),), count) for component, count in documents])
+        family("stage_seconds_total", "Wall-clock seconds spent in each pipeline stage.",
+               [((("component", component), ("stage", name)), repr(totals[0])) for (component, name), totals in stages])
+        family("stage_cpu_seconds_total", "CPU seconds (calling thread) spent in each pipeline stage.",
+               [((("component", component), ("stage", name)), repr(totals[1])) for (component, name), totals in stages])
+        family("stage_calls_total", "Times each pipeline stage ran.",
+               [((("component", component), ("stage", name)), totals[2]) for (component, name), totals in stages])
+        family("events_total", "Work counters (lines, NER calls, skills matched, ...).",
+               [((("component", component), ("counter", name)), value) for (component, name), value in counters])
+        return "\n".join(lines) + "\n"
+
+
+_metrics = MetricsAggregator()
+
+
+def get_metrics() -> MetricsAggregator:
+    """The process-wide aggregator fed by instrumented parsers and extractors."""
+    return _metrics
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Lazy loading of the spaCy pipeline used by the resume parser.
+
+Nothing is loaded at import time. The first get_nlp() call loads the model with only
+the components the parser reads: entities (ner) and coarse part-of-speech tags for
+verb counting (tok2vec + tagger + attribute_ruler). The dependency parser, lemmatizer
+and sentence splitter are excluded, which shortens start-up and lowers per-process
+memory.
+
+The model can be pinned with the RESUME_PARSER_SPACY_MODEL environment variable
+(a package name such as "en_core_web_md" or a path to a trained pipeline), or per
+parser via EnhancedParser(spacy_model=...).
+"""
+
+import os
+import sys
+import threading
+
+DEFAULT_SPACY_MODEL = "en_core_web_sm"
+SPACY_MODEL_ENV_VAR = "RESUME_PARSER_SPACY_MODEL"
+
+# Components the parser never reads; names missing from a custom pipeline are ignored
+EXCLUDED_COMPONENTS = ["parser", "lemmatizer", "senter"]
+
+_loaded_models = {}
+_load_lock = threading.Lock()
+
+
+def resolve_model_name(model_name=None) -> str:
+    return model_name or os.getenv(SPACY_MODEL_ENV_VAR) or DEFAULT_SPACY_MODEL
+
+
+def get_nlp(model_name=None):
+    """Return the (process-wide, cached) trimmed spaCy pipeline for model_name."""
+    model_name = resolve_model_name(model_name)
+    nlp = _loaded_models.get(model_name)
+    if nlp is not None:
+        return nlp
+
+    with _load_lock:
+        nlp = _loaded_models.get(model_name)
+        if nlp is None:
+            nlp = _load(model_name)
+            _loaded_models[model_name] = nlp
+    return nlp
+
+
+def _load(model_name: str):
+    import spacy
+
+    try:
+        return spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
+    except OSError:
+        # Only the stock model is fetched automatically; custom names/paths must exist
+        if model_name != DEFAULT_SPACY_MODEL:
+            raise
+        print(f"Downloading spaCy {model_name} model...", file=sys.stderr)
+        spacy.cli.download(model_name)
+        return spacy.load(model_name, exclude=EXCLUDED_COMPONENTS)
@@ -5,22 +5,89 @@ from PIL import Image, ImageDraw, ImageFilter, ImageFont
 import os
 import json
 import sys
+import functools
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from io import BytesIO
 
-def highlight_booths_on_map(image_bytes, recommended_booth_numbers, test_mode=False, debug_name=None):
-    if not image_bytes or not recommended_booth_numbers:
-        return None
-    try:
-        pil_image = Image.open(image_bytes).convert("RGB")
-        cv_img = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-        draw = ImageDraw.Draw(pil_image)
-    except Exception as e:
-        print(f"Error loading image: {e}")
-        return None
-    # Detect rectangles (booths)
+try:
+    from .booth_index_cache import get_booth_index_cache, hash_map_bytes
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from booth_index_cache import get_booth_index_cache, hash_map_bytes
+
+try:
+    from .tracing import get_tracer
+except ImportError: # Imported as a top-level module (lib directory on sys.path)
+    from tracing import get_tracer
+
+# Bump when detection or OCR changes in a way the parameters below don't capture
+BOOTH_INDEX_VERSION = "3"
+
+# Rectangle detection: adaptive threshold block size/offset and booth size limits
+THRESHOLD_BLOCK_SIZE = 11
+THRESHOLD_C = 2
+MIN_BOOTH_SIDE = 15
+MAX_BOOTH_FRACTION = 0.9  # of the image width/height
+MIN_BOOTH_ASPECT = 0.3
+MAX_BOOTH_ASPECT = 4.0
+MIN_BOOTH_AREA = 100
+MAX_BOOTH_AREA = 10000
+
+# Image variants of a booth crop and page segmentation modes tried on each; without
+# recorded statistics strategies run variant by variant, single-line/word PSMs first
+OCR_VARIANTS = ["color", "bin", "bin_resized", "denoised", "sharp", "contrast", "invert"]
+OCR_PSM_MODES = [7, 8, 6, 13, 10, 11, 12, 3, 4]
+OCR_DIGITS_CONFIG = '--psm {psm} -c tessedit_char_whitelist=0123456789'
+# A digit reading is accepted at once with this Tesseract word confidence (0-100),
+# or when this many strategies have produced the same digits
+OCR_MIN_CONFIDENCE = 60
+OCR_AGREEING_READINGS = 2
+# Margin (pixels) kept around a booth rectangle when cropping it for OCR
+BOOTH_CROP_PAD = 5
+# Processes OCR'ing booth rectangles concurrently (1 = in the calling process)
+OCR_WORKERS_ENV_VAR = "BOOTH_OCR_WORKERS"
+DEFAULT_OCR_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+
+
+def detector_fingerprint():
+    """Identifies the settings a booth index depends on (part of its cache key)."""
+    params = json.dumps([
+        BOOTH_INDEX_VERSION, THRESHOLD_BLOCK_SIZE, THRESHOLD_C, MIN_BOOTH_SIDE, MAX_BOOTH_FRACTION,
+        MIN_BOOTH_ASPECT, MAX_BOOTH_ASPECT, MIN_BOOTH_AREA, MAX_BOOTH_AREA, OCR_VARIANTS,
+        sorted(OCR_PSM_MODES), OCR_DIGITS_CONFIG, OCR_MIN_CONFIDENCE, OCR_AGREEING_READINGS, BOOTH_CROP_PAD
+    ])
+    return f"booths-{BOOTH_INDEX_VERSION}-{hashlib.sha256(params.encode('utf-8')).hexdigest()[:16]}"
+
+
+def read_map_bytes(image_bytes):
+    """The raw bytes of a map given as bytes, a file object or a path."""
+    if isinstance(image_bytes, (bytes, bytearray)):
+        return bytes(image_bytes)
+    if isinstance(image_bytes, (str, os.PathLike)):
+        with open(image_bytes, 'rb') as f:
+            return f.read()
+    if hasattr(image_bytes, 'getvalue'):
+        return image_bytes.getvalue()
+    image_bytes.seek(0)
+    return image_bytes.read()
+
+
+def decode_map_image(data):
+    """Return (PIL RGB image, OpenCV BGR array) for a map's bytes."""
+    pil_image = Image.open(BytesIO(data)).convert("RGB")
+    cv_img = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    return pil_image, cv_img
+
+
+def detect_booth_rectangles(cv_img):
+    """Bounding boxes (x, y, w, h) of booth-sized rectangles, sorted top-to-bottom then left-to-right."""
     gray = cv2.cvtColor(cv_img, cv2.COLOR_BGR2GRAY)
     blur = cv2.GaussianBlur(gray, (3, 3), 0)
     thresh = cv2.adaptiveThreshold(blur, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                                   cv2.THRESH_BINARY_INV, 11, 2)
+                                   cv2.THRESH_BINARY_INV, THRESHOLD_BLOCK_SIZE, THRESHOLD_C)
     kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
     closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel, iterations=1)
     contours, _ = cv2.findContours(closed, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
@@ -30,121 +97,457 @@ def highlight_booths_on_map(image_bytes, recommended_booth_numbers, test_mode=Fa
         x, y, w, h = cv2.boundingRect(cnt)
         aspect = w / h if h > 0 else 0
         area = w * h
-        if w > 15 and h > 15 and w < img_w * 0.9 and h < img_h * 0.9 and 0.3 < aspect < 4.0 and 100 < area < 10000:
+        if (w > MIN_BOOTH_SIDE and h > MIN_BOOTH_SIDE
+                and w < img_w * MAX_BOOTH_FRACTION and h < img_h * MAX_BOOTH_FRACTION
+                and MIN_BOOTH_ASPECT < aspect < MAX_BOOTH_ASPECT and MIN_BOOTH_AREA < area < MAX_BOOTH_AREA):
             booth_boxes.append((x, y, w, h))
-    booth_boxes = sorted(booth_boxes, key=lambda b: (b[1], b[0]))
-    # --- Load or create cache ---
-    cache_file = os.path.join(os.path.dirname(__file__), f'ocr_psm_cache_{debug_name or "map"}.json')
-    if os.path.exists(cache_file):
-        with open(cache_file, 'r') as f:
-            booth_cache = json.load(f)
-    else:
-        booth_cache = {}
-    # --- Enhanced OCR for each detected rectangle with debug ---
-    def ocr_all_strategies_debug(booth_img, booth_num, rect):
-        results = []
-        pil_img_color = Image.fromarray(cv2.cvtColor(booth_img, cv2.COLOR_BGR2RGB))
-        gray_booth = cv2.cvtColor(booth_img, cv2.COLOR_BGR2GRAY)
-        booth_bin = cv2.adaptiveThreshold(gray_booth, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 2)
-        pil_img_bin = Image.fromarray(booth_bin)
-        pil_img_bin_resized = pil_img_bin.resize((pil_img_bin.width*2, pil_img_bin.height*2), Image.BICUBIC)
-        denoised = cv2.fastNlMeansDenoising(gray_booth, None, 30, 7, 21)
-        pil_img_denoised = Image.fromarray(denoised)
-        pil_img_sharp = pil_img_color.filter(ImageFilter.SHARPEN)
-        pil_img_contrast = pil_img_color.point(lambda p: min(255, int(p*1.5)))
-        pil_img_invert = Image.fromarray(255 - np.array(pil_img_bin))
-        variants = [
-            ("color", pil_img_color),
-            ("bin", pil_img_bin),
-            ("bin_resized", pil_img_bin_resized),
-            ("denoised", pil_img_denoised),
-            ("sharp", pil_img_sharp),
-            ("contrast", pil_img_contrast),
-            ("invert", pil_img_invert)
-        ]
-        psm_modes = [3, 4, 6, 7, 8, 10, 11, 12, 13]
-        for variant_name, img in variants:
-            for psm in psm_modes:
-                config = f'--psm {psm} -c tessedit_char_whitelist=0123456789'
-                text = pytesseract.image_to_string(img, config=config)
-                text = text.strip().replace('\n', '').replace(' ', '')
-                print(f"[DEBUG] Booth {booth_num} Rect {rect} Variant {variant_name} PSM {psm} -> '{text}'")
-                if text.isdigit():
-                    results.append((text, variant_name, psm))
-        for text, variant_name, psm in results:
-            if text == str(booth_num):
-                print(f"[MATCH] Booth {booth_num} found at {rect} with variant {variant_name} and PSM {psm}")
-                return text
-        return None
-    # --- Assignment logic: Use cache if available, OCR otherwise ---
-    booth_to_rect = {}
-    used_rects = set()
-    # 1. Use cached coordinates for recommended booths if available
-    for num in recommended_booth_numbers:
-        num_str = str(num)
-        coords = booth_cache.get(num_str, [])
-        if coords:
-            box = tuple(coords)
-            booth_to_rect[num_str] = box
-            used_rects.add(box)
-            print(f"[CACHE] Booth {num} at {box}")
-    # 2. For remaining booths, run OCR and only draw if a new, confident coordinate is found
-    for num in recommended_booth_numbers:
-        num_str = str(num)
-        coords = booth_cache.get(num_str, [])
-        if coords:
-            continue  # Already in cache
-        found = False
-        for box in booth_boxes:
-            if box in used_rects:
-                continue
-            x, y, w, h = box
-            pad = 5
-            x0 = max(0, x - pad)
-            y0 = max(0, y - pad)
-            x1 = min(img_w, x + w + pad)
-            y1 = min(img_h, y + h + pad)
-            booth_img = cv_img[y0:y1, x0:x1]
-            detected_num = ocr_all_strategies_debug(booth_img, num_str, box)
-            if detected_num == num_str:
-                booth_to_rect[num_str] = box
-                booth_cache[num_str] = list(box)
-                used_rects.add(box)
-                found = True
-                print(f"[NEW] Booth {num} at {box}")
-                break
-        if not found:
-            print(f"[MISSING] Booth {num} not found by OCR or cache")
-            booth_cache[num_str] = []
-            # Optionally save the crop for manual inspection
+    return sorted(booth_boxes, key=lambda b: (b[1], b[0]))
+
+
+def crop_booth(cv_img, box, pad=BOOTH_CROP_PAD):
+    img_h, img_w = cv_img.shape[:2]
+    x, y, w, h = box
+    x0 = max(0, x - pad)
+    y0 = max(0, y - pad)
+    x1 = min(img_w, x + w + pad)
+    y1 = min(img_h, y + h + pad)
+    return cv_img[y0:y1, x0:x1]
+
+
+class BoothCropVariants:
+    """The preprocessed versions of a booth crop handed to Tesseract, built on first use."""
+
+    def __init__(self, booth_img):
+        self.booth_img = booth_img
+        self._built = {}
+
+    def get(self, name):
+        if name not in self._built:
+            self._built[name] = getattr(self, f"_build_{name}")()
+        return self._built[name]
+
+    def _gray(self):
+        if "_gray" not in self._built:
+            self._built["_gray"] = cv2.cvtColor(self.booth_img, cv2.COLOR_BGR2GRAY)
+        return self._built["_gray"]
+
+    def _build_color(self):
+        return Image.fromarray(cv2.cvtColor(self.booth_img, cv2.COLOR_BGR2RGB))
+
+    def _build_bin(self):
+        booth_bin = cv2.adaptiveThreshold(self._gray(), 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY, 11, 2)
+        return Image.fromarray(booth_bin)
+
+    def _build_bin_resized(self):
+        pil_img_bin = self.get("bin")
+        return pil_img_bin.resize((pil_img_bin.width*2, pil_img_bin.height*2), Image.BICUBIC)
+
+    def _build_denoised(self):
+        return Image.fromarray(cv2.fastNlMeansDenoising(self._gray(), None, 30, 7, 21))
+
+    def _build_sharp(self):
+        return self.get("color").filter(ImageFilter.SHARPEN)
+
+    def _build_contrast(self):
+        return self.get("color").point(lambda p: min(255, int(p*1.5)))
+
+    def _build_invert(self):
+        return Image.fromarray(255 - np.array(self.get("bin")))
+
+
+def strategy_name(variant_name, psm):
+    return f"{variant_name}:{psm}"
+
+
+def map_style(cv_img):
+    """
+    Coarse look of a floor plan ("light-color", "dark-gray", ...). OCR strategy
+    statistics are kept per style: which variant reads digits best depends mostly
+    on background brightness and on whether the plan is drawn in colour.
+    """
+    gray = cv2.cvtColor(cv_img, cv2.COLOR_BGR2GRAY)
+    brightness = "dark" if gray.mean() < 128 else "light"
+    channels = cv_img.astype(np.int16)
+    spread = np.abs(channels[:, :, 0] - channels[:, :, 1]).mean() + np.abs(channels[:, :, 1] - channels[:, :, 2]).mean()
+    return f"{brightness}-{'color' if spread > 20 else 'gray'}"
+
+
+def order_strategies(strategy_stats=None):
+    """
+    (variant, psm) pairs, best historical success rate first. Rates are smoothed so
+    untried strategies sit between proven and failing ones; ties keep the default order.
+    """
+    strategies = [(variant_name, psm) for variant_name in OCR_VARIANTS for psm in OCR_PSM_MODES]
+    if not strategy_stats:
+        return strategies
+
+    def success_rate(strategy):
+        attempts, successes = strategy_stats.get(strategy_name(*strategy), (0, 0))
+        return (successes + 1) / (attempts + 2)
+
+    return sorted(strategies, key=success_rate, reverse=True)
+
+
+def _ocr_digits(img, psm):
+    """One Tesseract call: (digit string, lowest word confidence) or (None, 0)."""
+    data = pytesseract.image_to_data(img, config=OCR_DIGITS_CONFIG.format(psm=psm), output_type=pytesseract.Output.DICT)
+    words = [(str(text).strip(), float(conf)) for text, conf in zip(data["text"], data["conf"]) if str(text).strip()]
+    text = "".join(word for word, _ in words)
+    if not text.isdigit():
+        return None, 0.0
+    return text, min(conf for _, conf in words)
+
+
+def ocr_booth_number(booth_img, strategies=None, outcomes=None, debug=False):
+    """
+    Read the number printed inside one booth crop.
+
+    Strategies (variant, psm) run in order and stop at the first confident reading:
+    one with a word confidence of at least OCR_MIN_CONFIDENCE, or digits that
+    OCR_AGREEING_READINGS strategies agree on. Without a confident reading the crop
+    is not a booth number (hall outlines, legends, decorations), so nothing is
+    returned. outcomes, when given, collects strategy -> [attempts, successes] for
+    the success-rate statistics.
+
+    Returns (number, confidence) or (None, 0).
+    """
+    trace = get_tracer("ocr", debug=debug)
+    variants = BoothCropVariants(booth_img)
+    readings = {}  # digits -> [count, best confidence, strategies that read them]
+    for variant_name, psm in strategies or order_strategies():
+        name = strategy_name(variant_name, psm)
+        text, conf = _ocr_digits(variants.get(variant_name), psm)
+        if outcomes is not None:
+            outcomes.setdefault(name, [0, 0])[0] += 1
+        if trace.debug_enabled:
+            trace.debug("strategy", "Strategy %s -> '%s' (conf %.0f)", name, text or '', conf)
+        if text is None:
+            continue
+        reading = readings.setdefault(text, [0, 0.0, []])
+        reading[0] += 1
+        reading[1] = max(reading[1], conf)
+        reading[2].append(name)
+        if conf >= OCR_MIN_CONFIDENCE or reading[0] >= OCR_AGREEING_READINGS:
+            if outcomes is not None:
+                for agreeing in reading[2]:
+                    outcomes[agreeing][1] += 1
+            return text, reading[1]
+    return None, 0
+
+
+def _ocr_booth_crop(booth_img, strategies, debug=False):
+    """ocr_booth_number for one crop with its own outcome counts; module-level so process pools can run it."""
+    outcomes = {}
+    number, conf = ocr_booth_number(booth_img, strategies, outcomes, debug=debug)
+    return number, conf, outcomes
+
+
+# Process pool shared by all index builds in the process, created on first parallel use
+_ocr_pool = None
+_ocr_pool_workers = 0
+_ocr_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _get_ocr_pool(workers):
+    global _ocr_pool, _ocr_pool_workers
+    with _ocr_pool_lock:
+        if _ocr_pool is None or _ocr_pool_workers != workers:
+            if _ocr_pool is not None:
+                _ocr_pool.shutdown(wait=False)
+            # Never fork: the pool is started from the booth-index thread of a multi-threaded
+            # (Streamlit) process, and forked children can inherit locks held by other threads
+            _ocr_pool = ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context())
+            _ocr_pool_workers = workers
+        return _ocr_pool
+
+
+def _can_start_process_pool():
+    # Daemonic processes (e.g. parser_worker pool members) are not allowed to have children
+    return not multiprocessing.current_process().daemon
+
+
+def resolve_ocr_workers(workers=None):
+    if workers is None:
+        workers = int(os.getenv(OCR_WORKERS_ENV_VAR, DEFAULT_OCR_WORKERS))
+    return max(1, workers)
+
+
+def build_booth_index(cv_img, booth_boxes=None, debug=False, workers=None):
+    """
+    Booth number -> [x, y, w, h] for a whole floor plan.
+
+    Every detected rectangle is OCR'd once, with the strategies that worked best on
+    maps of the same style tried first; the outcomes are added to those statistics.
+    With more than one worker (default: BOOTH_OCR_WORKERS or half the CPUs) the crops
+    are OCR'd concurrently in a process pool. Results are merged in rectangle order
+    either way, so the index does not depend on which worker finished first: when
+    the same number is read in several rectangles (e.g. a booth outline and the label
+    box inside it), the most confident reading wins, then the first rectangle in
+    reading order.
+    """
+    trace = get_tracer("ocr", debug=debug)
+    if booth_boxes is None:
+        booth_boxes = detect_booth_rectangles(cv_img)
+    cache = get_booth_index_cache(detector_fingerprint())
+    style = map_style(cv_img)
+    strategies = order_strategies(cache.get_strategy_stats(style) if cache is not None else None)
+    crops = [crop_booth(cv_img, box) for box in booth_boxes]
+    workers = resolve_ocr_workers(workers)
+
+    if workers > 1 and len(crops) > 1 and _can_start_process_pool():
+        pool = _get_ocr_pool(workers)
+        futures = [pool.submit(_ocr_booth_crop, crop, strategies, debug) for crop in crops]
+        readings = []
+        for box, future in zip(booth_boxes, futures):
             try:
-                crop_dir = os.path.join(os.path.dirname(__file__), 'debug_crops')
-                os.makedirs(crop_dir, exist_ok=True)
-                crop_path = os.path.join(crop_dir, f'booth_{num_str}_crop.png')
-                Image.fromarray(cv_img[y0:y1, x0:x1]).save(crop_path)
+                readings.append(future.result())
             except Exception as e:
-                print(f"[DEBUG] Could not save crop for booth {num_str}: {e}")
-    # Draw highlights only for recommended booths that are in the cache or newly detected
-    for num in recommended_booth_numbers:
+                trace.warning("index", "OCR failed for rect %s: %s", box, e)
+                readings.append((None, 0, {}))
+    else:
+        readings = [_ocr_booth_crop(crop, strategies, debug) for crop in crops]
+
+    outcomes = {}
+    booths = {}
+    confidences = {}
+    for box, (number, conf, crop_outcomes) in zip(booth_boxes, readings):
+        for name, (attempts, successes) in crop_outcomes.items():
+            counts = outcomes.setdefault(name, [0, 0])
+            counts[0] += attempts
+            counts[1] += successes
+        if trace.debug_enabled:
+            trace.debug("index", "Rect %s -> %s", box, number)
+        if number is not None and (number not in booths or conf > confidences[number]):
+            booths[number] = list(box)
+            confidences[number] = conf
+    if cache is not None and outcomes:
+        cache.record_strategy_outcomes(style, outcomes)
+    if trace.info_enabled:
+        attempts = sum(counts[0] for counts in outcomes.values())
+        trace.info("index", "%d OCR calls for %d rectangles (%s map, %d workers)", attempts, len(booth_boxes), style, workers)
+    return booths
+
+
+def load_booth_index(map_hash):
+    """Return (booths, complete) for an indexed map, or None."""
+    cache = get_booth_index_cache(detector_fingerprint())
+    return cache.get(map_hash) if cache is not None else None
+
+
+def save_booth_index(map_hash, booths, complete=True):
+    cache = get_booth_index_cache(detector_fingerprint())
+    if cache is not None:
+        cache.put(map_hash, booths, complete)
+
+
+def index_booth_map(image_bytes, debug=False, workers=None):
+    """
+    Offline indexing step: detect and OCR every booth on a floor plan once and store
+    the complete booth-number -> bounding-box index used by highlight_booths_on_map.
+    Meant to run when a map is uploaded, not on a page request.
+    """
+    data = read_map_bytes(image_bytes)
+    pil_image, cv_img = decode_map_image(data)
+    booths = build_booth_index(cv_img, debug=debug, workers=workers)
+    save_booth_index(hash_map_bytes(data), booths)
+    get_tracer("ocr", debug=debug).info("index", "%d booths indexed", len(booths))
+    return booths
+
+
+# Index builds started from page requests run on this thread, one job per map hash,
+# so a build outlives the request that timed out and reruns of the same map share it
+_indexing_executor = None
+_indexing_jobs = {}
+_indexing_lock = threading.Lock()
+
+
+def _build_and_save_index(map_hash, cv_img, debug=False):
+    try:
+        booths = build_booth_index(cv_img, debug=debug)
+        save_booth_index(map_hash, booths)
+        return booths
+    finally:
+        with _indexing_lock:
+            _indexing_jobs.pop(map_hash, None)
+
+
+def _background_index_job(map_hash, cv_img, debug=False):
+    """The running index build for map_hash, starting one if there is none."""
+    global _indexing_executor
+    with _indexing_lock:
+        future = _indexing_jobs.get(map_hash)
+        if future is None:
+            if _indexing_executor is None:
+                _indexing_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="booth-index")
+            future = _indexing_executor.submit(_build_and_save_index, map_hash, cv_img, debug)
+            _indexing_jobs[map_hash] = future
+        return future
+
+
+def is_indexing(image_bytes):
+    """True while a background index build for this map is queued or running."""
+    future = _indexing_jobs.get(hash_map_bytes(read_map_bytes(image_bytes)))
+    return future is not None and not future.done()
+
+
+@functools.lru_cache(maxsize=32)
+def _label_font(font_size):
+    try:
+        return ImageFont.truetype("arial.ttf", size=font_size)
+    except (OSError, IOError):
+        return ImageFont.load_default()
+
+
+def draw_booth_highlights(pil_image, booth_to_rect, booth_numbers):
+    """Fill and label the rectangles of booth_numbers found in booth_to_rect (in place)."""
+    draw = ImageDraw.Draw(pil_image)
+    for num in booth_numbers:
         num_str = str(num)
-        if num_str in booth_to_rect:
-            x, y, w, h = booth_to_rect[num_str]
-            draw.rectangle([x, y, x+w, y+h], outline=(255,0,0), fill=(255,200,200), width=4)
-            font_size = max(16, int(h * 0.5))
-            try:
-                font = ImageFont.truetype("arial.ttf", size=font_size)
-            except:
-                font = ImageFont.load_default()
-            text = str(num)
-            try:
-                bbox = draw.textbbox((0, 0), text, font=font)
-                text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
-            except AttributeError:
-                text_w, text_h = draw.textsize(text, font=font)
-            text_x = x + (w - text_w) // 2
-            text_y = y + (h - text_h) // 2
-            draw.text((text_x, text_y), text, fill=(0,0,0), font=font)
-    # Save updated cache
-    with open(cache_file, 'w') as f:
-        json.dump(booth_cache, f, indent=2)
-    return pil_image
\ No newline at end of file
+        if num_str not in booth_to_rect:
+            continue
+        x, y, w, h = booth_to_rect[num_str]
+        draw.rectangle([x, y, x+w, y+h], outline=(255,0,0), fill=(255,200,200), width=4)
+        font = _label_font(max(16, int(h * 0.5)))
+        text = num_str
+        try:
+            bbox = draw.textbbox((0, 0), text, font=font)
+            text_w, text_h = bbox[2] - bbox[0], bbox[3] - bbox[1]
+        except AttributeError:
+            text_w, text_h = draw.textsize(text, font=font)
+        text_x = x + (w - text_w) // 2
+        text_y = y + (h - text_h) // 2
+        draw.text((text_x, text_y), text, fill=(0,0,0), font=font)
+    return pil_image
+
+
+class RenderedMapCache:
+    """
+    Thread-safe LRU of highlighted maps as PNG bytes, keyed by (map hash, sorted booth
+    numbers) and bounded by the total size of the stored images.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max(0, int(max_bytes))
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+            self._entries[key] = png
+            self.size_bytes += len(png)
+            while self.size_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "size_bytes": self.size_bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+
+# Highlighted maps rendered in this process (default cap: BOOTH_RENDER_CACHE_MB or 64 MB)
+RENDER_CACHE_MB_ENV_VAR = "BOOTH_RENDER_CACHE_MB"
+DEFAULT_RENDER_CACHE_MB = 64
+rendered_maps = RenderedMapCache(float(os.getenv(RENDER_CACHE_MB_ENV_VAR, DEFAULT_RENDER_CACHE_MB)) * 1024 * 1024)
+
+
+def highlighted_map_png(image_bytes, recommended_booth_numbers, debug=False, timeout=None):
+    """
+    Return the map with the recommended booths highlighted, as PNG bytes.
+
+    The same map and booth set is served from the rendered-map cache without decoding
+    anything. Otherwise booth positions come from the shared index for this exact
+    image (keyed by a hash of its bytes), so only the image is decoded and drawn on.
+    The map is only scanned when it has not been indexed yet; that scan runs in the
+    background and, with a timeout (seconds), None is returned if it is not finished
+    by then while the index build carries on (see is_indexing()). A map that cannot
+    be loaded or indexed also gives None (the error is traced as a warning).
+    """
+    if not image_bytes or not recommended_booth_numbers:
+        return None
+    trace = get_tracer("ocr", debug=debug)
+    try:
+        data = read_map_bytes(image_bytes)
+    except Exception as e:
+        trace.warning("render", "Error loading image: %s", e)
+        return None
+    requested = sorted({str(num) for num in recommended_booth_numbers})
+    map_hash = hash_map_bytes(data)
+    render_key = (map_hash, tuple(requested))
+    png = rendered_maps.get(render_key)
+    if png is not None:
+        return png
+
+    try:
+        pil_image = Image.open(BytesIO(data)).convert("RGB")
+    except Exception as e:
+        trace.warning("render", "Error loading image: %s", e)
+        return None
+    stored = load_booth_index(map_hash)
+    if stored is not None and stored[1]:
+        booths = stored[0]
+    else:
+        try:
+            cv_img = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+            booths = _background_index_job(map_hash, cv_img, debug).result(timeout=timeout)
+        except FutureTimeoutError:
+            trace.info("render", "Map %s still being indexed after %ss", map_hash[:12], timeout)
+            return None
+        except Exception as e:
+            # e.g. a Tesseract/OpenCV error in a serial index build; the page shows the plain map
+            trace.warning("render", "Indexing map %s failed: %s", map_hash[:12], e, exc_info=True)
+            return None
+    if trace.debug_enabled:
+        for num in requested:
+            if num not in booths:
+                trace.debug("render", "Booth %s not found in the map index", num)
+    output = BytesIO()
+    draw_booth_highlights(pil_image, booths, requested).save(output, format="PNG")
+    png = output.getvalue()
+    rendered_maps.put(render_key, png)
+    return png
+
+
+def highlight_booths_on_map(image_bytes, recommended_booth_numbers, test_mode=False, debug=False, timeout=None):
+    """highlighted_map_png() as a PIL image (or None)."""
+    png = highlighted_map_png(image_bytes, recommended_booth_numbers, debug=debug, timeout=timeout)
+    return Image.open(BytesIO(png)) if png is not None else None
+
+
+if __name__ == "__main__":
+    # python ocr_utils.py MAP_IMAGE: build and store the booth index for a map
+    if len(sys.argv) != 2:
+        print("Usage: python ocr_utils.py MAP_IMAGE")
+        sys.exit(1)
+    booths = index_booth_map(sys.argv[1], debug=True)
+    print(json.dumps(booths, indent=2))
@@ -31,12 +31,7 @@ def run_test(map_filename, booth_numbers, debug_name, out_prefix="highlighted_")
     out_dir = os.path.dirname(__file__)
     out_path = os.path.join(out_dir, f"{out_prefix}{debug_name}.png")
     print(f"[TEST] Saving highlighted map to {out_path}")
-    # --- Use the correct debug_name for cache ---
-    if "jobfairmap2" in map_filename or len(booth_numbers) <= 3:
-        cache_debug_name = "all_3"
-    else:
-        cache_debug_name = "all_30"
-    img = highlight_booths_on_map(map_path, booth_numbers, debug_name=cache_debug_name, out_dir=out_dir)
+    img = highlight_booths_on_map(map_path, booth_numbers)
     img.save(out_path)
     print(f"[TEST] Saved highlighted map to {out_path}")
 
@@ -69,7 +64,7 @@ if __name__ == "__main__":
         image_bytes_30 = BytesIO(f.read())
     print(f"Testing map: {map_path_30} with all booths: {booth_numbers_30}")
     start_30 = time.time()
-    highlighted_30 = highlight_booths_on_map(image_bytes_30, booth_numbers_30, test_mode=True, debug_name="all_30")
+    highlighted_30 = highlight_booths_on_map(image_bytes_30, booth_numbers_30, test_mode=True)
     end_30 = time.time()
     out_path_30 = os.path.join(os.path.dirname(__file__), f"highlighted_all_30.png")
     highlighted_30.save(out_path_30)
@@ -82,7 +77,7 @@ if __name__ == "__main__":
         image_bytes_3 = BytesIO(f.read())
     print(f"Testing map: {map_path_3} with all booths: {booth_numbers_3}")
     start_3 = time.time()
-    highlighted_3 = highlight_booths_on_map(image_bytes_3, booth_numbers_3, test_mode=True, debug_name="all_3")
+    highlighted_3 = highlight_booths_on_map(image_bytes_3, booth_numbers_3, test_mode=True)
     end_3 = time.time()
     out_path_3 = os.path.join(os.path.dirname(__file__), f"highlighted_all_3.png")
     highlighted_3.save(out_path_3)
@@ -92,7 +87,7 @@ if __name__ == "__main__":
     # 30-booth: [1,2,8,15,16,14,21]
     recommended_30 = ["1", "2", "8", "15", "16", "14", "21"]
     print(f"Testing map: {map_path_30} with recommended booths: {recommended_30}")
-    highlighted_recommended_30 = highlight_booths_on_map(image_bytes_30, recommended_30, test_mode=True, debug_name="all_30")
+    highlighted_recommended_30 = highlight_booths_on_map(image_bytes_30, recommended_30, test_mode=True)
     out_path_recommended_30 = os.path.join(os.path.dirname(__file__), f"highlighted_recommended_30.png")
     highlighted_recommended_30.save(out_path_recommended_30)
     print(f"Saved highlighted map to {out_path_recommended_30}")
@@ -100,7 +95,7 @@ if __name__ == "__main__":
     # 3-booth: [1,3]
     recommended_3 = ["1", "3"]
     print(f"Testing map: {map_path_3} with recommended booths: {recommended_3}")
-    highlighted_recommended_3 = highlight_booths_on_map(image_bytes_3, recommended_3, test_mode=True, debug_name="all_3")
+    highlighted_recommended_3 = highlight_booths_on_map(image_bytes_3, recommended_3, test_mode=True)
     out_path_recommended_3 = os.path.join(os.path.dirname(__file__), f"highlighted_recommended_3.png")
     highlighted_recommended_3.save(out_path_recommended_3)
     print(f"Saved highlighted map to {out_path_recommended_3}") 
\ No newline at end of file
@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""
+Long-running resume parsing worker.
+
+Spawning enhanced_parser_cli.py once per upload pays for the spaCy start-up on
+every request. This module keeps a pool of processes that each build an
+EnhancedExtractor and EnhancedParser once and then serve jobs until they are
+recycled.
+
+Jobs are JSON objects, one per line:
+
+    {"id": "42", "file_path": "/path/to/resume.pdf"}
+    {"command": "health"}
+
+and every reply is a single JSON line holding the same payload the one-shot CLI
+prints (the parsed resume, or an "error" object), with the request "id" echoed back.
+Jobs can be sent over a local Unix socket (one or more lines per connection) or
+streamed through stdin/stdout.
+"""
+
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from multiprocessing import Pool, TimeoutError as PoolTimeoutError
+from typing import Any, Dict, Optional
+
+from .result_cache import hash_file, open_result_cache
+
+DEFAULT_POOL_SIZE = max(1, (os.cpu_count() or 2) // 2)
+DEFAULT_MAX_JOBS_PER_WORKER = 200
+# Seconds to wait for one job. A pool process that dies mid-job (OOM, a crash in
+# pdfminer/Tesseract) never resolves its AsyncResult, so replies must not wait forever.
+# Keep it below the PHP client's RESUME_PARSER_TIMEOUT (120 s) so the client gets the error reply.
+JOB_TIMEOUT_ENV_VAR = "RESUME_PARSER_JOB_TIMEOUT"
+DEFAULT_JOB_TIMEOUT = 100
+
+# Per-process extractor/parser (and result cache), created once by _init_worker_process
+_extractor = None
+_parser = None
+_cache = None
+
+
+def process_resume_file(file_path: str, extractor, parser, cache=None) -> Dict[str, Any]:
+    """
+    Extract and parse a single resume file.
+
+    Returns the dictionary enhanced_parser_cli.py prints: the parsed resume on
+    success, or a dict with an "error" key (and "traceback" for unexpected errors).
+    With a ResultCache, files already seen (same bytes) skip extraction and/or
+    parsing; errors are never cached.
+    """
+    if not os.path.exists(file_path):
+        return {"error": f"File not found: {file_path}"}
+
+    try:
+        content_hash = None
+        if cache is not None:
+            content_hash = hash_file(file_path)
+            cached_result = cache.get_result(content_hash)
+            if cached_result is not None:
+                return cached_result
+
+        extraction_timings = None
+        text = cache.get_text(content_hash) if cache is not None else None
+        if text is None:
+            text = extractor.extract_from_pdf(file_path)
+
+            if text is None or not text.strip():
+                return {"error": f"Failed to extract text from PDF: {file_path}"}
+
+            if cache is not None:
+                cache.put_text(content_hash, text)
+            extraction_timings = (extractor.last_extraction or {}).get("_timings")
+
+        result = parser.parse(text)
+        if cache is not None:
+            cache.put_result(content_hash, result)
+        if extraction_timings:
+            timings = result.setdefault("_timings", {"stages": {}, "counts": {}})
+            timings["stages"] = {**extraction_timings["stages"], **timings["stages"]}
+            timings["counts"] = {**extraction_timings["counts"], **timings["counts"]}
+        return result
+
+    except Exception as e:
+        return {
+            "error": f"Error processing resume: {str(e)}",
+            "traceback": traceback.format_exc()
+        }
+
+
+def _init_worker_process(cache_path: Optional[str] = None):
+    """Pool initializer: load the extractor and parser (and the spaCy model) once."""
+    global _extractor, _parser, _cache
+
+    # stdout may be the reply channel (stdin mode); keep stray prints off it
+    sys.stdout = sys.stderr
+    # Let the dispatcher handle Ctrl+C and close the pool gracefully
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    from .enhanced_parser import EnhancedParser
+    from .enhanced_extractor import EnhancedExtractor
+    from .nlp_model import get_nlp
+
+    _extractor = EnhancedExtractor(debug=False)
+    _parser = EnhancedParser()
+    # The model is normally loaded on first parse; load it now so the first job isn't slower
+    get_nlp(_parser.spacy_model)
+    # Each process opens its own SQLite connection
+    _cache = open_result_cache(_extractor, _parser, cache_path) if cache_path else None
+
+
+def _run_job(file_path: str) -> Dict[str, Any]:
+    """Executed inside a pool process."""
+    return process_resume_file(file_path, _extractor, _parser, _cache)
+
+
+def _run_timed_job(file_path: str):
+    """Like _run_job, but also returns the seconds spent on the job inside the worker."""
+    started = time.perf_counter()
+    result = process_resume_file(file_path, _extractor, _parser, _cache)
+    return result, time.perf_counter() - started
+
+
+class ParserWorkerPool:
+    """A pool of parsing processes plus the bookkeeping used by the health command."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+                 cache_path: Optional[str] = None, job_timeout: Optional[float] = None):
+        self.pool_size = max(1, int(pool_size))
+        self.cache_path = cache_path
+        self.job_timeout = job_timeout if job_timeout is not None else float(os.getenv(JOB_TIMEOUT_ENV_VAR, DEFAULT_JOB_TIMEOUT))
+        # Pool(maxtasksperchild=...) lets a process finish its current job and then
+        # replaces it with a fresh one, which bounds memory growth in long runs.
+        self.max_jobs_per_worker = max_jobs_per_worker if max_jobs_per_worker and max_jobs_per_worker > 0 else None
+        self.started_at = time.time()
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self._lock = threading.Lock()
+
+        # Build the shared parser taxonomy before forking so pool processes inherit it
+        from .enhanced_parser import get_default_taxonomy
+        get_default_taxonomy()
+
+        self._pool = Pool(
+            processes=self.pool_size,
+            initializer=_init_worker_process,
+            initargs=(cache_path,),
+            maxtasksperchild=self.max_jobs_per_worker
+        )
+
+    def submit(self, file_path: str):
+        """Queue a job; returns an AsyncResult."""
+        return self._pool.apply_async(_run_job, (file_path,))
+
+    def submit_timed(self, file_path: str):
+        """Queue a job whose AsyncResult yields (result, seconds spent in the worker)."""
+        return self._pool.apply_async(_run_timed_job, (file_path,))
+
+    def wait(self, async_result, file_path: str) -> Dict[str, Any]:
+        """Wait up to job_timeout for a submitted job and record its outcome."""
+        try:
+            result = async_result.get(timeout=self.job_timeout)
+        except PoolTimeoutError:
+            result = {"error": f"Timed out after {self.job_timeout:g} seconds processing resume: {file_path}"}
+        self.record(result)
+        return result
+
+    def record(self, result: Dict[str, Any]):
+        with self._lock:
+            if "error" in result:
+                self.jobs_failed += 1
+            else:
+                self.jobs_completed += 1
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "pool_size": self.pool_size,
+                "max_jobs_per_worker": self.max_jobs_per_worker,
+                "job_timeout": self.job_timeout,
+                "cache_path": self.cache_path,
+                "jobs_completed": self.jobs_completed,
+                "jobs_failed": self.jobs_failed,
+                "uptime_seconds": round(time.time() - self.started_at, 3)
+            }
+
+    def close(self):
+        """Stop accepting work, let running jobs finish and wait for the processes."""
+        self._pool.close()
+        self._pool.join()
+
+
+def _decode_request(line: str):
+    """Parse one request line. Returns (request_dict, error_reply)."""
+    try:
+        request = json.loads(line)
+    except ValueError as e:
+        return None, {"error": f"Invalid JSON request: {str(e)}"}
+    if not isinstance(request, dict):
+        return None, {"error": "Invalid request: expected a JSON object"}
+    if request.get("command") not in (None, "health"):
+        return None, {"error": f"Unknown command: {request.get('command')}"}
+    if request.get("command") is None and not request.get("file_path"):
+        return None, {"error": "Invalid request: 'file_path' is required"}
+    return request, None
+
+
+def _with_id(reply: Dict[str, Any], request: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if request and "id" in request:
+        reply = dict(reply)
+        reply["id"] = request["id"]
+    return reply
+
+
+def handle_request_line(pool: ParserWorkerPool, line: str) -> Dict[str, Any]:
+    """Synchronously handle one request line (used by the socket server)."""
+    request, error_reply = _decode_request(line)
+    if error_reply:
+        return error_reply
+    if request.get("command") == "health":
+        return _with_id(pool.health(), request)
+
+    result = pool.wait(pool.submit(request["file_path"]), request["file_path"])
+    return _with_id(result, request)
+
+
+class _SocketRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for raw_line in self.rfile:
+            line = raw_line.decode("utf-8").strip()
+            if not line:
+                continue
+            reply = handle_request_line(self.server.worker_pool, line)
+            self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def serve_socket(pool: ParserWorkerPool, socket_path: str):
+    """Serve requests on a Unix domain socket until interrupted."""
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = _ThreadingUnixServer(socket_path, _SocketRequestHandler)
+    server.worker_pool = pool
+    print(f"Resume parser worker listening on {socket_path} (pool size {pool.pool_size})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+def serve_stdin(pool: ParserWorkerPool, stdin=None, stdout=None):
+    """
+    Read JSON-lines requests from stdin and write replies to stdout in request order.
+
+    Up to two jobs per pool process are kept in flight so the pool stays busy while
+    earlier replies are still being written.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    max_in_flight = pool.pool_size * 2
+    pending = deque()  # (request, async_result or None, immediate_reply or None)
+
+    def flush(block_until: int):
+        while len(pending) > block_until:
+            request, async_result, reply = pending.popleft()
+            if async_result is not None:
+                reply = _with_id(pool.wait(async_result, request["file_path"]), request)
+            stdout.write(json.dumps(reply) + "\n")
+            stdout.flush()
+
+    for raw_line in stdin:
+        line = raw_line.strip()
+        if not line:
+            continue
+        request, error_reply = _decode_request(line)
+        if error_reply:
+            pending.append((None, None, error_reply))
+        elif request.get("command") == "health":
+            pending.append((request, None, _with_id(pool.health(), request)))
+        else:
+            pending.append((request, pool.submit(request["file_path"]), None))
+        flush(max_in_flight)
+
+    flush(0)
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt()
+
+
+def run_worker(socket_path: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+               max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER, cache_path: Optional[str] = None,
+               job_timeout: Optional[float] = None):
+    """Entry point used by `enhanced_parser_cli.py --worker`. cache_path=None disables the result cache."""
+    # Turn SIGTERM into a normal shutdown so the pool is closed and the socket removed
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+    pool = ParserWorkerPool(pool_size=pool_size, max_jobs_per_worker=max_jobs_per_worker, cache_path=cache_path,
+                            job_timeout=job_timeout)
+    try:
+        if socket_path:
+            serve_socket(pool, socket_path)
+        else:
+            serve_stdin(pool)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+On-disk cache for the extract -> parse pipeline.
+
+Resumes are identified by the SHA-256 of the file bytes, so a re-uploaded (or
+reprocessed reference) PDF is served without running pdfminer/OCR or spaCy again.
+Two tables are kept in one SQLite file:
+
+    extracted_text  (content hash, extractor fingerprint)                      -> extracted text
+    parsed_results  (content hash, extractor fingerprint | parser fingerprint) -> parsed JSON
+
+Fingerprints describe the code/vocabulary that produced an entry (see
+EnhancedExtractor.cache_fingerprint() and EnhancedParser.cache_fingerprint()).
+A parsed result depends on the extracted text, so it is keyed by both. Lookups only
+match entries with the current fingerprints: a taxonomy change invalidates parsed
+results while the extracted text is kept, an extractor change invalidates both, and
+processes with different settings can share one file. Each table is bounded and
+evicts its least recently used rows, whatever their fingerprint, so entries nobody
+reads any more age out.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resume_result_cache.sqlite3')
+CACHE_PATH_ENV_VAR = "RESUME_PARSER_CACHE_PATH"
+MAX_ENTRIES_ENV_VAR = "RESUME_PARSER_CACHE_MAX_ENTRIES"
+DEFAULT_MAX_ENTRIES = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extracted_text (
+    content_hash TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS extracted_text_last_used ON extracted_text (last_used);
+CREATE TABLE IF NOT EXISTS parsed_results (
+    content_hash TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS parsed_results_last_used ON parsed_results (last_used);
+"""
+
+_TABLES = ("extracted_text", "parsed_results")
+
+
+def hash_file(file_path: str) -> str:
+    """SHA-256 hex digest of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def default_cache_path() -> str:
+    return os.getenv(CACHE_PATH_ENV_VAR) or DEFAULT_CACHE_PATH
+
+
+class ResultCache:
+    """
+    SQLite-backed LRU cache of extracted text and parsed results.
+
+    Cache failures (locked or unwritable database, corrupt rows) never fail a parse:
+    lookups return None and stores are skipped.
+    """
+
+    def __init__(self, path: Optional[str] = None, extractor_fingerprint: str = "", parser_fingerprint: str = "",
+                 max_entries: Optional[int] = None):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv(MAX_ENTRIES_ENV_VAR, DEFAULT_MAX_ENTRIES))
+        self._fingerprints = {
+            "extracted_text": extractor_fingerprint,
+            "parsed_results": f"{extractor_fingerprint}|{parser_fingerprint}",
+        }
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: autocommit, every statement is its own short transaction
+        self._conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _get(self, table: str, content_hash: str) -> Optional[str]:
+        try:
+            row = self._conn.execute(
+                f"SELECT payload FROM {table} WHERE content_hash = ? AND fingerprint = ?",
+                (content_hash, self._fingerprints[table])
+            ).fetchone()
+            if row is not None:
+                self._conn.execute(
+                    f"UPDATE {table} SET last_used = ? WHERE content_hash = ? AND fingerprint = ?",
+                    (time.time(), content_hash, self._fingerprints[table])
+                )
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+
+    def _put(self, table: str, content_hash: str, payload: str):
+        try:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (content_hash, fingerprint, payload, last_used) VALUES (?, ?, ?, ?)",
+                (content_hash, self._fingerprints[table], payload, time.time())
+            )
+            if self.max_entries and self.max_entries > 0:
+                # Evict least recently used rows beyond the limit
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE rowid IN ("
+                    f"SELECT rowid FROM {table} ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+        except sqlite3.Error:
+            pass
+
+    def get_text(self, content_hash: str) -> Optional[str]:
+        return self._get("extracted_text", content_hash)
+
+    def put_text(self, content_hash: str, text: str):
+        self._put("extracted_text", content_hash, text)
+
+    def get_result(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        payload = self._get("parsed_results", content_hash)
+        result = None
+        if payload is not None:
+            try:
+                result = json.loads(payload)
+            except ValueError:
+                result = None
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put_result(self, content_hash: str, result: Dict[str, Any]):
+        # Timings (see instrumentation.py) describe one run; a cache hit must not replay them
+        if "_timings" in result:
+            result = {key: value for key, value in result.items() if key != "_timings"}
+        self._put("parsed_results", content_hash, json.dumps(result))
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {}
+        try:
+            for table in _TABLES:
+                counts[table] = self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        return {"path": self.path, "hits": self.hits, "misses": self.misses, "max_entries": self.max_entries, **counts}
+
+    def clear(self):
+        for table in _TABLES:
+            self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        self._conn.close()
+
+
+def open_result_cache(extractor, parser, path: Optional[str] = None) -> Optional[ResultCache]:
+    """
+    Open the cache for an extractor/parser pair, or return None if the database
+    cannot be opened (e.g. read-only location); callers then simply run uncached.
+    """
+    try:
+        return ResultCache(
+            path=path,
+            extractor_fingerprint=extractor.cache_fingerprint(),
+            parser_fingerprint=parser.cache_fingerprint()
+        )
+    except (sqlite3.Error, OSError):
+        return None
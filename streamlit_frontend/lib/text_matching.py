@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Keyword matching helpers shared by the resume parser.
+
+KeywordAutomaton is an Aho-Corasick automaton: it reports every occurrence of every
+keyword in a single left-to-right pass, so the cost of scanning a line depends on the
+line length and the number of hits, not on how many keywords the taxonomy holds.
+
+PrefixIndex is the anchored counterpart: a trie that answers "which keywords does this
+line start with" by walking the line once from its first character.
+"""
+
+from collections import deque
+from typing import Any, Iterable, Iterator, List, Tuple
+
+
+def fold_case(text: str) -> str:
+    """
+    Lowercase text without changing its length, so offsets found in the folded text
+    can be used on the original. Characters whose lowercase form is longer than one
+    code point (e.g. 'İ') are kept as-is.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(ch_lower if len(ch_lower) == 1 else ch for ch, ch_lower in ((ch, ch.lower()) for ch in text))
+
+
+def is_word_char(ch: str) -> bool:
+    """Same notion of a word character as the `\\w` regex class."""
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over case-folded keywords.
+
+    Built once from (keyword, value) pairs; iter_matches() then yields
+    (start, end, value) for every occurrence, including overlapping ones.
+    Instances only hold lists, dicts and tuples, so they pickle cheaply.
+    """
+
+    def __init__(self, keywords: Iterable[Tuple[str, Any]]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+
+        for keyword, value in keywords:
+            folded_keyword = fold_case(keyword)
+            if not folded_keyword:
+                continue
+            node = 0
+            for ch in folded_keyword:
+                next_node = self._goto[node].get(ch)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][ch] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                node = next_node
+            self._out[node] = self._out[node] + ((len(folded_keyword), value),)
+
+        # Breadth-first pass to set failure links; each node's outputs are extended
+        # with those of its failure node so matching never has to walk the chain.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def __len__(self):
+        return len(self._goto)
+
+    def iter_matches(self, folded_text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yield (start, end, value) for every keyword occurrence in folded_text.
+        The text must already be case-folded with fold_case().
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        node = 0
+        for index, ch in enumerate(folded_text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                end = index + 1
+                for length, value in out[node]:
+                    yield end - length, end, value
+
+
+class PrefixIndex:
+    """
+    Trie over case-folded keywords for anchored (start-of-text) lookups.
+
+    Built once from (keyword, value) pairs. When several keywords fold to the same
+    string, the first one added wins. prefixes() walks the text once, so a lookup
+    costs at most len(text) steps regardless of how many keywords are indexed.
+    """
+
+    _END = ''  # never a real character key, marks the value of a complete keyword
+
+    def __init__(self, keywords: Iterable[Tuple[str, Any]]):
+        self._root = {}
+        self._size = 0
+        for keyword, value in keywords:
+            folded_keyword = fold_case(keyword)
+            if not folded_keyword:
+                continue
+            node = self._root
+            for ch in folded_keyword:
+                node = node.setdefault(ch, {})
+            if self._END not in node:
+                node[self._END] = value
+                self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def prefixes(self, folded_text: str) -> List[Tuple[int, Any]]:
+        """
+        Return (length, value) for every keyword the text starts with, longest first.
+        The text must already be case-folded with fold_case().
+        """
+        found = []
+        node = self._root
+        for index, ch in enumerate(folded_text):
+            node = node.get(ch)
+            if node is None:
+                break
+            if self._END in node:
+                found.append((index + 1, node[self._END]))
+        found.reverse()
+        return found
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+"""
+Structured tracing for the extract -> parse -> booth OCR pipeline.
+
+Each component ("parser", "extractor", "ocr") has a Tracer. A record has a level,
+a stage (sections, education, experience, skills, pdfminer, layout, ...) and a
+%-style message whose arguments are only formatted if the record is emitted:
+
+    trace = get_tracer("parser", debug=self.debug)
+    if trace.debug_enabled:
+        trace.debug("experience", "Set title %r from line %d", title, line_index)
+
+The guard is a plain attribute read, so disabled tracing costs about what the old
+`if self.debug:` did, and it can stay on in production at info/warning level.
+
+Records never go to stdout (the CLIs write their JSON there). By default they are
+handed to the `resume_parser.<component>` logger; if the application has not
+configured logging, a stderr handler is installed on first use. They can instead
+be kept in an in-memory ring buffer (get_trace_buffer()).
+
+    RESUME_PARSER_TRACE_LEVEL   debug | info | warning (default) | error | off
+    RESUME_PARSER_TRACE_SAMPLE  keep 1 in N debug/info records per stage, given as
+                                rates, e.g. "experience=0.01,skills=0.1,*=0.5"
+    RESUME_PARSER_TRACE_SINK    logging (default) | ring
+    RESUME_PARSER_TRACE_BUFFER  ring buffer capacity (default 10000)
+
+debug=True on a component puts its tracer at debug level whatever the env says.
+Warnings and errors are never sampled out.
+"""
+
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+DEBUG = logging.DEBUG
+INFO = logging.INFO
+WARNING = logging.WARNING
+ERROR = logging.ERROR
+OFF = logging.CRITICAL + 10
+
+LEVEL_ENV_VAR = "RESUME_PARSER_TRACE_LEVEL"
+SAMPLE_ENV_VAR = "RESUME_PARSER_TRACE_SAMPLE"
+SINK_ENV_VAR = "RESUME_PARSER_TRACE_SINK"
+BUFFER_ENV_VAR = "RESUME_PARSER_TRACE_BUFFER"
+DEFAULT_BUFFER_SIZE = 10000
+LOGGER_NAME = "resume_parser"
+
+_LEVEL_NAMES = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+
+
+def parse_level(value, default=WARNING) -> int:
+    if value is None or value == "":
+        return default
+    if isinstance(value, int):
+        return value
+    return _LEVEL_NAMES.get(str(value).strip().lower(), default)
+
+
+def parse_sample(spec: Optional[str]) -> Dict[str, int]:
+    """'experience=0.01,*=0.5' -> {stage: keep every Nth record} (0 = drop all)."""
+    sample = {}
+    for item in (spec or "").split(","):
+        stage, _, rate = item.partition("=")
+        try:
+            rate = float(rate)
+        except ValueError:
+            continue
+        sample[stage.strip()] = 0 if rate <= 0 else max(1, round(1 / min(rate, 1.0)))
+    return sample
+
+
+def _format_message(message: str, args) -> str:
+    if not args:
+        return message
+    try:
+        return message % args
+    except (TypeError, ValueError):
+        return f"{message} {args!r}"
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to whatever sys.stderr is at the time of each record."""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class LoggingSink:
+    """Hands records to the `resume_parser.<component>` loggers."""
+
+    def __init__(self):
+        self._handler_checked = False
+
+    def _ensure_handler(self):
+        # Tracers decide levels themselves; without any handler configured, debug
+        # records would be dropped by logging's last-resort (warning) handler
+        self._handler_checked = True
+        base_logger = logging.getLogger(LOGGER_NAME)
+        if not base_logger.handlers and not logging.getLogger().handlers:
+            handler = _StderrHandler()
+            handler.setFormatter(logging.Formatter("%(name)s %(levelname)s %(message)s"))
+            base_logger.addHandler(handler)
+
+    def emit(self, component: str, level: int, stage: str, message: str, args, exc_info=None):
+        if not self._handler_checked:
+            self._ensure_handler()
+        logger = logging.getLogger(f"{LOGGER_NAME}.{component}")
+        # makeRecord + handle bypasses the logger level: the tracer already filtered
+        record = logger.makeRecord(logger.name, level, "(tracing)", 0, f"[{stage}] {message}", args,
+                                   sys.exc_info() if exc_info else None,
+                                   extra={"trace_component": component, "trace_stage": stage})
+        logger.handle(record)
+
+
+class RingBufferSink:
+    """Keeps the most recent records in memory (formatted when they are added)."""
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE):
+        self._records = deque(maxlen=max(1, int(capacity)))
+
+    def emit(self, component: str, level: int, stage: str, message: str, args, exc_info=None):
+        record = {
+            "time": time.time(),
+            "component": component,
+            "level": logging.getLevelName(level).lower(),
+            "stage": stage,
+            "message": _format_message(message, args)
+        }
+        if exc_info:
+            record["traceback"] = traceback.format_exc()
+        self._records.append(record)
+
+    def records(self, component: Optional[str] = None, stage: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [record for record in list(self._records)
+                if (component is None or record["component"] == component)
+                and (stage is None or record["stage"] == stage)]
+
+    def clear(self):
+        self._records.clear()
+
+
+class Tracer:
+    """Level- and sample-filtered records for one component."""
+
+    def __init__(self, component: str, level: int, sample: Dict[str, int], sink):
+        self.component = component
+        self._counters = {}  # stage -> itertools.count, for sampling
+        self.configure(level, sample, sink)
+
+    def configure(self, level: int, sample: Dict[str, int], sink):
+        self.level = level
+        self.sample = sample
+        self.sink = sink
+        # Plain attributes so call sites can guard without a method call
+        self.debug_enabled = level <= DEBUG
+        self.info_enabled = level <= INFO
+
+    def enabled_for(self, level: int) -> bool:
+        return level >= self.level
+
+    def _sampled_out(self, stage: str) -> bool:
+        every = self.sample.get(stage, self.sample.get("*", 1))
+        if every == 1:
+            return False
+        if every == 0:
+            return True
+        counter = self._counters.get(stage)
+        if counter is None:
+            counter = self._counters.setdefault(stage, itertools.count())
+        return next(counter) % every != 0
+
+    def log(self, level: int, stage: str, message: str, *args, exc_info=False):
+        if level < self.level:
+            return
+        if level < WARNING and self.sample and self._sampled_out(stage):
+            return
+        self.sink.emit(self.component, level, stage, message, args, exc_info)
+
+    def debug(self, stage: str, message: str, *args):
+        if self.debug_enabled:
+            self.log(DEBUG, stage, message, *args)
+
+    def info(self, stage: str, message: str, *args):
+        if self.info_enabled:
+            self.log(INFO, stage, message, *args)
+
+    def warning(self, stage: str, message: str, *args, exc_info=False):
+        self.log(WARNING, stage, message, *args, exc_info=exc_info)
+
+    def error(self, stage: str, message: str, *args, exc_info=False):
+        self.log(ERROR, stage, message, *args, exc_info=exc_info)
+
+
+_lock = threading.Lock()
+_tracers = {}  # (component, debug) -> Tracer
+_settings = None  # (level, sample, sink), from the env until configure() is called
+_ring_buffer = None
+
+
+def get_trace_buffer() -> RingBufferSink:
+    """The process-wide ring buffer (records only arrive when it is the configured sink)."""
+    global _ring_buffer
+    with _lock:
+        if _ring_buffer is None:
+            capacity = os.getenv(BUFFER_ENV_VAR)
+            _ring_buffer = RingBufferSink(int(capacity) if capacity and capacity.isdigit() else DEFAULT_BUFFER_SIZE)
+        return _ring_buffer
+
+
+def _make_sink(name: Optional[str]):
+    if (name or "").strip().lower() == "ring":
+        return get_trace_buffer()
+    return LoggingSink()
+
+
+def _current_settings():
+    global _settings
+    if _settings is None:
+        _settings = (parse_level(os.getenv(LEVEL_ENV_VAR)), parse_sample(os.getenv(SAMPLE_ENV_VAR)),
+                     _make_sink(os.getenv(SINK_ENV_VAR)))
+    return _settings
+
+
+def configure(level=None, sample: Optional[str] = None, sink: Optional[str] = None):
+    """
+    Change tracing settings at runtime (None keeps the env/default value) and apply
+    them to every existing tracer.
+    """
+    global _settings
+    env_level, env_sample, env_sink = _current_settings()
+    new_settings = (
+        parse_level(level, env_level) if level is not None else env_level,
+        parse_sample(sample) if sample is not None else env_sample,
+        _make_sink(sink) if sink is not None else env_sink
+    )
+    with _lock:
+        _settings = new_settings
+        for (component, debug), tracer in _tracers.items():
+            tracer.configure(DEBUG if debug else new_settings[0], new_settings[1], new_settings[2])
+
+
+def get_tracer(component: str, debug: bool = False) -> Tracer:
+    """Shared tracer for a component; debug=True forces debug level."""
+    key = (component, bool(debug))
+    tracer = _tracers.get(key)
+    if tracer is not None:
+        return tracer
+    level, sample, sink = _current_settings()
+    with _lock:
+        tracer = _tracers.get(key)
+        if tracer is None:
+            tracer = Tracer(component, DEBUG if debug else level, sample, sink)
+            _tracers[key] = tracer
+    return tracer
@@ -84,6 +84,16 @@ def get_organizer_auth_headers(): # Renamed to be specific
         return None
     return {'Authorization': f"Bearer {st.session_state.user_token}", 'Accept': 'application/json'}
 
+def index_uploaded_map(uploaded_map):
+    """Build the booth index for a newly uploaded map so attendees never wait for OCR."""
+    try:
+        from lib.ocr_utils import index_booth_map
+        with st.spinner("Indexing booth numbers on the map..."):
+            booths = index_booth_map(uploaded_map.getvalue())
+        st.info(f"Indexed {len(booths)} booths on the map.")
+    except Exception as e_index: # Indexing is an optimisation; recommendations fall back to on-demand OCR
+        st.warning(f"Could not index booth numbers on the map: {e_index}")
+
 def fetch_job_fairs():
     headers = get_organizer_auth_headers()
     if not headers:
@@ -183,6 +193,8 @@ else:
                             response.raise_for_status() # Check for HTTP errors
                             created_fair_data = response.json() # Get the created job fair data
                             st.success(f"Job Fair '{created_fair_data.get('title', nf_title)}' created successfully!")
+                            if nf_map_image is not None:
+                                index_uploaded_map(nf_map_image)
                             
                             # Display geocoded information if available
                             if created_fair_data.get('formatted_address'):
@@ -403,6 +415,8 @@ else:
                                 response.raise_for_status()
                                 updated_fair_data = response.json()
                                 st.success(f"Job Fair '{updated_fair_data.get('title', edit_title)}' updated successfully!")
+                                if edit_map_image:
+                                    index_uploaded_map(edit_map_image)
                                 
                                 # Display geocoded information if available
                                 if updated_fair_data.get('formatted_address'):
@@ -3,13 +3,30 @@ from lib import api
 from lib.auth_client import require_auth
 from lib.navigation import display_sidebar_navigation
 from datetime import datetime # Import datetime
-from lib.ocr_utils import highlight_booths_on_map # Import OCR utils
-from PIL import Image # For checking if an image is returned
+from lib.ocr_utils import highlighted_map_png, is_indexing # Import OCR utils
 import requests # For Geoapify directions API call
 import folium # For interactive route map
 from streamlit_folium import st_folium # For interactive route map
 from streamlit_geolocation import streamlit_geolocation # UPDATED IMPORT
-from io import BytesIO
+
+# How long the recommendations tab waits for a map that has not been indexed yet
+BOOTH_HIGHLIGHT_TIMEOUT_SECONDS = 10
+
+
+@st.cache_data(ttl=600, max_entries=32, show_spinner=False)
+def _download_map_image(map_url):
+    response = requests.get(map_url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+
+def fetch_map_image_bytes(map_url):
+    """Download a job fair map once; widget reruns of the tab reuse the bytes (failures are retried)."""
+    try:
+        return _download_map_image(map_url)
+    except Exception:
+        return None
+
 
 st.markdown(
     """
@@ -568,25 +585,17 @@ def display_job_fair_page(): # Renamed function for clarity
                             for booth_rec in recommendations_data.get('recommended_booths', [])
                             if booth_rec.get('booth_number_on_map')
                         ]
-                        # --- Determine which cache to use based on booth count or map filename ---
-                        debug_name = None
-                        if 'jobfairmap2' in (original_map_url_for_rec_tab or '').lower() or len(recommended_booth_numbers_for_ocr) <= 3:
-                            debug_name = 'all_3'
-                        else:
-                            debug_name = 'all_30'
                         if recommended_booth_numbers_for_ocr:
                             st.caption("Attempting to highlight recommended booths on the map...")
-                            try:
-                                response = requests.get(absolute_ocr_map_url, timeout=10)
-                                response.raise_for_status()
-                                image_bytes = response.content
-                            except Exception as e:
-                                image_bytes = None
+                            image_bytes = fetch_map_image_bytes(absolute_ocr_map_url)
                             if image_bytes:
-                                image_bytes_io = BytesIO(image_bytes)
-                                highlighted_image = highlight_booths_on_map(image_bytes_io, recommended_booth_numbers_for_ocr, debug_name=debug_name)
-                                if highlighted_image and isinstance(highlighted_image, Image.Image):
-                                    map_image_to_display = highlighted_image
+                                # Don't hold the page on a first-time OCR scan of this map; it finishes in the background
+                                highlighted_png = highlighted_map_png(image_bytes, recommended_booth_numbers_for_ocr, timeout=BOOTH_HIGHLIGHT_TIMEOUT_SECONDS)
+                                if highlighted_png:
+                                    map_image_to_display = highlighted_png
+                                elif is_indexing(image_bytes):
+                                    st.info("Booth numbers on this map are still being indexed. Showing the original map for now; reload shortly to see your booths highlighted.")
+                                    map_image_to_display = absolute_ocr_map_url
                                 else: 
                                     st.warning("Could not highlight booths. Displaying original map.")
                                     map_image_to_display = absolute_ocr_map_url
@@ -599,8 +608,8 @@ def display_job_fair_page(): # Renamed function for clarity
                     if map_image_to_display:
                         if isinstance(map_image_to_display, str): # It's a URL
                              st.image(map_image_to_display, caption=f"Map for {recommendations_data.get('job_fair_title', selected_fair_details.get('title', 'Job Fair'))}", use_container_width=True)
-                        elif isinstance(map_image_to_display, Image.Image): # It's a PIL Image
-                             st.image(map_image_to_display, caption=f"Highlighted Map for {recommendations_data.get('job_fair_title', selected_fair_details.get('title', 'Job Fair'))}", use_container_width=True, channels="BGR")
+                        elif isinstance(map_image_to_display, bytes): # Highlighted map as PNG bytes
+                             st.image(map_image_to_display, caption=f"Highlighted Map for {recommendations_data.get('job_fair_title', selected_fair_details.get('title', 'Job Fair'))}", use_container_width=True)
                     else:
                         st.info("No map image available for this job fair to display with recommendations.")
                     st.markdown("---") # Separator after map
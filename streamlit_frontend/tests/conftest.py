@@ -0,0 +1,11 @@
+import os
+import sys
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB_DIR = os.path.join(FRONTEND_DIR, "lib")
+
+# lib modules are imported top-level (as the parser worker and CLIs do); the batch
+# CLI is imported from the streamlit_frontend directory
+for path in (LIB_DIR, FRONTEND_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
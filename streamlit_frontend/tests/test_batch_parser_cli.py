@@ -0,0 +1,123 @@
+"""batch_parser_cli.run_batch: record order, errors and checkpoint resume."""
+import io
+import json
+import os
+
+from batch_parser_cli import iter_input_files, load_checkpoint, percentile, run_batch
+
+
+class FakeAsyncResult:
+    def __init__(self, pool, file_path):
+        self._pool = pool
+        self._file_path = file_path
+
+    def get(self):
+        # Later files finish first, so ordering has to come from run_batch itself
+        self._pool.finished.append(self._file_path)
+        if self._file_path.endswith("crash.pdf"):
+            raise RuntimeError("worker died")
+        if self._file_path.endswith("bad.pdf"):
+            return {"error": f"Failed to extract text from PDF: {self._file_path}"}, 0.01
+        return {"file": os.path.basename(self._file_path)}, 0.05
+
+
+class FakePool:
+    """Stands in for ParserWorkerPool (submit_timed/record/pool_size)."""
+
+    def __init__(self, pool_size=2):
+        self.pool_size = pool_size
+        self.submitted = []
+        self.finished = []
+        self.recorded = []
+
+    def submit_timed(self, file_path):
+        self.submitted.append(file_path)
+        return FakeAsyncResult(self, file_path)
+
+    def record(self, result):
+        self.recorded.append(result)
+
+
+def read_records(output):
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_records_follow_input_order_and_errors_do_not_stop_the_run():
+    files = ["a.pdf", "bad.pdf", "b.pdf", "crash.pdf", "c.pdf"]
+    output = io.StringIO()
+    summary = run_batch(files, FakePool(), output, max_in_flight=2)
+
+    records = read_records(output)
+    assert [record["file_path"] for record in records] == files
+    assert [record["status"] for record in records] == ["ok", "error", "ok", "error", "ok"]
+    assert records[0]["result"] == {"file": "a.pdf"}
+    assert "worker died" in records[3]["error"]
+    assert summary["files"] == 5
+    assert summary["ok"] == 3
+    assert summary["errors"] == 2
+    assert summary["skipped"] == 0
+
+
+def test_in_flight_files_are_bounded():
+    pool = FakePool()
+    outstanding = []
+    original_submit = pool.submit_timed
+
+    def submit_timed(file_path):
+        outstanding.append(len(pool.submitted) - len(pool.finished))
+        return original_submit(file_path)
+
+    pool.submit_timed = submit_timed
+    run_batch([f"{i}.pdf" for i in range(10)], pool, io.StringIO(), max_in_flight=3)
+    assert max(outstanding) < 3
+
+
+def test_checkpoint_resume_skips_finished_files(tmp_path):
+    files = [str(tmp_path / name) for name in ("a.pdf", "b.pdf", "c.pdf", "d.pdf")]
+    checkpoint_path = str(tmp_path / "progress.txt")
+
+    # First run is interrupted after two files
+    with open(checkpoint_path, "w", encoding="utf-8") as checkpoint:
+        first_output = io.StringIO()
+        run_batch(files[:2], FakePool(), first_output, checkpoint)
+    done = load_checkpoint(checkpoint_path)
+    assert done == {os.path.abspath(path) for path in files[:2]}
+
+    pool = FakePool()
+    with open(checkpoint_path, "a", encoding="utf-8") as checkpoint:
+        second_output = io.StringIO()
+        summary = run_batch(files, pool, second_output, checkpoint, done=done)
+
+    assert pool.submitted == files[2:]
+    assert [record["file_path"] for record in read_records(second_output)] == files[2:]
+    assert summary["skipped"] == 2
+    assert load_checkpoint(checkpoint_path) == {os.path.abspath(path) for path in files}
+
+
+def test_load_checkpoint_without_file():
+    assert load_checkpoint(None) == set()
+    assert load_checkpoint("/nonexistent/progress.txt") == set()
+
+
+def test_iter_input_files_expands_directories_globs_and_stdin(tmp_path):
+    (tmp_path / "sub").mkdir()
+    for name in ("b.pdf", "a.PDF", "notes.txt", "sub/c.pdf"):
+        (tmp_path / name).write_bytes(b"%PDF")
+    directory = str(tmp_path)
+
+    from_directory = list(iter_input_files([directory]))
+    assert [os.path.relpath(path, directory) for path in from_directory] == ["a.PDF", "b.pdf", os.path.join("sub", "c.pdf")]
+
+    # Duplicates (directory + glob + plain path) are yielded once
+    combined = list(iter_input_files([directory, os.path.join(directory, "*.pdf"), os.path.join(directory, "b.pdf")]))
+    assert len(combined) == 3
+
+    from_stdin = list(iter_input_files([], stdin=io.StringIO(f"{directory}/b.pdf\n\nmissing.pdf\n")))
+    assert from_stdin == [f"{directory}/b.pdf", "missing.pdf"]
+
+
+def test_percentile_nearest_rank():
+    values = sorted([0.1, 0.2, 0.3, 0.4, 1.0])
+    assert percentile(values, 50) == 0.3
+    assert percentile(values, 95) == 1.0
+    assert percentile([], 50) == 0.0
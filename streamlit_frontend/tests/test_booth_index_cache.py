@@ -0,0 +1,45 @@
+"""BoothIndexCache: fingerprints and LRU eviction."""
+import time
+
+import pytest
+
+from booth_index_cache import BoothIndexCache
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "booth_index.sqlite3")
+
+
+def test_round_trip_and_counts(index_path):
+    cache = BoothIndexCache(path=index_path, fingerprint="detector-1")
+    assert cache.get("map") is None
+    cache.put("map", {"A12": [10, 20, 30, 40]}, complete=False)
+    assert cache.get("map") == ({"A12": [10, 20, 30, 40]}, False)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_other_fingerprints_are_kept_but_not_served(index_path):
+    old = BoothIndexCache(path=index_path, fingerprint="detector-1")
+    old.put("map", {"A12": [10, 20, 30, 40]})
+    new = BoothIndexCache(path=index_path, fingerprint="detector-2")
+    assert new.get("map") is None
+    new.put("map", {"A12": [11, 21, 30, 40]})
+    # Opening the store with another fingerprint must not erase the first process's index
+    assert BoothIndexCache(path=index_path, fingerprint="detector-1").get("map") == ({"A12": [10, 20, 30, 40]}, True)
+    assert new.stats()["entries"] == 2
+
+
+def test_least_recently_used_index_is_evicted(index_path):
+    cache = BoothIndexCache(path=index_path, fingerprint="detector-1", max_entries=2)
+    cache.put("a", {"1": [0, 0, 1, 1]})
+    time.sleep(0.01)
+    cache.put("b", {"2": [0, 0, 1, 1]})
+    time.sleep(0.01)
+    assert cache.get("a") is not None  # a is now more recent than b
+    time.sleep(0.01)
+    cache.put("c", {"3": [0, 0, 1, 1]})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["entries"] == 2
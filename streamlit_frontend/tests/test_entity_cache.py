@@ -0,0 +1,73 @@
+"""EntityCache: LRU behaviour and persistence."""
+from entity_table import Entity, EntityCache, LineEntities
+
+
+def entities(text, label="ORG"):
+    return LineEntities((Entity(text, label, 0, len(text)),), 0)
+
+
+def test_lookups_use_stripped_line_text():
+    cache = EntityCache(max_size=10)
+    cache.put("  Universiti Malaya ", entities("Universiti Malaya"))
+    assert cache.get("Universiti Malaya") == entities("Universiti Malaya")
+    assert cache.get("universiti malaya") is None  # NER is case-sensitive
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = EntityCache(max_size=2)
+    cache.put("a", entities("a"))
+    cache.put("b", entities("b"))
+    cache.get("a")
+    cache.put("c", entities("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") == entities("a")
+    assert cache.get("c") == entities("c")
+    assert len(cache) == 2
+
+
+def test_size_zero_disables_caching():
+    cache = EntityCache(max_size=0)
+    cache.put("a", entities("a"))
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_save_and_reload(tmp_path):
+    path = str(tmp_path / "entities.json")
+    cache = EntityCache(max_size=10, persist_path=path, model_name="en_core_web_sm")
+    cache.put("Petronas, Kuala Lumpur", LineEntities(
+        (Entity("Petronas", "ORG", 0, 8), Entity("Kuala Lumpur", "GPE", 10, 22)), 1))
+    cache.put("Universiti Malaya", entities("Universiti Malaya"))
+    cache.save()
+
+    reloaded = EntityCache(max_size=10, persist_path=path, model_name="en_core_web_sm")
+    assert reloaded.get("Petronas, Kuala Lumpur") == LineEntities(
+        (Entity("Petronas", "ORG", 0, 8), Entity("Kuala Lumpur", "GPE", 10, 22)), 1)
+    assert reloaded.get("Universiti Malaya").texts("ORG") == ["Universiti Malaya"]
+
+
+def test_reload_keeps_most_recent_entries_within_size(tmp_path):
+    path = str(tmp_path / "entities.json")
+    cache = EntityCache(max_size=10, persist_path=path, model_name="m")
+    for name in ("a", "b", "c"):
+        cache.put(name, entities(name))
+    cache.save()
+    reloaded = EntityCache(max_size=2, persist_path=path, model_name="m")
+    assert reloaded.get("a") is None
+    assert reloaded.get("c") == entities("c")
+
+
+def test_file_from_another_model_is_ignored(tmp_path):
+    path = str(tmp_path / "entities.json")
+    cache = EntityCache(max_size=10, persist_path=path, model_name="en_core_web_sm")
+    cache.put("a", entities("a"))
+    cache.save()
+    assert len(EntityCache(max_size=10, persist_path=path, model_name="en_core_web_lg")) == 0
+
+
+def test_unreadable_file_is_ignored(tmp_path):
+    path = tmp_path / "entities.json"
+    path.write_text("{not json")
+    assert len(EntityCache(max_size=10, persist_path=str(path), model_name="m")) == 0
@@ -0,0 +1,68 @@
+"""parser_worker: replies when a pool process dies mid-job."""
+import io
+import json
+import os
+import threading
+import time
+from multiprocessing import Pool
+
+import pytest
+
+from lib.parser_worker import ParserWorkerPool, handle_request_line, serve_stdin
+
+
+def _fake_job(file_path):
+    if file_path.endswith("crash.pdf"):
+        os._exit(1)  # like an OOM kill or a segfault in pdfminer/Tesseract
+    return {"file": os.path.basename(file_path)}
+
+
+class FakeJobPool(ParserWorkerPool):
+    """ParserWorkerPool bookkeeping around a plain Pool, without loading the parser."""
+
+    def __init__(self, job_timeout):
+        self.pool_size = 2
+        self.max_jobs_per_worker = None
+        self.cache_path = None
+        self.job_timeout = job_timeout
+        self.started_at = time.time()
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self._lock = threading.Lock()
+        self._pool = Pool(processes=self.pool_size)
+
+    def submit(self, file_path):
+        return self._pool.apply_async(_fake_job, (file_path,))
+
+    def close(self):
+        self._pool.terminate()
+        self._pool.join()
+
+
+@pytest.fixture
+def pool():
+    pool = FakeJobPool(job_timeout=2)
+    yield pool
+    pool.close()
+
+
+def test_dead_worker_gets_an_error_reply(pool):
+    started = time.monotonic()
+    reply = handle_request_line(pool, json.dumps({"id": "7", "file_path": "/tmp/crash.pdf"}))
+    assert time.monotonic() - started < 10
+    assert reply["id"] == "7"
+    assert "Timed out after 2 seconds" in reply["error"]
+    assert pool.health()["jobs_failed"] == 1
+
+    # The pool replaces the dead process and keeps serving
+    assert handle_request_line(pool, json.dumps({"file_path": "/tmp/ok.pdf"})) == {"file": "ok.pdf"}
+
+
+def test_stdin_mode_replies_in_order_past_a_dead_worker(pool):
+    requests = "".join(json.dumps({"id": name, "file_path": f"/tmp/{name}.pdf"}) + "\n" for name in ("a", "crash", "b"))
+    stdout = io.StringIO()
+    serve_stdin(pool, stdin=io.StringIO(requests), stdout=stdout)
+    replies = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    assert [reply["id"] for reply in replies] == ["a", "crash", "b"]
+    assert "error" in replies[1]
+    assert replies[2]["file"] == "b.pdf"
@@ -0,0 +1,53 @@
+"""Primary field scoring: one automaton pass against the per-keyword regexes it replaced."""
+import random
+import re
+
+import pytest
+
+from enhanced_parser import EnhancedParser
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return EnhancedParser()
+
+
+def old_score_fields(parser, text):
+    """Per-keyword regex counts, with the word boundary the old pattern meant to assert."""
+    scores = {field: 0 for field in parser.industry_keywords}
+    normalized_text = re.sub(r"\s+", " ", text).strip()
+    for field, keywords in parser.industry_keywords.items():
+        for keyword in keywords:
+            pattern = r"(?<!\w)" + re.escape(keyword) + r"(?!\w)"
+            scores[field] += len(re.findall(pattern, normalized_text, re.IGNORECASE))
+    return scores
+
+
+def test_keywords_inside_longer_words_do_not_count(parser):
+    field, keywords = next((field, keywords) for field, keywords in parser.industry_keywords.items() if keywords)
+    keyword = next(keyword for keyword in keywords if keyword[-1].isalnum())
+    scores = parser.score_fields(f"{keyword}xyz and x{keyword}")
+    assert scores == old_score_fields(parser, f"{keyword}xyz and x{keyword}")
+    assert parser.score_fields(f"{keyword.upper()}, {keyword}.")[field] >= 2
+
+
+def test_scores_match_old_regexes_on_generated_text(parser):
+    keywords = sorted({keyword for field_keywords in parser.industry_keywords.values() for keyword in field_keywords})
+    rng = random.Random(5)
+    separators = [" ", ", ", "\n", " and ", ". ", " / "]
+    for _ in range(100):
+        text = "".join(rng.choice(keywords) + rng.choice(separators) for _ in range(rng.randint(1, 8)))
+        assert parser.score_fields(text) == old_score_fields(parser, text), text
+
+
+def test_classification_reports_scores_and_confidence(parser):
+    field, keywords = max(parser.industry_keywords.items(), key=lambda item: len(item[1]))
+    classification = parser.classify_field(" ".join(keywords))
+    assert classification["primary_field"] == field
+    assert classification["scores"] == parser.score_fields(" ".join(keywords))
+    assert 0 < classification["confidence"] <= 1
+    assert parser.classify_field("nothing relevant here") == {
+        "primary_field": "auto",
+        "scores": {name: 0 for name in parser.industry_keywords},
+        "confidence": 0.0,
+    }
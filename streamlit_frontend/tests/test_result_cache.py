@@ -0,0 +1,106 @@
+"""ResultCache: hits, misses, fingerprints and LRU eviction."""
+import sqlite3
+import time
+
+import pytest
+
+from result_cache import ResultCache, hash_file, open_result_cache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "results.sqlite3")
+
+
+def test_result_hit_and_miss_counts(cache_path):
+    cache = ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p1")
+    assert cache.get_result("abc") is None
+    cache.put_result("abc", {"skills": {"general_skills": ["Python"]}})
+    assert cache.get_result("abc") == {"skills": {"general_skills": ["Python"]}}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_text_round_trip(cache_path):
+    cache = ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p1")
+    assert cache.get_text("abc") is None
+    cache.put_text("abc", "John Doe\nSKILLS")
+    assert cache.get_text("abc") == "John Doe\nSKILLS"
+
+
+def test_timings_are_not_cached(cache_path):
+    cache = ResultCache(path=cache_path, parser_fingerprint="p1")
+    result = {"summary": "", "_timings": {"stages": {}, "counts": {}}}
+    cache.put_result("abc", result)
+    assert cache.get_result("abc") == {"summary": ""}
+    assert "_timings" in result
+
+
+def test_other_fingerprint_is_a_miss(cache_path):
+    ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p1").put_result("abc", {"v": 1})
+    other = ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p2")
+    assert other.get_result("abc") is None
+    other.put_result("abc", {"v": 2})
+    assert other.get_result("abc") == {"v": 2}
+
+
+def test_extractor_change_is_a_parsed_result_miss(cache_path):
+    old = ResultCache(path=cache_path, extractor_fingerprint="extractor-1", parser_fingerprint="p1")
+    old.put_text("abc", "text from the old extractor")
+    old.put_result("abc", {"v": 1})
+    new = ResultCache(path=cache_path, extractor_fingerprint="extractor-2", parser_fingerprint="p1")
+    assert new.get_text("abc") is None
+    assert new.get_result("abc") is None
+
+
+def test_extractor_version_bump_invalidates_parsed_results(cache_path, monkeypatch):
+    enhanced_extractor = pytest.importorskip("enhanced_extractor")
+    from enhanced_parser import EnhancedParser
+
+    extractor, parser = enhanced_extractor.EnhancedExtractor(), EnhancedParser()
+    open_result_cache(extractor, parser, cache_path).put_result("abc", {"v": 1})
+    monkeypatch.setattr(enhanced_extractor, "EXTRACTOR_VERSION", enhanced_extractor.EXTRACTOR_VERSION + "-next")
+    assert open_result_cache(extractor, parser, cache_path).get_result("abc") is None
+
+
+def test_opening_with_another_fingerprint_keeps_existing_entries(cache_path):
+    first = ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p1")
+    first.put_text("abc", "text one")
+    first.put_result("abc", {"v": 1})
+    ResultCache(path=cache_path, extractor_fingerprint="x2", parser_fingerprint="p2")
+    reopened = ResultCache(path=cache_path, extractor_fingerprint="x1", parser_fingerprint="p1")
+    assert reopened.get_text("abc") == "text one"
+    assert reopened.get_result("abc") == {"v": 1}
+
+
+def test_least_recently_used_entry_is_evicted(cache_path):
+    cache = ResultCache(path=cache_path, parser_fingerprint="p1", max_entries=2)
+    cache.put_result("a", {"v": "a"})
+    time.sleep(0.01)
+    cache.put_result("b", {"v": "b"})
+    time.sleep(0.01)
+    assert cache.get_result("a") == {"v": "a"}  # a is now more recent than b
+    time.sleep(0.01)
+    cache.put_result("c", {"v": "c"})
+    assert cache.get_result("b") is None
+    assert cache.get_result("a") == {"v": "a"}
+    assert cache.get_result("c") == {"v": "c"}
+    assert cache.stats()["parsed_results"] == 2
+
+
+def test_corrupt_payload_is_a_miss(cache_path):
+    cache = ResultCache(path=cache_path, parser_fingerprint="p1")
+    cache.put_result("abc", {"v": 1})
+    connection = sqlite3.connect(cache_path)
+    connection.execute("UPDATE parsed_results SET payload = 'not json'")
+    connection.commit()
+    connection.close()
+    assert cache.get_result("abc") is None
+    assert cache.misses == 1
+
+
+def test_hash_file_depends_on_content_only(tmp_path):
+    first, second, third = tmp_path / "a.pdf", tmp_path / "b.pdf", tmp_path / "c.pdf"
+    first.write_bytes(b"%PDF-1.4 same")
+    second.write_bytes(b"%PDF-1.4 same")
+    third.write_bytes(b"%PDF-1.4 other")
+    assert hash_file(str(first)) == hash_file(str(second)) != hash_file(str(third))
@@ -0,0 +1,178 @@
+"""KeywordAutomaton/PrefixIndex and the parser matchers built on them, checked against the regexes they replaced."""
+import random
+import re
+
+import pytest
+
+from enhanced_parser import EnhancedParser
+from text_matching import KeywordAutomaton, PrefixIndex, fold_case, is_word_char
+
+
+@pytest.fixture(scope="module")
+def parser():
+    return EnhancedParser()
+
+
+def boundary_matches(automaton, text):
+    """Automaton hits that a \\b...\\b regex would also report."""
+    folded = fold_case(text)
+    spans = set()
+    for start, end, value in automaton.iter_matches(folded):
+        before = start > 0 and is_word_char(text[start - 1])
+        first = is_word_char(text[start])
+        last = is_word_char(text[end - 1])
+        after = end < len(text) and is_word_char(text[end])
+        if before != first and last != after:
+            spans.add((start, end, value))
+    return spans
+
+
+def regex_matches(keywords, text):
+    spans = set()
+    for keyword in keywords:
+        # Lookahead so overlapping occurrences are reported, like the automaton does
+        for match in re.finditer(r"(?=(\b" + re.escape(keyword) + r"\b))", text, re.IGNORECASE):
+            spans.add((match.start(1), match.end(1), keyword))
+    return spans
+
+
+def test_automaton_reports_overlapping_occurrences():
+    automaton = KeywordAutomaton([("he", "he"), ("she", "she"), ("hers", "hers"), ("his", "his")])
+    assert sorted(automaton.iter_matches("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+def test_automaton_is_case_insensitive_on_folded_text():
+    automaton = KeywordAutomaton([("Python", "Python")])
+    assert list(automaton.iter_matches(fold_case("PYTHON and python"))) == [(0, 6, "Python"), (11, 17, "Python")]
+
+
+@pytest.mark.parametrize("text", [
+    "Java, JavaScript and Java-based tools",
+    "Worked with SQL/NoSQL (MySQL, PostgreSQL) and sql",
+    "Python3 python_scripts Python.",
+    "Machine Learning, machine-learning and Learning",
+    "R, R&D, R Studio",
+])
+def test_word_boundaries_match_regex(text):
+    keywords = ["Java", "JavaScript", "SQL", "NoSQL", "MySQL", "Python", "Machine Learning", "Learning", "R", "R&D"]
+    automaton = KeywordAutomaton((keyword, keyword) for keyword in keywords)
+    assert boundary_matches(automaton, text) == regex_matches(keywords, text)
+
+
+def test_word_boundaries_match_regex_on_taxonomy_skills(parser):
+    skills = [skill for skill, _ in parser.sorted_skill_references if skill]
+    automaton = KeywordAutomaton((skill, skill) for skill in skills)
+    rng = random.Random(7)
+    separators = [" ", ", ", "/", " and ", "-", "", "(", ") ", "; "]
+    for _ in range(200):
+        text = "".join(rng.choice(skills) + rng.choice(separators) for _ in range(rng.randint(1, 5)))
+        assert boundary_matches(automaton, text) == regex_matches(skills, text), text
+
+
+def test_prefix_index_returns_longest_first():
+    index = PrefixIndex([("Bachelor", 1), ("Bachelor of Science", 2), ("Bachelor of Science in CS", 3), ("Master", 4)])
+    assert index.prefixes(fold_case("Bachelor of Science in CS, UM")) == [(25, 3), (19, 2), (8, 1)]
+    assert index.prefixes(fold_case("Masters")) == [(6, 4)]
+    assert index.prefixes(fold_case("Diploma")) == []
+
+
+def test_prefix_index_keeps_first_of_equal_keywords():
+    index = PrefixIndex([("Software Engineer", "first"), ("software engineer", "second")])
+    assert len(index) == 1
+    assert index.prefixes("software engineer") == [(17, "first")]
+
+
+def old_parse_block_for_skills(parser, text_block):
+    """Regex implementation _parse_block_for_skills replaced."""
+    general_set, soft_set = set(), set()
+    for line in [line.strip() for line in text_block.split("\n") if line.strip()]:
+        temp_line = line
+        for skill, skill_type in parser.sorted_skill_references:
+            if not skill:
+                continue
+            pattern = re.compile(r"\b" + re.escape(skill) + r"\b", re.IGNORECASE)
+            target = soft_set if skill_type == "soft" else general_set
+            if skill in ("C++", "C#") and temp_line.lower() == skill.lower():
+                target.add(skill)
+                temp_line = "$" * len(temp_line)
+                continue
+            while True:
+                match = pattern.search(temp_line)
+                if not match:
+                    break
+                target.add(skill)
+                start, end = match.span()
+                temp_line = temp_line[:start] + "$" * (end - start) + temp_line[end:]
+    return general_set, soft_set
+
+
+def new_parse_block_for_skills(parser, text_block):
+    general_set, soft_set = set(), set()
+    parser._parse_block_for_skills(text_block, general_set, soft_set)
+    return general_set, soft_set
+
+
+@pytest.mark.parametrize("text_block", [
+    "Python, Java, JavaScript, SQL\nC++\nC#\nTeamwork and Leadership",
+    "Machine Learning and Deep Learning with Python\nProject Management; Communication",
+    "React Native / React, Node.js, ASP.NET",
+    "Obstetrics & Gynecology, O&G rotation, Series 7 licence",
+])
+def test_skill_block_matches_old_regexes(parser, text_block):
+    assert new_parse_block_for_skills(parser, text_block) == old_parse_block_for_skills(parser, text_block)
+
+
+def test_skill_block_matches_old_regexes_on_generated_lines(parser):
+    skills = [skill for skill, _ in parser.sorted_skill_references if skill]
+    rng = random.Random(11)
+    separators = [", ", " / ", " and ", " ", "; ", "-"]
+    for _ in range(100):
+        text_block = "\n".join(
+            "".join(rng.choice(skills) + rng.choice(separators) for _ in range(rng.randint(1, 4)))
+            for _ in range(rng.randint(1, 3))
+        )
+        assert new_parse_block_for_skills(parser, text_block) == old_parse_block_for_skills(parser, text_block), text_block
+
+
+def old_match_job_title(parser, line):
+    for known_title in sorted([title for title in parser.job_titles_list if title], key=len, reverse=True):
+        if re.match(r"(?i)\b" + re.escape(known_title) + r"\b\s*(?:at|,|\(|–|-|$)", line):
+            return known_title
+    return None
+
+
+def old_match_degree(parser, line):
+    for known_degree in parser.degrees_list:
+        if line.lower().startswith(known_degree.lower()):
+            if len(line) == len(known_degree) or not line[len(known_degree)].isalnum():
+                return known_degree
+    return None
+
+
+def keyword_lines(keywords):
+    suffixes = ["", " at Petronas", ", Kuala Lumpur", " (Intern)", " - 2021", " – 2020", "s", "ing", " Lead",
+                " at", "  ,", ".", " of Things"]
+    for keyword in keywords:
+        for suffix in suffixes:
+            yield keyword + suffix
+            yield keyword.upper() + suffix
+        yield "Senior " + keyword
+        yield keyword[:-1]
+
+
+def test_job_title_prefix_matches_old_regex(parser):
+    matched = 0
+    for line in keyword_lines([title for title in parser.job_titles_list if title]):
+        expected = old_match_job_title(parser, line)
+        assert parser._match_job_title_at_start(line) == expected, line
+        matched += expected is not None
+    assert matched > len(parser.job_titles_list)
+
+
+def test_degree_prefix_matches_old_startswith_loop(parser):
+    matched = 0
+    for line in keyword_lines(parser.degrees_list):
+        expected = old_match_degree(parser, line)
+        assert parser._match_degree_at_start(line) == expected, line
+        matched += expected is not None
+    assert matched > len(parser.degrees_list)
@@ -0,0 +1,73 @@
+"""tracing: levels, sampling, lazy formatting and that nothing reaches stdout."""
+import pytest
+
+import tracing
+
+
+@pytest.fixture
+def ring():
+    tracing.configure(level="warning", sample="", sink="ring")
+    buffer = tracing.get_trace_buffer()
+    buffer.clear()
+    yield buffer
+    buffer.clear()
+    tracing.configure(level="warning", sample="", sink="logging")
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted a record that was not emitted")
+
+
+def test_levels_filter_records(ring):
+    tracer = tracing.get_tracer("test-levels")
+    tracer.debug("stage", "hidden %s", Unformattable())
+    tracer.info("stage", "hidden %s", Unformattable())
+    tracer.warning("stage", "shown %d", 1)
+    assert [record["message"] for record in ring.records(component="test-levels")] == ["shown 1"]
+    assert tracer.debug_enabled is False
+
+
+def test_debug_tracer_emits_debug_records(ring):
+    tracer = tracing.get_tracer("test-debug", debug=True)
+    assert tracer.debug_enabled
+    tracer.debug("sections", "found %s headers", 3)
+    record = ring.records(component="test-debug")[0]
+    assert (record["level"], record["stage"], record["message"]) == ("debug", "sections", "found 3 headers")
+
+
+def test_per_stage_sampling(ring):
+    tracing.configure(sample="experience=0.25,skills=0")
+    tracer = tracing.get_tracer("test-sampling", debug=True)
+    for index in range(8):
+        tracer.debug("experience", "line %d", index)
+        tracer.debug("skills", "skill %d", index)
+        tracer.debug("education", "entry %d", index)
+    tracer.warning("skills", "never sampled out")
+    assert len(ring.records(stage="experience")) == 2
+    assert [record["message"] for record in ring.records(stage="skills")] == ["never sampled out"]
+    assert len(ring.records(stage="education")) == 8
+
+
+def test_configure_updates_existing_tracers(ring):
+    tracer = tracing.get_tracer("test-configure")
+    tracing.configure(level="debug")
+    assert tracer.debug_enabled
+    tracing.configure(level="off")
+    tracer.error("stage", "dropped")
+    assert ring.records(component="test-configure") == []
+
+
+def test_logging_sink_never_writes_to_stdout(capsys):
+    tracing.configure(level="debug", sample="", sink="logging")
+    try:
+        tracing.get_tracer("test-stdout").debug("stage", "diagnostic %s", "message")
+    finally:
+        tracing.configure(level="warning")
+    captured = capsys.readouterr()
+    assert captured.out == ""
+
+
+def test_parse_sample():
+    assert tracing.parse_sample("experience=0.01, skills=0.5,*=1,bad=x") == {"experience": 100, "skills": 2, "*": 1}
+    assert tracing.parse_sample("") == {}